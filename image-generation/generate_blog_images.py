@@ -10,6 +10,9 @@ import requests
 from pathlib import Path
 from datetime import datetime
 
+# Sesión compartida: reutiliza conexiones keep-alive entre llamadas a la API
+session = requests.Session()
+
 def extract_frontmatter(md_file):
     """Extrae el frontmatter de un archivo markdown."""
     with open(md_file, 'r', encoding='utf-8') as f:
@@ -73,7 +76,7 @@ def generate_image_replicate(prompt, output_path):
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = session.post(url, headers=headers, json=payload)
         response.raise_for_status()
         prediction = response.json()
 
@@ -83,14 +86,14 @@ def generate_image_replicate(prompt, output_path):
         attempt = 0
 
         while attempt < max_attempts:
-            response = requests.get(prediction_url, headers=headers)
+            response = session.get(prediction_url, headers=headers)
             prediction = response.json()
 
             if prediction['status'] == 'succeeded':
                 image_url = prediction['output'][0] if isinstance(prediction['output'], list) else prediction['output']
 
                 # Descargar la imagen
-                img_response = requests.get(image_url)
+                img_response = session.get(image_url)
                 output_path.parent.mkdir(parents=True, exist_ok=True)
 
                 with open(output_path, 'wb') as f:
@@ -9,6 +9,9 @@ import requests
 from pathlib import Path
 import time
 
+# Sesión compartida: reutiliza conexiones keep-alive entre llamadas a la API
+session = requests.Session()
+
 def generate_image_huggingface(prompt, output_path):
     """Genera una imagen usando Hugging Face Inference API (GRATIS)."""
 
@@ -34,7 +37,7 @@ def generate_image_huggingface(prompt, output_path):
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            response = requests.post(API_URL, headers=headers, json=payload, timeout=120)
+            response = session.post(API_URL, headers=headers, json=payload, timeout=120)
 
             if response.status_code == 503:
                 print(f"⏳ Modelo cargando... (intento {attempt + 1}/{max_retries})")
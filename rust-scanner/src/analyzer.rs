@@ -1,11 +1,16 @@
-// Complete Repository Analyzer with Rayon Parallelism
+// Complete Repository Analyzer with concurrent async analysis (buffer_unordered)
 use serde::{Deserialize, Serialize};
 use reqwest::Client;
 use chrono::{DateTime, Utc, Duration};
 use std::error::Error;
-use rayon::prelude::*;
+use futures::stream::{self, StreamExt};
 use log::{info, warn};
 
+use crate::github_api;
+
+/// Repos analyzed concurrently; each analysis is a handful of sequential API calls
+pub const MAX_CONCURRENT_ANALYSES: usize = 8;
+
 #[derive(Debug, Serialize, Deserialize, Clone)]
 pub struct RepoAnalysis {
     pub repo: String,
@@ -104,18 +109,17 @@ impl GemAnalyzer {
         }
     }
 
-    /// Analyze multiple repositories in parallel using Rayon
+    /// Analyze multiple repositories concurrently on the caller's runtime
+    ///
+    /// The work is I/O bound, so the analyses share one runtime and one HTTP
+    /// client instead of a fresh tokio runtime per thread.
     pub async fn analyze_repos_parallel(&self, repos: Vec<(String, Metadata)>) -> Vec<RepoAnalysis> {
-        info!("🚀 Starting parallel analysis of {} repositories with Rayon", repos.len());
-        
-        // Use Rayon for parallel processing
-        let results: Vec<RepoAnalysis> = repos
-            .par_iter()
-            .filter_map(|(repo, metadata)| {
-                // Create a runtime for this thread to run async code
-                let rt = tokio::runtime::Runtime::new().ok()?;
-                
-                match rt.block_on(self.analyze_single_repo(repo.clone(), metadata.clone())) {
+        let total = repos.len();
+        info!("🚀 Starting concurrent analysis of {} repositories", total);
+
+        let results: Vec<RepoAnalysis> = stream::iter(repos)
+            .map(|(repo, metadata)| async move {
+                match self.analyze_single_repo(repo.clone(), metadata).await {
                     Ok(analysis) => {
                         info!("✅ Analyzed {}: {:.2}/100", repo, analysis.total_score);
                         Some(analysis)
@@ -126,14 +130,17 @@ impl GemAnalyzer {
                     }
                 }
             })
-            .collect();
+            .buffer_unordered(MAX_CONCURRENT_ANALYSES)
+            .filter_map(|analysis| async move { analysis })
+            .collect()
+            .await;
 
-        info!("✅ Parallel analysis complete: {}/{} repos analyzed", results.len(), repos.len());
+        info!("✅ Concurrent analysis complete: {}/{} repos analyzed", results.len(), total);
         results
     }
 
-    /// Analyze a single repository (called by parallel processor)
-    async fn analyze_single_repo(&self, repo: String, metadata: Metadata) -> Result<RepoAnalysis, Box<dyn Error>> {
+    /// Analyze a single repository
+    pub async fn analyze_single_repo(&self, repo: String, metadata: Metadata) -> Result<RepoAnalysis, Box<dyn Error>> {
         info!("🔍 Analyzing {}...", repo);
 
         // Score components
@@ -176,7 +183,7 @@ impl GemAnalyzer {
 
     /// Factor 1: Commit Activity Analysis
     async fn analyze_commit_activity(&self, repo: &str) -> Result<f64, Box<dyn Error>> {
-        let url = format!("https://api.github.com/repos/{}/commits?per_page=100", repo);
+        let url = format!("{}/repos/{}/commits?per_page=100", github_api::api_url(), repo);
         
         let response = self.client
             .get(&url)
@@ -212,7 +219,7 @@ impl GemAnalyzer {
 
     /// Factor 2: Code Quality Analysis
     async fn analyze_code_quality(&self, repo: &str) -> Result<f64, Box<dyn Error>> {
-        let url = format!("https://api.github.com/repos/{}/contents", repo);
+        let url = format!("{}/repos/{}/contents", github_api::api_url(), repo);
         
         let response = self.client
             .get(&url)
@@ -249,7 +256,7 @@ impl GemAnalyzer {
     /// Factor 3: Developer Engagement Analysis
     async fn analyze_developer_engagement(&self, repo: &str) -> Result<f64, Box<dyn Error>> {
         // Analyze issues
-        let issues_url = format!("https://api.github.com/repos/{}/issues?state=all&per_page=50", repo);
+        let issues_url = format!("{}/repos/{}/issues?state=all&per_page=50", github_api::api_url(), repo);
         let issues_response = self.client
             .get(&issues_url)
             .header("Authorization", format!("Bearer {}", self.github_token))
@@ -278,7 +285,7 @@ impl GemAnalyzer {
         };
 
         // Analyze pull requests
-        let prs_url = format!("https://api.github.com/repos/{}/pulls?state=all&per_page=50", repo);
+        let prs_url = format!("{}/repos/{}/pulls?state=all&per_page=50", github_api::api_url(), repo);
         let prs_response = self.client
             .get(&prs_url)
             .header("Authorization", format!("Bearer {}", self.github_token))
@@ -1,15 +1,16 @@
-// Complete Hidden Gems Pipeline with Rayon Parallelism
+// Complete Hidden Gems Pipeline with concurrent async analysis and AI reviews
 mod analyzer;
 mod ai_reviewer;
+mod github_api;
 
-use analyzer::{GemAnalyzer, Metadata};
+use analyzer::{GemAnalyzer, Metadata, MAX_CONCURRENT_ANALYSES};
 use ai_reviewer::AIReviewer;
 use serde::{Deserialize, Serialize};
 use reqwest::Client;
 use std::error::Error;
 use std::env;
 use log::{info, error};
-use rayon::prelude::*;
+use futures::stream::{self, StreamExt};
 
 #[derive(Debug, Serialize, Deserialize)]
 struct HiddenGemRepo {
@@ -39,7 +40,7 @@ struct FileContent {
 }
 
 async fn fetch_readme(client: &Client, token: &str, repo: &str) -> Option<String> {
-    let url = format!("https://api.github.com/repos/{}/readme", repo);
+    let url = format!("{}/repos/{}/readme", github_api::api_url(), repo);
     
     let response = client
         .get(&url)
@@ -81,8 +82,8 @@ async fn scan_repositories(token: &str, tier: &str) -> Result<Vec<(String, Metad
         .build()?;
 
     let url = format!(
-        "https://api.github.com/search/repositories?q={}&sort=updated&order=desc&per_page=20",
-        query
+        "{}/search/repositories?q={}&sort=updated&order=desc&per_page=20",
+        github_api::api_url(), query
     );
 
     info!("📡 Fetching candidates from GitHub...");
@@ -139,7 +140,7 @@ async fn main() -> Result<(), Box<dyn Error>> {
     info!("🚀 HIDDEN GEMS PIPELINE STARTING");
     info!("   Tier: {}", tier);
     info!("   Target: {} quality repos", max_repos);
-    info!("   Parallelism: Rayon enabled");
+    info!("   Concurrency: {} analyses in flight", MAX_CONCURRENT_ANALYSES);
     info!("================================================================================");
 
     // Phase 1: Scan for candidates
@@ -147,7 +148,7 @@ async fn main() -> Result<(), Box<dyn Error>> {
     let candidates = scan_repositories(&token, &tier).await?;
     info!("✅ Phase 1 complete: {} candidates\n", candidates.len());
 
-    // Phase 2: Parallel analysis with Rayon
+    // Phase 2: Concurrent analysis
     info!("📍 PHASE 2: Analyzing repositories in parallel...");
     let analyzer = GemAnalyzer::new(token.clone());
     let mut analyses = analyzer.analyze_repos_parallel(candidates).await;
@@ -194,31 +195,32 @@ async fn main() -> Result<(), Box<dyn Error>> {
             .filter_map(|r| r.ok())
             .collect();
 
-        // Run AI reviews in parallel with Rayon
-        let ai_reviews: Vec<_> = readmes
-            .par_iter()
-            .filter_map(|(repo, readme)| {
-                if let Some(readme_content) = readme {
-                    let rt = tokio::runtime::Runtime::new().ok()?;
-                    let analysis = analyses.iter().find(|a| &a.repo == repo)?;
-                    
-                    match rt.block_on(ai_reviewer.review_repository(
-                        repo,
-                        readme_content,
-                        &analysis.metadata.language,
-                        analysis.metadata.stars,
-                    )) {
-                        Ok(review) => Some((repo.clone(), review)),
-                        Err(e) => {
-                            error!("AI review failed for {}: {}", repo, e);
-                            None
-                        }
+        // Run AI reviews concurrently on this runtime; the calls are I/O bound,
+        // so they share the reviewer's HTTP client instead of a runtime per thread
+        let analyses_ref = &analyses;
+        let ai_reviewer_ref = &ai_reviewer;
+        let ai_reviews: Vec<_> = stream::iter(readmes)
+            .filter_map(|(repo, readme)| async move { readme.map(|content| (repo, content)) })
+            .map(|(repo, readme_content)| async move {
+                let analysis = analyses_ref.iter().find(|a| a.repo == repo)?;
+
+                match ai_reviewer_ref.review_repository(
+                    &repo,
+                    &readme_content,
+                    &analysis.metadata.language,
+                    analysis.metadata.stars,
+                ).await {
+                    Ok(review) => Some((repo, review)),
+                    Err(e) => {
+                        error!("AI review failed for {}: {}", repo, e);
+                        None
                     }
-                } else {
-                    None
                 }
             })
-            .collect();
+            .buffer_unordered(MAX_CONCURRENT_ANALYSES)
+            .filter_map(|review| async move { review })
+            .collect()
+            .await;
 
         info!("✅ Phase 3 complete: {} AI reviews", ai_reviews.len());
 
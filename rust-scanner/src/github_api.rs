@@ -0,0 +1,14 @@
+// GitHub API base URL shared by all binaries
+use std::env;
+
+pub const DEFAULT_API_URL: &str = "https://api.github.com";
+
+/// Base URL for REST calls: `GITHUB_API_URL` if set (GitHub Enterprise, or a
+/// local fake server in tests), otherwise the public API.
+pub fn api_url() -> String {
+    env::var("GITHUB_API_URL")
+        .ok()
+        .filter(|url| !url.is_empty())
+        .map(|url| url.trim_end_matches('/').to_string())
+        .unwrap_or_else(|| DEFAULT_API_URL.to_string())
+}
@@ -1,7 +1,15 @@
 // Hidden Gems Scanner - Find quality low-visibility projects
+mod analyzer;
+mod github_api;
+
+use analyzer::{GemAnalyzer, Metadata, MAX_CONCURRENT_ANALYSES};
+use futures::stream::{self, StreamExt};
 use serde::{Deserialize, Serialize};
+use serde_json::json;
 use reqwest;
 use std::error::Error;
+use std::io::Write;
+use tokio::io::{AsyncBufReadExt, BufReader};
 
 #[derive(Debug, Serialize, Deserialize)]
 pub struct HiddenGemRepo {
@@ -55,7 +63,11 @@ impl HiddenGemsScanner {
         }
     }
 
-    pub async fn scan_tier(&self, tier: &str) -> Result<Vec<HiddenGemRepo>, Box<dyn Error>> {
+    /// Scan a tier, calling `on_gem` for each repo as soon as it passes validation.
+    pub async fn scan_tier<F>(&self, tier: &str, mut on_gem: F) -> Result<Vec<HiddenGemRepo>, Box<dyn Error>>
+    where
+        F: FnMut(&HiddenGemRepo) -> Result<(), Box<dyn Error>>,
+    {
         let (min_stars, max_stars, min_forks, max_forks) = match tier {
             "micro" => (10, 100, 5, 50),
             "small" => (100, 500, 10, 100),
@@ -79,8 +91,8 @@ impl HiddenGemsScanner {
 
         while found_repos.len() < MAX_PROJECTS && page <= 5 {
             let url = format!(
-                "https://api.github.com/search/repositories?q={}&sort=updated&order=desc&per_page=20&page={}",
-                query, page
+                "{}/search/repositories?q={}&sort=updated&order=desc&per_page=20&page={}",
+                github_api::api_url(), query, page
             );
 
             info!("📡 Fetching page {}...", page);
@@ -107,6 +119,7 @@ impl HiddenGemsScanner {
                 if self.is_valid_hidden_gem(&repo)? {
                     info!("✅ Valid gem: {} ({} ⭐, {} 🍴)",
                           repo.full_name, repo.stars, repo.forks);
+                    on_gem(&repo)?;
                     found_repos.push(repo);
 
                     if found_repos.len() >= MAX_PROJECTS {
@@ -238,6 +251,114 @@ extern crate log;
 
 use env_logger;
 
+/// One command read from stdin in `--serve` mode
+#[derive(Debug, Deserialize)]
+struct WorkerRequest {
+    id: u64,
+    cmd: String,
+    #[serde(default)]
+    tier: Option<String>,
+    #[serde(default)]
+    repos: Vec<AnalyzeTarget>,
+}
+
+/// Repo to analyze; field names match the repos emitted by `scan`
+#[derive(Debug, Deserialize)]
+struct AnalyzeTarget {
+    full_name: String,
+    #[serde(default)]
+    stargazers_count: i32,
+    #[serde(default)]
+    forks_count: i32,
+    #[serde(default)]
+    language: Option<String>,
+    #[serde(default)]
+    created_at: String,
+    #[serde(default)]
+    pushed_at: String,
+}
+
+fn emit(message: serde_json::Value) -> Result<(), Box<dyn Error>> {
+    let mut stdout = std::io::stdout().lock();
+    writeln!(stdout, "{}", message)?;
+    stdout.flush()?;
+    Ok(())
+}
+
+/// Persistent worker mode (`--serve`).
+///
+/// Reads one JSON command per stdin line (`{"id", "cmd": "scan", "tier"}` or
+/// `{"id", "cmd": "analyze", "repos": [...]}`) and answers with one
+/// `{"id", "result"}` line per repo, then `{"id", "done": true}` or
+/// `{"id", "error"}`. The runtime and HTTP clients are created once and reused
+/// by every command. Exits when stdin is closed.
+async fn serve(github_token: String) -> Result<(), Box<dyn Error>> {
+    let scanner = HiddenGemsScanner::new(github_token.clone());
+    let analyzer = GemAnalyzer::new(github_token);
+    let mut lines = BufReader::new(tokio::io::stdin()).lines();
+
+    info!("🦀 Worker ready, waiting for commands on stdin");
+
+    while let Some(line) = lines.next_line().await? {
+        if line.trim().is_empty() {
+            continue;
+        }
+
+        let request: WorkerRequest = match serde_json::from_str(&line) {
+            Ok(request) => request,
+            Err(e) => {
+                warn!("⚠️  Ignoring malformed command: {}", e);
+                continue;
+            }
+        };
+        let id = request.id;
+
+        let outcome = match request.cmd.as_str() {
+            "scan" => {
+                let tier = request.tier.as_deref().unwrap_or("small");
+                scanner
+                    .scan_tier(tier, |repo| emit(json!({"id": id, "result": repo})))
+                    .await
+                    .map(|_| ())
+            }
+            "analyze" => analyze_targets(&analyzer, id, request.repos).await,
+            other => Err(format!("Unknown command '{}'", other).into()),
+        };
+
+        match outcome {
+            Ok(()) => emit(json!({"id": id, "done": true}))?,
+            Err(e) => emit(json!({"id": id, "error": e.to_string()}))?,
+        }
+    }
+
+    info!("👋 stdin closed, worker exiting");
+    Ok(())
+}
+
+/// Analyze `targets` concurrently, emitting each analysis as soon as it completes
+async fn analyze_targets(analyzer: &GemAnalyzer, id: u64, targets: Vec<AnalyzeTarget>) -> Result<(), Box<dyn Error>> {
+    let mut analyses = stream::iter(targets)
+        .map(|target| {
+            let metadata = Metadata {
+                stars: target.stargazers_count,
+                forks: target.forks_count,
+                language: target.language,
+                created_at: target.created_at,
+                last_push: target.pushed_at,
+            };
+            analyzer.analyze_single_repo(target.full_name, metadata)
+        })
+        .buffer_unordered(MAX_CONCURRENT_ANALYSES);
+
+    while let Some(result) = analyses.next().await {
+        match result {
+            Ok(analysis) => emit(json!({"id": id, "result": analysis}))?,
+            Err(e) => warn!("❌ Analysis failed: {}", e),
+        }
+    }
+    Ok(())
+}
+
 #[tokio::main]
 async fn main() -> Result<(), Box<dyn Error>> {
     env_logger::Builder::from_env(env_logger::Env::default().default_filter_or("info")).init();
@@ -245,6 +366,10 @@ async fn main() -> Result<(), Box<dyn Error>> {
     let github_token = std::env::var("GITHUB_TOKEN")
         .expect("GITHUB_TOKEN environment variable not set");
 
+    if std::env::args().nth(1).as_deref() == Some("--serve") {
+        return serve(github_token).await;
+    }
+
     let tier = std::env::args()
         .nth(1)
         .unwrap_or_else(|| "small".to_string());
@@ -254,11 +379,14 @@ async fn main() -> Result<(), Box<dyn Error>> {
 
     let scanner = HiddenGemsScanner::new(github_token);
 
-    let repos = scanner.scan_tier(&tier).await?;
-
-    println!("__REPO_JSON__");
-    println!("{}", serde_json::to_string_pretty(&repos)?);
-    println!("__END_JSON__");
+    // One JSON object per line (NDJSON), flushed as each gem is found so the
+    // Python side can start analyzing before the scan finishes
+    let repos = scanner.scan_tier(&tier, |repo| {
+        let mut stdout = std::io::stdout().lock();
+        writeln!(stdout, "{}", serde_json::to_string(repo)?)?;
+        stdout.flush()?;
+        Ok(())
+    }).await?;
 
     info!("✨ Scan complete! Found {} hidden gems", repos.len());
 
@@ -1,8 +1,11 @@
+mod github_api;
+
 use anyhow::{Context, Result};
 use chrono::{DateTime, Utc};
 use reqwest::Client;
 use serde::{Deserialize, Serialize};
 use std::env;
+use std::io::Write;
 use log::{info, warn, error};
 
 #[derive(Debug, Deserialize, Serialize)]
@@ -71,8 +74,8 @@ impl GitHubScanner {
         // Buscar repos con buen engagement, últimos 6 meses, sin filtros negativos de template
         let query = "stars:>200+forks:>20+pushed:>2025-05-01";
         let url = format!(
-            "https://api.github.com/search/repositories?q={}&sort=stars&order=desc&per_page={}",
-            query, limit
+            "{}/search/repositories?q={}&sort=stars&order=desc&per_page={}",
+            github_api::api_url(), query, limit
         );
 
         info!("Query URL: {}", url);
@@ -191,7 +194,7 @@ impl GitHubScanner {
     }
 
     async fn has_substantial_readme(&self, full_name: &str) -> bool {
-        let url = format!("https://api.github.com/repos/{}/readme", full_name);
+        let url = format!("{}/repos/{}/readme", github_api::api_url(), full_name);
 
         match self
             .client
@@ -216,8 +219,8 @@ impl GitHubScanner {
 
     async fn check_ci_status(&self, full_name: &str) -> bool {
         let url = format!(
-            "https://api.github.com/repos/{}/actions/runs?per_page=5&status=success",
-            full_name
+            "{}/repos/{}/actions/runs?per_page=5&status=success",
+            github_api::api_url(), full_name
         );
 
         match self
@@ -261,6 +264,13 @@ async fn main() -> Result<()> {
     let mut valid_repos = Vec::new();
     for repo in repos {
         if scanner.validate_repo(&repo).await {
+            // Output JSON for Python to consume: one repo per line (NDJSON),
+            // flushed immediately so the bridge can use it while we keep validating
+            let json_output = serde_json::to_string(&repo)?;
+            let mut stdout = std::io::stdout().lock();
+            writeln!(stdout, "{}", json_output)?;
+            stdout.flush()?;
+
             valid_repos.push(repo);
 
             // Encontrar hasta 3 repos válidos
@@ -279,12 +289,6 @@ async fn main() -> Result<()> {
         info!("  Name: {}", repo.full_name);
         info!("  Stars: ⭐ {}", repo.stargazers_count);
         info!("  Description: {}", repo.description.as_ref().unwrap_or(&"N/A".to_string()));
-
-        // Output JSON for Python to consume
-        let json_output = serde_json::to_string(&repo)?;
-        println!("\n__REPO_JSON__");
-        println!("{}", json_output);
-        println!("__END_JSON__");
     } else {
         warn!("⚠️  No valid repositories found");
     }
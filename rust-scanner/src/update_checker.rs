@@ -1,3 +1,5 @@
+mod github_api;
+
 use serde::{Deserialize, Serialize};
 use std::fs;
 use std::path::Path;
@@ -49,7 +51,7 @@ async fn main() -> Result<(), Box<dyn Error>> {
 
         println!("Checking updates for {}...", post.repo);
 
-        let url = format!("https://api.github.com/repos/{}/releases/latest", post.repo);
+        let url = format!("{}/repos/{}/releases/latest", github_api::api_url(), post.repo);
         let mut request = client.get(&url)
             .header(USER_AGENT, "bestof-opensource-bot");
 
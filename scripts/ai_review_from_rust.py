@@ -4,6 +4,7 @@ AI Review from Rust Analysis
 Consumes Rust analysis JSON and adds AI reviews using GitHub Models API.
 """
 
+import asyncio
 import json
 import sys
 import os
@@ -13,13 +14,17 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from scanner.gemini_reviewer import GeminiReviewer
+from scanner.github_scanner import GitHubScanner
+from scanner.grok_reviewer import GrokReviewer
+from scanner.review_cache import ReviewCache
 
 
 class MockRepo:
     """Mock PyGithub Repository object for use with GrokReviewer"""
-    def __init__(self, name: str, description: str, language: str, stars: int,
+    def __init__(self, full_name: str, description: str, language: str, stars: int,
                  forks: int = 0, topics: list = None, has_license: bool = True, has_wiki: bool = False):
-        self.name = name
+        self.full_name = full_name
+        self.name = full_name.split('/')[-1]
         self.description = description or ""
         self.language = language or "Unknown"
         self.stargazers_count = stars
@@ -46,77 +51,90 @@ def main():
 
     print(f"📊 Found {len(analyses)} repositories to review")
 
-    # Initialize AI reviewer with Gemini (high quality reviews)
-    reviewer = GeminiReviewer(model="gemini-2.0-flash")
-
-    # Add AI reviews to approved repos
-    reviewed = []
+    # Reviews are reused until the repo gets a new commit; the Rust output has
+    # no commit SHA, so the HEAD is looked up when a token is available
+    github_token = os.getenv('GITHUB_TOKEN')
+    review_cache = ReviewCache(
+        os.getenv('GEMS_REVIEW_CACHE', '.cache/ai_reviews.sqlite'),
+        resolve_head=GitHubScanner(github_token).get_latest_commit if github_token else None,
+    )
+
+    # Gemini by default (high quality reviews); AI_REVIEW_PROVIDER=github-models
+    # uses GitHub Models over one async connection pool instead
+    provider = os.getenv('AI_REVIEW_PROVIDER', 'gemini')
+    if provider == 'github-models':
+        reviewer = GrokReviewer(review_cache=review_cache)
+    else:
+        reviewer = GeminiReviewer(model="gemini-2.0-flash", review_cache=review_cache)
+
+    # Only do AI review for APPROVE/REVIEW candidates
+    candidates = []
     for idx, analysis in enumerate(analyses, 1):
         repo = analysis['repo']
         recommendation = analysis['recommendation']
 
-        print(f"\n[{idx}/{len(analyses)}] {repo} - {recommendation}")
-
-        # Only do AI review for APPROVE/REVIEW candidates
-        if recommendation in ['APPROVE', 'REVIEW']:
-            try:
-                print(f"  🤖 Running AI review...")
-
-                # Get repository details
-                owner, name = repo.split('/')
-
-                # Create mock repo object for GrokReviewer
-                mock_repo = MockRepo(
-                    name=name,
-                    description=analysis['metadata'].get('description', ''),
-                    language=analysis['metadata'].get('language'),
-                    stars=analysis['metadata']['stars'],
-                    forks=analysis['metadata'].get('forks', 0),
-                    topics=analysis['metadata'].get('topics', [])
-                )
-
-                readme_content = analysis['metadata'].get('readme', '')[:3000]
-
-                # Call AI review with proper parameters
-                ai_scores = reviewer.review_repository(
-                    mock_repo,
-                    readme_content,
-                    []  # recent_files - not available from Rust scan
-                )
-
-                # Add AI scores to analysis
-                if ai_scores:
-                    analysis['ai_review'] = {
-                        'architecture': ai_scores.get('architecture', 0),
-                        'documentation': ai_scores.get('documentation', 0),
-                        'testing': ai_scores.get('testing', 0),
-                        'best_practices': ai_scores.get('practices', 0),
-                        'innovation': ai_scores.get('innovation', 0),
-                        'quality_score': reviewer.calculate_quality_score(ai_scores),
-                        'reasoning': ai_scores.get('assessment', ''),
-                        'strengths': ai_scores.get('key_strengths', []),
-                        'weaknesses': ai_scores.get('improvements', [])
-                    }
-
-                    print(f"  ✅ AI Review: {analysis['ai_review']['quality_score']:.1f}/100")
-                    print(f"     Architecture: {ai_scores.get('architecture', 0)}/10")
-                    print(f"     Documentation: {ai_scores.get('documentation', 0)}/10")
-                    print(f"     Testing: {ai_scores.get('testing', 0)}/10")
-                else:
-                    print(f"  ⚠️ AI review returned no scores")
-                    analysis['ai_review'] = None
-
-            except Exception as e:
-                print(f"  ⚠️ AI review failed: {e}")
-                analysis['ai_review'] = {
-                    'error': str(e),
-                    'quality_score': 0
-                }
+        if recommendation not in ['APPROVE', 'REVIEW']:
+            print(f"[{idx}/{len(analyses)}] {repo} - ⏭️ Skipping AI review (status: {recommendation})")
+            analysis['ai_review'] = None
+            continue
+
+        try:
+            # Create mock repo object for the reviewer
+            mock_repo = MockRepo(
+                full_name=repo,
+                description=analysis['metadata'].get('description', ''),
+                language=analysis['metadata'].get('language'),
+                stars=analysis['metadata']['stars'],
+                forks=analysis['metadata'].get('forks', 0),
+                topics=analysis['metadata'].get('topics', [])
+            )
+        except Exception as e:
+            print(f"[{idx}/{len(analyses)}] {repo} - ⚠️ AI review failed: {e}")
+            analysis['ai_review'] = {
+                'error': str(e),
+                'quality_score': 0
+            }
+            continue
+
+        readme_content = analysis['metadata'].get('readme', '')[:3000]
+        candidates.append((analysis, mock_repo, readme_content))
+
+    print(f"\n🤖 Running AI review of {len(candidates)} repositories ({provider})...")
+    if isinstance(reviewer, GrokReviewer):
+        results = asyncio.run(reviewer.review_many([(mock_repo, readme, []) for _, mock_repo, readme in candidates]))
+    else:
+        # One request in flight per Gemini API key; AI_REVIEW_BATCH_SIZE > 1 packs
+        # several repos into each prompt to save instruction tokens and requests
+        batch_size = int(os.getenv('AI_REVIEW_BATCH_SIZE', '1'))
+        results = reviewer.review_many([(mock_repo, readme) for _, mock_repo, readme in candidates],
+                                       batch_size=batch_size)
+
+    for (analysis, _, _), ai_scores in zip(candidates, results):
+        print(f"\n{analysis['repo']} - {analysis['recommendation']}")
+
+        # Add AI scores to analysis
+        if ai_scores:
+            analysis['ai_review'] = {
+                'architecture': ai_scores.get('architecture', 0),
+                'documentation': ai_scores.get('documentation', 0),
+                'testing': ai_scores.get('testing', 0),
+                'best_practices': ai_scores.get('practices', 0),
+                'innovation': ai_scores.get('innovation', 0),
+                'quality_score': reviewer.calculate_quality_score(ai_scores),
+                'reasoning': ai_scores.get('assessment', ''),
+                'strengths': ai_scores.get('key_strengths', []),
+                'weaknesses': ai_scores.get('improvements', [])
+            }
+
+            print(f"  ✅ AI Review: {analysis['ai_review']['quality_score']:.1f}/100")
+            print(f"     Architecture: {ai_scores.get('architecture', 0)}/10")
+            print(f"     Documentation: {ai_scores.get('documentation', 0)}/10")
+            print(f"     Testing: {ai_scores.get('testing', 0)}/10")
         else:
-            print(f"  ⏭️ Skipping AI review (status: {recommendation})")
+            print(f"  ⚠️ AI review returned no scores")
             analysis['ai_review'] = None
 
-        reviewed.append(analysis)
+    reviewed = analyses
 
     # Save results
     print(f"\n💾 Saving results to {output_file}...")
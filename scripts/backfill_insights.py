@@ -10,10 +10,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 try:
     from scanner.insights_collector import InsightsCollector
+    from scanner.insights_store import InsightsStore
+    from scanner.token_pool import collect_github_tokens
 except ImportError:
     # Fallback if running from root
     sys.path.insert(0, "src")
     from scanner.insights_collector import InsightsCollector
+    from scanner.insights_store import InsightsStore
+    from scanner.token_pool import collect_github_tokens
 
 # Configure logging
 logging.basicConfig(
@@ -78,7 +82,11 @@ def main():
         logger.error("❌ No GITHUB_TOKEN or GH_PAT found in environment or .env file")
         return
 
-    collector = InsightsCollector(token)
+    # Spread the backfill over GITHUB_TOKEN_2..5 as well when they are set
+    tokens = [token] + [t for t in collect_github_tokens() if t != token]
+    # Metrics still fresh in the insights store are not fetched again
+    store = InsightsStore(os.getenv("INSIGHTS_DB", ".cache/insights.sqlite"))
+    collector = InsightsCollector(tokens, cache_dir=os.getenv("GITHUB_CACHE_DIR", ".cache/github"), store=store)
 
     # Find all blog posts
     blog_dir = Path("website/src/content/blog")
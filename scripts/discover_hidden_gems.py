@@ -7,16 +7,23 @@ import sys
 import json
 import logging
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from github import Github
+from scanner.analysis_store import AnalysisStore
 from scanner.gem_analyzer import GemAnalyzer
+from scanner.local_git_backend import LocalGitBackend
+from scanner.rust_bridge import stream_repos
 from scanner.grok_reviewer import GrokReviewer
+from scanner.review_cache import ReviewCache
 from blog_generator.markdown_writer import MarkdownWriter
 
 # Setup logging
@@ -27,14 +34,40 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class CountingIterator:
+    """Iterator wrapper that counts the items drawn from a stream."""
+
+    def __init__(self, items: Iterable):
+        self._items = iter(items)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self._items)
+        self.count += 1
+        return item
+
+    def close(self):
+        if hasattr(self._items, "close"):
+            self._items.close()
+
+
 class HiddenGemsPipeline:
     """Complete pipeline for discovering and publishing hidden gems"""
 
-    def __init__(self, github_token: str):
+    def __init__(self, github_token: str, local_git: bool = False):
         self.github_token = github_token
         self.github_client = Github(github_token)
-        self.analyzer = GemAnalyzer(self.github_client)
-        self.ai_reviewer = GrokReviewer()  # Uses GitHub Copilot auth
+        # Shallow clones take commit/structure/file checks off the API rate limit
+        local_backend = LocalGitBackend(os.getenv("GEMS_CLONE_DIR", ".cache/clones")) if local_git else None
+        # Raw sub-scores are kept so scripts/rescore_gems.py can retune weights offline
+        store = AnalysisStore(os.getenv("GEMS_ANALYSIS_DB", ".cache/gem_analyses.sqlite"))
+        self.analyzer = GemAnalyzer(self.github_client, local_backend=local_backend, store=store)
+        # Reviews are reused until the repo gets a new commit (or the model/prompt changes)
+        review_cache = ReviewCache(os.getenv("GEMS_REVIEW_CACHE", ".cache/ai_reviews.sqlite"))
+        self.ai_reviewer = GrokReviewer(review_cache=review_cache)  # Uses GitHub Copilot auth
         self.markdown_writer = MarkdownWriter()
 
         # Find Rust scanner
@@ -57,65 +90,54 @@ class HiddenGemsPipeline:
         logger.warning("⚠️  Rust scanner not found, will skip pre-filtering")
         return None
 
-    def run_rust_scanner(self, tier: str = "small") -> List[Dict]:
-        """Run Rust scanner to get initial candidate repos"""
+    def run_rust_scanner(self, tier: str = "small") -> Iterator[Dict]:
+        """
+        Stream candidate repos from the Rust scanner as it validates them
+
+        Candidates can be analyzed while the scan is still running. Closing the
+        iterator stops the scanner.
+        """
         if not self.rust_scanner_path:
             logger.warning("Rust scanner not available")
-            return []
-
-        try:
-            logger.info(f"🚀 Running Rust scanner for tier: {tier}")
-
-            env = os.environ.copy()
-            env["GITHUB_TOKEN"] = self.github_token
-            env["RUST_LOG"] = "info"
-
-            result = subprocess.run(
-                [str(self.rust_scanner_path), tier],
-                env=env,
-                capture_output=True,
-                text=False,  # Use bytes instead of text
-                timeout=120
-            )
-
-            if result.returncode != 0:
-                stderr = result.stderr.decode('utf-8', errors='ignore')
-                logger.error(f"Rust scanner failed: {stderr}")
-                return []
-
-            # Parse output with explicit UTF-8 decoding
-            output = result.stdout.decode('utf-8', errors='ignore')
-
-            if "__REPO_JSON__" in output and "__END_JSON__" in output:
-                json_start = output.index("__REPO_JSON__") + len("__REPO_JSON__")
-                json_end = output.index("__END_JSON__")
-                json_str = output[json_start:json_end].strip()
+            return
 
-                repos = json.loads(json_str)
-                logger.info(f"✅ Rust scanner found {len(repos)} candidate repositories")
-                return repos
+        logger.info(f"🚀 Running Rust scanner for tier: {tier}")
 
-            logger.warning("No JSON output from Rust scanner")
-            return []
+        env = os.environ.copy()
+        env["GITHUB_TOKEN"] = self.github_token
+        env["RUST_LOG"] = "info"
 
+        found = 0
+        try:
+            for repo in stream_repos([str(self.rust_scanner_path), tier], env=env, idle_timeout=120):
+                found += 1
+                logger.info(f"📦 Candidate {found}: {repo.get('full_name')}")
+                yield repo
         except subprocess.TimeoutExpired:
-            logger.error("Rust scanner timed out")
-            return []
+            logger.error("Rust scanner stopped producing output for 120 seconds")
         except Exception as e:
             logger.error(f"Error running Rust scanner: {e}")
-            return []
+        else:
+            logger.info(f"✅ Rust scanner found {found} candidate repositories")
+
+    def analyze_candidate(self, repo_full_name: str, stop: Optional[threading.Event] = None) -> Optional[Dict]:
+        """
+        Run complete analysis on a candidate repository
 
-    def analyze_candidate(self, repo_full_name: str) -> Optional[Dict]:
-        """Run complete analysis on a candidate repository"""
+        ``stop`` is checked between steps so a parallel run that already has
+        enough approvals can abandon the remaining work early.
+        """
         logger.info(f"\n{'='*80}")
         logger.info(f"🔍 ANALYZING: {repo_full_name}")
         logger.info(f"{'='*80}\n")
 
         try:
             repo = self.github_client.get_repo(repo_full_name)
+            # Shared by the red-flag check, the deep analysis and the README lookup
+            context = self.analyzer.context_for(repo)
 
             # Step 1: Check for red flags
-            has_red_flags, flags = self.analyzer.has_red_flags(repo)
+            has_red_flags, flags = self.analyzer.has_red_flags(context)
             if has_red_flags:
                 logger.warning(f"🚩 RED FLAGS DETECTED: {', '.join(flags)}")
                 return {
@@ -125,8 +147,11 @@ class HiddenGemsPipeline:
                     "details": flags
                 }
 
+            if stop is not None and stop.is_set():
+                return None
+
             # Step 2: Deep analysis
-            analysis = self.analyzer.analyze_repo(repo_full_name)
+            analysis = self.analyzer.analyze_repo(repo_full_name, context=context)
             if not analysis:
                 logger.error("Analysis failed")
                 return None
@@ -137,24 +162,32 @@ class HiddenGemsPipeline:
             logger.info(f"   - Engagement: {analysis['scores']['developer_engagement']}")
             logger.info(f"   - Maturity: {analysis['scores']['project_maturity']}")
 
+            if stop is not None and stop.is_set():
+                return None
+
             # Step 3: AI Code Review (if analysis score is promising)
             if analysis['total_score'] >= 50:
                 logger.info("\n🤖 Running AI code review...")
 
                 # Get README
                 try:
-                    readme = repo.get_readme()
-                    readme_content = readme.decoded_content.decode('utf-8')
+                    readme_content = context.readme().decode('utf-8')
                 except:
                     readme_content = "No README available"
 
                 # Get recent file samples
-                recent_files = self._get_recent_files(repo)
+                recent_files = self._get_recent_files(context)
+
+                try:
+                    head_sha = context.commits()[0].sha
+                except Exception:
+                    head_sha = None
 
                 ai_scores = self.ai_reviewer.review_repository(
                     repo,
                     readme_content,
-                    recent_files
+                    recent_files,
+                    head_sha=head_sha
                 )
 
                 if ai_scores:
@@ -185,46 +218,41 @@ class HiddenGemsPipeline:
             logger.error(f"Error analyzing {repo_full_name}: {e}")
             return None
 
-    def _get_recent_files(self, repo, max_files: int = 5) -> List[Dict]:
-        """Get samples of recently modified files"""
+    def _get_recent_files(self, context, max_files: int = 5, max_size: int = 10000) -> List[Dict]:
+        """
+        Get samples of recently modified files
+
+        The context lists recently changed files with their sizes in a couple of
+        requests (or none for a local clone), so large files are skipped before
+        anything is downloaded. The chosen files are then read in parallel.
+        """
         files = []
 
         try:
-            commits = list(repo.get_commits()[:10])
-            seen_paths = set()
-
-            for commit in commits:
-                if len(files) >= max_files:
+            chosen = []
+            for entry in context.recent_blobs():
+                # Size is unknown (None) for blobs a local clone left out as too large
+                if not self._is_code_file(entry.path) or entry.size is None or entry.size >= max_size:
+                    continue
+                chosen.append(entry)
+                if len(chosen) >= max_files:
                     break
 
-                for file in commit.files:
-                    if len(files) >= max_files:
-                        break
+            if not chosen:
+                return files
 
-                    # Skip non-code files
-                    if not self._is_code_file(file.filename):
-                        continue
+            with ThreadPoolExecutor(max_workers=len(chosen)) as executor:
+                contents = list(executor.map(lambda entry: context.read_blob(entry.sha), chosen))
 
-                    # Skip already seen files
-                    if file.filename in seen_paths:
-                        continue
-
-                    seen_paths.add(file.filename)
-
-                    # Get file content
-                    try:
-                        content_file = repo.get_contents(file.filename)
-                        if content_file.size < 10000:  # Skip large files
-                            content = content_file.decoded_content.decode('utf-8')
-
-                            files.append({
-                                "path": file.filename,
-                                "language": self._detect_language(file.filename),
-                                "content": content[:1000],  # First 1000 chars
-                                "size": content_file.size
-                            })
-                    except:
-                        continue
+            for entry, content in zip(chosen, contents):
+                if content is None:
+                    continue
+                files.append({
+                    "path": entry.path,
+                    "language": self._detect_language(entry.path),
+                    "content": content[:1000],  # First 1000 chars
+                    "size": entry.size
+                })
 
         except Exception as e:
             logger.warning(f"Error getting recent files: {e}")
@@ -255,6 +283,60 @@ class HiddenGemsPipeline:
 
         return ''
 
+    def analyze_candidates(self, candidates: Iterable[Dict], max_repos: int,
+                           parallelism: int = 4) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Analyze candidates concurrently until ``max_repos`` are approved.
+
+        At most ``parallelism`` candidates are in flight. Analyses are consumed
+        in candidate order, and once enough repos are approved the work still
+        in flight is cancelled. ``candidates`` may be a live stream such as
+        ``run_rust_scanner``; it is only read as fast as analysis slots free up.
+
+        Returns:
+            ``(approved, review)`` analyses in candidate order.
+        """
+        approved_repos = []
+        review_repos = []
+        parallelism = max(1, parallelism)
+        pending = iter(candidates)
+        in_flight = deque()
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=parallelism)
+
+        try:
+            while len(approved_repos) < max_repos:
+                while len(in_flight) < parallelism:
+                    candidate = next(pending, None)
+                    if candidate is None:
+                        break
+                    in_flight.append(executor.submit(self.analyze_candidate, candidate['full_name'], stop))
+
+                if not in_flight:
+                    break
+
+                analysis = in_flight.popleft().result()
+
+                if analysis:
+                    if analysis.get('status') == 'REJECTED':
+                        continue
+
+                    if analysis['recommendation'] == 'APPROVE':
+                        approved_repos.append(analysis)
+                    elif analysis['recommendation'] == 'REVIEW':
+                        review_repos.append(analysis)
+        finally:
+            # Analyses already running stop at their next step; their results are discarded
+            stop.set()
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+            # Stops a streaming scanner that is still looking for candidates
+            if hasattr(pending, "close"):
+                pending.close()
+
+        return approved_repos, review_repos
+
     def generate_blog_post(self, analysis: Dict) -> Optional[Path]:
         """Generate blog post for approved hidden gem"""
         try:
@@ -343,18 +425,28 @@ class HiddenGemsPipeline:
             logger.error(f"Error generating blog post: {e}")
             return None
 
-    def run_pipeline(self, tier: str = "small", max_repos: int = 5):
-        """Run complete hidden gems discovery pipeline"""
+    def run_pipeline(self, tier: str = "small", max_repos: int = 5, parallelism: int = 4):
+        """
+        Run complete hidden gems discovery pipeline
+
+        Args:
+            tier: Rust scanner tier.
+            max_repos: Stop once this many repos are approved.
+            parallelism: Candidates analyzed at the same time. Results are still
+                consumed in candidate order, so the outcome matches a sequential run.
+        """
         logger.info("\n" + "="*80)
         logger.info("🚀 HIDDEN GEMS PIPELINE STARTING")
         logger.info(f"   Tier: {tier}")
         logger.info(f"   Target: {max_repos} quality repos")
+        logger.info(f"   Parallelism: {parallelism}")
         logger.info("="*80 + "\n")
 
-        # Step 1: Rust scanner pre-filter
-        candidates = self.run_rust_scanner(tier)
+        # Steps 1 and 2 overlap: candidates are analyzed as the Rust scanner streams them
+        candidates = CountingIterator(self.run_rust_scanner(tier))
+        approved_repos, review_repos = self.analyze_candidates(candidates, max_repos, parallelism)
 
-        if not candidates:
+        if not candidates.count:
             logger.error("No candidates found by Rust scanner")
             return {
                 "candidates": 0,
@@ -363,28 +455,7 @@ class HiddenGemsPipeline:
                 "posts_generated": []
             }
 
-        logger.info(f"\n✅ Phase 1 complete: {len(candidates)} candidates")
-
-        # Step 2: Deep analysis
-        approved_repos = []
-        review_repos = []
-
-        for candidate in candidates:
-            if len(approved_repos) >= max_repos:
-                break
-
-            repo_name = candidate['full_name']
-            analysis = self.analyze_candidate(repo_name)
-
-            if analysis:
-                if analysis.get('status') == 'REJECTED':
-                    continue
-
-                if analysis['recommendation'] == 'APPROVE':
-                    approved_repos.append(analysis)
-                elif analysis['recommendation'] == 'REVIEW':
-                    review_repos.append(analysis)
-
+        logger.info(f"\n✅ Phase 1 complete: {candidates.count} candidates")
         logger.info(f"\n✅ Phase 2 complete:")
         logger.info(f"   - {len(approved_repos)} approved")
         logger.info(f"   - {len(review_repos)} need review")
@@ -402,14 +473,14 @@ class HiddenGemsPipeline:
         # Summary
         logger.info("\n" + "="*80)
         logger.info("🎉 PIPELINE COMPLETE!")
-        logger.info(f"   Candidates scanned: {len(candidates)}")
+        logger.info(f"   Candidates scanned: {candidates.count}")
         logger.info(f"   Approved: {len(approved_repos)}")
         logger.info(f"   For review: {len(review_repos)}")
         logger.info(f"   Blog posts: {len(generated_posts)}")
         logger.info("="*80 + "\n")
 
         return {
-            "candidates": len(candidates),
+            "candidates": candidates.count,
             "approved": approved_repos,
             "review": review_repos,
             "posts_generated": generated_posts
@@ -431,10 +502,11 @@ def main():
     # Get tier from command line
     tier = sys.argv[1] if len(sys.argv) > 1 else "small"
     max_repos = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    parallelism = int(sys.argv[3]) if len(sys.argv) > 3 else int(os.getenv("GEMS_PARALLELISM", "4"))
 
     # Run pipeline
-    pipeline = HiddenGemsPipeline(github_token)
-    results = pipeline.run_pipeline(tier, max_repos)
+    pipeline = HiddenGemsPipeline(github_token, local_git=os.getenv("GEMS_LOCAL_GIT") == "1")
+    results = pipeline.run_pipeline(tier, max_repos, parallelism)
 
     # Save results
     results_file = Path(__file__).parent.parent / "output" / f"hidden_gems_{tier}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Rescore stored hidden gem analyses with new weights/thresholds.
+
+Reads the raw sub-scores saved by the hidden gems pipeline and shows which
+repos would change category, without any GitHub requests.
+"""
+import os
+import sys
+import json
+import logging
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.analysis_store import AnalysisStore
+from scanner.gem_analyzer import ScoringConfig
+from scanner.rescoring import format_diff, rescore
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Rescore stored hidden gem analyses with a new scoring config"
+    )
+    parser.add_argument(
+        "--db",
+        default=os.getenv("GEMS_ANALYSIS_DB", ".cache/gem_analyses.sqlite"),
+        help="Analysis store written by discover_hidden_gems.py"
+    )
+    parser.add_argument(
+        "--config",
+        help="JSON file with weights, approve_threshold and review_threshold"
+    )
+    parser.add_argument(
+        "--weight",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Override one weight, e.g. --weight commit_activity=0.4 (repeatable)"
+    )
+    parser.add_argument("--approve", type=float, help="APPROVE threshold")
+    parser.add_argument("--review", type=float, help="REVIEW threshold")
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Write the new verdicts back to the store"
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        logger.error(f"❌ No analysis store at {args.db}")
+        sys.exit(1)
+
+    config = ScoringConfig.from_file(args.config) if args.config else ScoringConfig()
+    for override in args.weight:
+        name, _, value = override.partition("=")
+        if name not in config.weights:
+            logger.error(f"❌ Unknown weight '{name}'. Known: {', '.join(config.weights)}")
+            sys.exit(1)
+        config.weights[name] = float(value)
+    if args.approve is not None:
+        config.approve_threshold = args.approve
+    if args.review is not None:
+        config.review_threshold = args.review
+
+    logger.info(f"⚖️  Scoring config: {json.dumps(config.to_dict())}")
+
+    store = AnalysisStore(args.db)
+    results = rescore(store, config, apply=args.apply)
+    print(format_diff(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Run Rust Scanner Wrapper
-Executes the Rust binary and extracts the JSON output.
+Executes the Rust binary and collects the repos it streams (one JSON object per line).
 """
 
 import subprocess
@@ -10,6 +10,10 @@ import os
 import json
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.rust_bridge import stream_repos
+
 def main():
     if len(sys.argv) != 3:
         print("Usage: run_rust_scanner_wrapper.py <tier> <output.json>")
@@ -37,39 +41,20 @@ def main():
         print("❌ GITHUB_TOKEN not set in environment")
         sys.exit(1)
 
+    data = []
     try:
-        result = subprocess.run(
-            [str(rust_bin), tier],
-            capture_output=True,
-            text=True,
-            env=env,
-            encoding='utf-8'
-        )
-
-        if result.returncode != 0:
-            print(f"❌ Rust scanner failed: {result.stderr}")
-            sys.exit(1)
-
-        # Extract JSON
-        stdout = result.stdout
-        start_marker = "__REPO_JSON__"
-        end_marker = "__END_JSON__"
-
-        if start_marker not in stdout or end_marker not in stdout:
-            print("❌ Could not find JSON markers in output")
-            print(stdout)
-            sys.exit(1)
-
-        json_str = stdout.split(start_marker)[1].split(end_marker)[0].strip()
-
-        # Validate JSON
-        data = json.loads(json_str)
+        for repo in stream_repos([str(rust_bin), tier], env=env, idle_timeout=120):
+            data.append(repo)
+            print(f"📦 {repo.get('full_name')}")
 
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2)
 
         print(f"✅ Saved {len(data)} repos to {output_file}")
 
+    except subprocess.TimeoutExpired:
+        print("❌ Rust scanner stopped producing output for 120 seconds")
+        sys.exit(1)
     except Exception as e:
         print(f"❌ Error running scanner: {e}")
         sys.exit(1)
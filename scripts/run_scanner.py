@@ -7,17 +7,22 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from scanner.github_scanner import GitHubScanner
+from scanner.insights_store import InsightsStore
+from scanner.token_pool import collect_github_tokens
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 def main():
-    token = os.getenv("GITHUB_TOKEN")
-    if not token:
+    tokens = collect_github_tokens()
+    if not tokens:
         logging.error("GITHUB_TOKEN environment variable is required.")
         sys.exit(1)
 
-    scanner = GitHubScanner(token)
+    # GITHUB_TOKEN_2..5 add extra rate-limit budgets to the pool
+    # Daily scans reuse slow-moving metrics from previous runs
+    store = InsightsStore(os.getenv("INSIGHTS_DB", ".cache/insights.sqlite"))
+    scanner = GitHubScanner(tokens, cache_dir=os.getenv("GITHUB_CACHE_DIR", ".cache/github"), insights_store=store)
 
     logging.info("Scanning for recent repositories...")
     repos = scanner.scan_recent_repos(limit=20)
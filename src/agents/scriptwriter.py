@@ -3,10 +3,17 @@ import os
 import json
 import logging
 
+try:
+    from scanner.context_builder import pack_readme
+except ImportError:
+    from src.scanner.context_builder import pack_readme
+
 class ScriptWriter:
-    def __init__(self, api_key=None, provider="gemini", model_name="gemini-2.5-flash"):
+    def __init__(self, api_key=None, provider="gemini", model_name="gemini-2.5-flash", readme_budget=500):
         self.provider = provider
         self.model_name = model_name
+        # Estimated tokens of README (badges and licence text stripped) per script prompt
+        self.readme_budget = readme_budget
 
         if self.provider == "gemini":
             if not api_key:
@@ -33,7 +40,7 @@ class ScriptWriter:
         Analyze this GitHub repository and create a video script.
         Repo Name: {repo_data.get('name')}
         Description: {repo_data.get('description')}
-        Readme Snippet: {repo_data.get('readme', '')[:2000]}
+        Readme Snippet: {pack_readme(repo_data.get('readme', ''), self.readme_budget)}
 
         Structure the response as JSON with these keys:
         - "hook": The pain point or problem this solves.
@@ -6,26 +6,47 @@ import logging
 import time
 from typing import Dict, Optional
 
+try:
+    from .context_builder import CONTEXT_BUILDER_VERSION, ContextBuilder
+    from .review_cache import ReviewCache, prompt_template_hash
+except ImportError:
+    from src.scanner.context_builder import CONTEXT_BUILDER_VERSION, ContextBuilder
+    from src.scanner.review_cache import ReviewCache, prompt_template_hash
+
 logger = logging.getLogger(__name__)
 
 
 class AIReviewer:
     """Uses Gemini AI to perform code quality review"""
 
-    def __init__(self, google_api_key: str):
-        """Initialize with Gemini API key"""
+    def __init__(self, google_api_key: str, review_cache: Optional[ReviewCache] = None,
+                 context_budget: int = 1500):
+        """
+        Initialize with Gemini API key
+
+        Args:
+            google_api_key: Gemini API key.
+            review_cache: Reuse reviews of repos whose HEAD commit hasn't changed.
+            context_budget: Estimated tokens shared by README, commits and file samples.
+        """
+        self.context_budget = context_budget
+        # Using gemini-2.0-flash-exp for latest features
+        self.model_name = 'gemini-2.0-flash-exp'
+        self.review_cache = review_cache
+        self.prompt_hash = prompt_template_hash(self._create_review_prompt, context_budget=context_budget,
+                                                context_builder=CONTEXT_BUILDER_VERSION)
         try:
             import google.generativeai as genai
             genai.configure(api_key=google_api_key)
-            # Using gemini-2.0-flash-exp for latest features
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            self.model = genai.GenerativeModel(self.model_name)
             self.available = True
             logger.info("✅ Gemini AI reviewer initialized")
         except Exception as e:
             logger.error(f"❌ Failed to initialize Gemini: {e}")
             self.available = False
 
-    def review_repository(self, repo, readme_content: str, recent_files: list) -> Optional[Dict]:
+    def review_repository(self, repo, readme_content: str, recent_files: list,
+                          head_sha: Optional[str] = None) -> Optional[Dict]:
         """
         Perform AI-powered code review
 
@@ -33,6 +54,8 @@ class AIReviewer:
             repo: PyGithub Repository object
             readme_content: Full README text
             recent_files: List of recently modified files with content samples
+            head_sha: HEAD commit the review covers, used as the review cache key.
+                Resolved through the cache when omitted.
 
         Returns:
             Dict with scores and analysis, or None if review fails
@@ -41,6 +64,14 @@ class AIReviewer:
             logger.warning("AI reviewer not available")
             return None
 
+        if self.review_cache is None:
+            return self._review(repo, readme_content, recent_files)
+        return self.review_cache.get_or_review(
+            repo.full_name, head_sha, self.model_name, self.prompt_hash,
+            lambda: self._review(repo, readme_content, recent_files),
+        )
+
+    def _review(self, repo, readme_content: str, recent_files: list) -> Optional[Dict]:
         try:
             # Build context for AI
             context = self._build_review_context(repo, readme_content, recent_files)
@@ -70,28 +101,34 @@ class AIReviewer:
             "language": repo.language or "Unknown",
             "stars": repo.stargazers_count,
             "forks": repo.forks_count,
-            "readme": readme_content[:3000],  # First 3000 chars
             "topics": repo.get_topics(),
             "has_wiki": repo.has_wiki,
             "has_pages": repo.has_pages,
         }
 
-        # Add file samples
-        if recent_files:
-            context["file_samples"] = recent_files[:5]  # Max 5 files
-
         # Get recent commit messages
         try:
-            commits = list(repo.get_commits()[:10])
-            context["recent_commits"] = [
+            commits = [
                 {
-                    "message": c.commit.message[:200],
+                    "message": c.commit.message,
                     "author": c.commit.author.name if c.commit.author else "Unknown"
                 }
-                for c in commits
+                for c in repo.get_commits()[:10]
             ]
         except:
-            context["recent_commits"] = []
+            commits = []
+
+        # README sections, commits and file samples share one token budget, most useful first
+        packed = (
+            ContextBuilder(self.context_budget)
+            .add_readme(readme_content)
+            .add_commits(commits)
+            .add_files(recent_files or [])
+            .build()
+        )
+        context["readme"] = "\n\n".join(packed.get("readme", []))
+        context["file_samples"] = packed.get("files", [])
+        context["recent_commits"] = packed.get("commits", [])
 
         return context
 
@@ -102,12 +139,12 @@ class AIReviewer:
         if context.get("file_samples"):
             file_samples = "\n\n## Code Samples\n"
             for file in context["file_samples"]:
-                file_samples += f"\n### {file['path']}\n```{file.get('language', '')}\n{file['content'][:500]}\n```\n"
+                file_samples += f"\n### {file['path']}\n```{file.get('language', '')}\n{file['content']}\n```\n"
 
         commits = ""
         if context.get("recent_commits"):
             commits = "\n\n## Recent Commits\n"
-            for commit in context["recent_commits"][:5]:
+            for commit in context["recent_commits"]:
                 commits += f"- {commit['message']} (by {commit['author']})\n"
 
         prompt = f"""You are an expert code reviewer analyzing a GitHub repository to determine if it's a "hidden gem" - a quality project that deserves more visibility.
@@ -119,7 +156,7 @@ class AIReviewer:
 - **Stars**: {context['stars']} | **Forks**: {context['forks']}
 - **Topics**: {', '.join(context.get('topics', []))}
 
-## README (first 3000 chars)
+## README
 {context['readme']}
 {file_samples}
 {commits}
@@ -0,0 +1,155 @@
+"""
+Per-repository analysis context for GemAnalyzer.
+
+Each scorer used to ask PyGithub for what it needed, so the root listing was
+fetched three or four times per repo and issue comments were fetched one
+issue at a time. The context fetches each resource once, memoizes it (errors
+included, so fallbacks behave the same on every call) and is shared by all
+the ``_analyze_*`` scorers of one analysis.
+"""
+import base64
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RepoAnalysisContext:
+    """
+    Memoizing view over one PyGithub repository.
+
+    Only ``repo`` attributes that are part of the repository payload itself
+    (stars, license, dates...) are read directly; everything that costs a
+    request goes through the methods below.
+    """
+
+    def __init__(self, repo, max_bulk_comments: int = 300):
+        """
+        Args:
+            repo: PyGithub ``Repository``.
+            max_bulk_comments: Repo-wide issue comments scanned when looking for
+                the first reply to sampled issues before falling back to
+                per-issue requests.
+        """
+        self.repo = repo
+        self.max_bulk_comments = max_bulk_comments
+        self._cache: Dict[Any, Any] = {}
+        self._first_comments: Dict[int, datetime] = {}
+
+    @property
+    def full_name(self) -> str:
+        return self.repo.full_name
+
+    def _memo(self, key: Any, fetch: Callable[[], Any]) -> Any:
+        if key not in self._cache:
+            try:
+                self._cache[key] = (fetch(), None)
+            except Exception as e:
+                self._cache[key] = (None, e)
+
+        value, error = self._cache[key]
+        if error is not None:
+            raise error
+        return value
+
+    def commits(self) -> List:
+        """The last 50 commits on the default branch."""
+        return self._memo("commits", lambda: list(self.repo.get_commits()[:50]))
+
+    def readme(self) -> bytes:
+        """Raw README content. Raises if the repo has no README."""
+        return self._memo("readme", lambda: self.repo.get_readme().decoded_content)
+
+    def contents(self, path: str = "") -> Any:
+        """Directory listing (or file) at ``path``; the root listing by default."""
+        return self._memo(("contents", path), lambda: self.repo.get_contents(path))
+
+    def closed_issues(self) -> List:
+        """The 30 most recent closed issues."""
+        return self._memo("closed_issues", lambda: list(self.repo.get_issues(state='closed')[:30]))
+
+    def open_issues(self) -> List:
+        """The 20 most recent open issues."""
+        return self._memo("open_issues", lambda: list(self.repo.get_issues(state='open')[:20]))
+
+    def pulls(self) -> List:
+        """The 20 most recent pull requests in any state."""
+        return self._memo("pulls", lambda: list(self.repo.get_pulls(state='all')[:20]))
+
+    def releases(self) -> List:
+        """The 10 most recent releases."""
+        return self._memo("releases", lambda: list(self.repo.get_releases()[:10]))
+
+    def recent_blobs(self, max_commits: int = 10) -> List:
+        """
+        Files changed in the last ``max_commits`` commits that still exist at HEAD.
+
+        One compare request covers the whole window and one recursive tree
+        request supplies sizes and blob SHAs. Entries have ``path``, ``size``
+        and ``sha``.
+        """
+        commits = self.commits()[:max_commits]
+        if not commits:
+            return []
+
+        head = commits[0].sha
+        oldest = commits[-1]
+        if len(commits) > 1:
+            # Compare from the parent of the oldest commit so its own changes are included
+            base = oldest.parents[0].sha if oldest.parents else oldest.sha
+            changed = [f.filename for f in self.repo.compare(base, head).files]
+        else:
+            changed = [f.filename for f in commits[0].files]
+
+        tree = {
+            entry.path: entry
+            for entry in self.repo.get_git_tree(head, recursive=True).tree
+            if entry.type == "blob"
+        }
+        # Deleted files are missing from the tree
+        return [tree[path] for path in dict.fromkeys(changed) if path in tree]
+
+    def read_blob(self, sha: str) -> Optional[str]:
+        """Blob content decoded as UTF-8, or None if it can't be fetched or decoded."""
+        try:
+            blob = self.repo.get_git_blob(sha)
+            return base64.b64decode(blob.content).decode('utf-8')
+        except Exception:
+            return None
+
+    def first_comment_times(self, issues: Iterable) -> Dict[int, datetime]:
+        """
+        Creation time of the first comment on each of ``issues`` that has comments.
+
+        Reads the repo-wide comment stream (oldest first, starting at the oldest
+        sampled issue) so a handful of pages replace one request per issue.
+        Issues not found within ``max_bulk_comments`` are looked up one by one.
+        """
+        issues = [issue for issue in issues if issue.comments > 0]
+        wanted = {issue.number for issue in issues} - set(self._first_comments)
+
+        if wanted:
+            since = min(issue.created_at for issue in issues if issue.number in wanted)
+            try:
+                stream = self.repo.get_issues_comments(sort="created", direction="asc", since=since)
+                for scanned, comment in enumerate(stream, start=1):
+                    number = int(comment.issue_url.rstrip("/").rsplit("/", 1)[-1])
+                    if number in wanted:
+                        self._first_comments[number] = comment.created_at
+                        wanted.discard(number)
+                    if not wanted or scanned >= self.max_bulk_comments:
+                        break
+            except Exception as e:
+                logger.warning(f"Bulk comment fetch failed for {self.full_name}: {e}")
+
+            for issue in issues:
+                if issue.number in wanted:
+                    comments = list(issue.get_comments()[:1])
+                    if comments:
+                        self._first_comments[issue.number] = comments[0].created_at
+
+        return {
+            issue.number: self._first_comments[issue.number]
+            for issue in issues if issue.number in self._first_comments
+        }
@@ -0,0 +1,131 @@
+"""
+Local SQLite store for GemAnalyzer results.
+
+Keeps the raw (unrounded) sub-scores next to the recommendation they
+produced, so the whole corpus can be rescored with new weights or
+thresholds without touching the network.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class StoredAnalysis:
+    """One stored analysis."""
+
+    def __init__(self, repo: str, scores: Dict[str, float], total_score: float,
+                 recommendation: str, priority: str, analyzed_at: float):
+        self.repo = repo
+        self.scores = scores
+        self.total_score = total_score
+        self.recommendation = recommendation
+        self.priority = priority
+        self.analyzed_at = analyzed_at
+
+
+class AnalysisStore:
+    """
+    Per-repo GemAnalyzer results keyed by ``full_name``.
+
+    Safe to share between threads; all access goes through one connection
+    guarded by a lock.
+    """
+
+    def __init__(self, db_path: str = ".cache/gem_analyses.sqlite", clock: Callable[[], float] = time.time):
+        """
+        Args:
+            db_path: SQLite database file. Use ``":memory:"`` for a throwaway store.
+            clock: Clock returning epoch seconds (injectable for tests).
+        """
+        self.logger = logging.getLogger(__name__)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analyses (
+                repo TEXT PRIMARY KEY,
+                scores TEXT NOT NULL,
+                total_score REAL NOT NULL,
+                recommendation TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                result TEXT NOT NULL,
+                analyzed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def save(self, result: Dict[str, Any], raw_scores: Dict[str, float]) -> None:
+        """Store an ``analyze_repo`` result with the raw sub-scores behind it."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses "
+                "(repo, scores, total_score, recommendation, priority, result, analyzed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    result["repo"],
+                    json.dumps(raw_scores),
+                    result["total_score"],
+                    result["recommendation"],
+                    result["priority"],
+                    json.dumps(result, default=str),
+                    self._clock(),
+                ),
+            )
+            self._conn.commit()
+
+    def get(self, repo: str) -> Optional[StoredAnalysis]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT repo, scores, total_score, recommendation, priority, analyzed_at "
+                "FROM analyses WHERE repo = ?",
+                (repo,),
+            ).fetchone()
+        return self._to_analysis(row) if row else None
+
+    def get_result(self, repo: str) -> Optional[Dict[str, Any]]:
+        """The full ``analyze_repo`` result as stored."""
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM analyses WHERE repo = ?", (repo,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def all(self) -> Iterator[StoredAnalysis]:
+        """Every stored analysis, ordered by repo name."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT repo, scores, total_score, recommendation, priority, analyzed_at "
+                "FROM analyses ORDER BY repo"
+            ).fetchall()
+        return (self._to_analysis(row) for row in rows)
+
+    def update_verdict(self, repo: str, total_score: float, recommendation: str, priority: str) -> None:
+        """Overwrite the verdict of a stored analysis (columns and ``result``) after rescoring."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE analyses SET total_score = ?, recommendation = ?, priority = ?, "
+                "result = json_set(result, '$.total_score', ?, '$.recommendation', ?, '$.priority', ?) "
+                "WHERE repo = ?",
+                (total_score, recommendation, priority, total_score, recommendation, priority, repo),
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    @staticmethod
+    def _to_analysis(row) -> StoredAnalysis:
+        repo, scores, total_score, recommendation, priority, analyzed_at = row
+        return StoredAnalysis(repo, json.loads(scores), total_score, recommendation, priority, analyzed_at)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
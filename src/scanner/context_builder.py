@@ -0,0 +1,243 @@
+"""
+Token-budgeted prompt context for the AI reviewers and the script writer.
+
+Prompts used to cut the README at a fixed number of characters, whatever
+it started with (often a wall of badges) and whatever came after it. The
+ContextBuilder instead measures pieces in estimated tokens, strips
+boilerplate (badges, HTML-only lines, comments, licence text, tables of
+contents) and packs README sections, commit messages and file samples into
+a budget by priority, so the most useful context survives and prompts stay
+small.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Bump when packing or cleaning changes what a prompt sees, so reviews cached
+# from the old context are not reused (it is part of the review cache key)
+CONTEXT_BUILDER_VERSION = 2
+
+# Rough but stable: English text and code average about four characters per token
+CHARS_PER_TOKEN = 4
+
+# Piece priorities; lower is packed first
+PRIORITY_README_INTRO = 0
+PRIORITY_README_KEY = 1
+PRIORITY_COMMITS = 2
+PRIORITY_FILES = 3
+PRIORITY_README_SETUP = 4
+PRIORITY_README_OTHER = 5
+
+# A truncated piece shorter than this isn't worth including
+MIN_PIECE_TOKENS = 32
+
+KEY_SECTION = re.compile(
+    r"^(overview|about|introduction|description|features?|why|motivation|how it works|"
+    r"architecture|design|usage|examples?|getting started|quick ?start|demo)\b", re.IGNORECASE)
+SETUP_SECTION = re.compile(r"^(install(ation|ing)?|setup|requirements|configuration)\b", re.IGNORECASE)
+BOILERPLATE_SECTION = re.compile(
+    r"^(licen[cs]e|copyright|table of contents|contents|toc|contributors|star history)\b", re.IGNORECASE)
+LICENSE_TEXT = re.compile(
+    r"permission is hereby granted|the software is provided \"as is\"|licensed under the apache license|"
+    r"gnu general public license|redistribution and use in source and binary forms", re.IGNORECASE)
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE = re.compile(r"^\s*(```|~~~)")
+HTML_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+# Lines made only of (linked) images, e.g. a row of shields.io badges
+IMAGE_ONLY_LINE = re.compile(r"^\s*(\[?!\[[^\]]*\]\([^)]*\)\]?(\([^)]*\))?\s*)+$")
+# Lines made only of HTML tags (<p align="center">, <img ...>, </a>, ...)
+TAG_ONLY_LINE = re.compile(r"^\s*(<[^>]+>\s*)+$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimated token count of ``text``."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` to about ``max_tokens``, at a line break when there is one."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    newline = cut.rfind("\n")
+    if newline > max_chars // 2:
+        cut = cut[:newline]
+    return cut.rstrip()
+
+
+def strip_boilerplate(readme: str) -> str:
+    """Drop badges, HTML-only lines, comments and licence text from a README."""
+    readme = HTML_COMMENT.sub("", readme)
+    lines = []
+    in_code = False
+    for line in readme.splitlines():
+        if FENCE.match(line):
+            in_code = not in_code
+        elif not in_code and (IMAGE_ONLY_LINE.match(line) or TAG_ONLY_LINE.match(line)):
+            continue
+        lines.append(line)
+
+    paragraphs = re.split(r"\n\s*\n", "\n".join(lines))
+    kept = [p.strip("\n") for p in paragraphs if p.strip() and not LICENSE_TEXT.search(p)]
+    return "\n\n".join(kept)
+
+
+def readme_sections(readme: str) -> List[Tuple[str, str]]:
+    """
+    Split a cleaned README into (heading, text) sections.
+
+    The text before the first heading comes back with heading ``""``.
+    Boilerplate sections (licence, table of contents, ...) are left out.
+    """
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    in_code = False
+    for line in readme.splitlines():
+        if FENCE.match(line):
+            in_code = not in_code
+        match = None if in_code else HEADING.match(line)
+        if match:
+            sections.append((match.group(2), [line]))
+        else:
+            sections[-1][1].append(line)
+
+    result = []
+    for heading, lines in sections:
+        text = "\n".join(lines).strip()
+        if text and not BOILERPLATE_SECTION.match(heading):
+            result.append((heading, text))
+    return result
+
+
+class ContextPiece:
+    """One candidate piece of prompt context."""
+
+    def __init__(self, key: str, text: str, priority: int, order: int,
+                 value: Any = None, truncatable: bool = True):
+        self.key = key
+        self.text = text
+        self.priority = priority
+        self.order = order
+        self.value = value
+        self.truncatable = truncatable
+        self.tokens = estimate_tokens(text)
+
+
+class ContextBuilder:
+    """
+    Packs prompt context into a token budget by priority.
+
+    Pieces are added under a key ("readme", "commits", "files", ...) and
+    packed most important first; a piece that doesn't fit is truncated if
+    allowed, otherwise skipped in favour of smaller ones. ``build`` returns
+    the chosen pieces per key in the order they were added.
+    """
+
+    def __init__(self, budget_tokens: int):
+        """
+        Args:
+            budget_tokens: Estimated tokens all pieces together may use.
+        """
+        self.budget_tokens = budget_tokens
+        self._pieces: List[ContextPiece] = []
+
+    def add(self, key: str, text: str, priority: int, value: Any = None,
+            truncatable: bool = True) -> "ContextBuilder":
+        """
+        Add a piece.
+
+        Args:
+            key: Group the piece is returned under.
+            text: Text that goes into the prompt (and is measured).
+            priority: Lower is packed first.
+            value: Returned instead of ``text`` when set (e.g. a file dict).
+                Pieces with a value are never truncated.
+            truncatable: Whether the piece may be cut to fit.
+        """
+        if text.strip():
+            self._pieces.append(ContextPiece(key, text, priority, len(self._pieces), value,
+                                             truncatable and value is None))
+        return self
+
+    def add_readme(self, readme: str, key: str = "readme") -> "ContextBuilder":
+        """
+        Add a README, cleaned of boilerplate, one piece per section.
+
+        The intro is whatever comes before the first real section: text with
+        no heading, or under a leading ``# ProjectName`` title.
+        """
+        in_intro = True
+        for heading, text in readme_sections(strip_boilerplate(readme or "")):
+            title = HEADING.match(text.splitlines()[0]) if heading else None
+            in_intro = in_intro and (not heading or (
+                len(title.group(1)) == 1 and not KEY_SECTION.match(heading) and not SETUP_SECTION.match(heading)))
+            if in_intro:
+                priority = PRIORITY_README_INTRO
+            elif KEY_SECTION.match(heading):
+                priority = PRIORITY_README_KEY
+            elif SETUP_SECTION.match(heading):
+                priority = PRIORITY_README_SETUP
+            else:
+                priority = PRIORITY_README_OTHER
+            self.add(key, text, priority)
+        return self
+
+    def add_commits(self, commits: Iterable[Dict[str, str]], key: str = "commits",
+                    limit: int = 10) -> "ContextBuilder":
+        """
+        Add commit messages, one piece each, skipping repeated subjects.
+
+        Args:
+            commits: Dicts with ``message`` and optionally ``author``.
+            limit: Most commits added.
+        """
+        seen = set()
+        for commit in commits:
+            message = (commit.get("message") or "").strip()
+            subject = message.splitlines()[0][:200] if message else ""
+            if not subject or subject.lower() in seen:
+                continue
+            seen.add(subject.lower())
+            value = {**commit, "message": subject}
+            self.add(key, subject, PRIORITY_COMMITS, value=value)
+            if len(seen) >= limit:
+                break
+        return self
+
+    def add_files(self, files: Iterable[Dict[str, Any]], key: str = "files",
+                  max_file_tokens: int = 125) -> "ContextBuilder":
+        """
+        Add file samples, each capped at ``max_file_tokens``.
+
+        Args:
+            files: Dicts with ``path``, ``content`` and optionally ``language``.
+        """
+        for file in files:
+            content = truncate_to_tokens(file.get("content") or "", max_file_tokens)
+            self.add(key, f"{file.get('path', '')}\n{content}", PRIORITY_FILES,
+                     value={**file, "content": content})
+        return self
+
+    def build(self) -> Dict[str, List[Any]]:
+        """Chosen pieces per key, in insertion order."""
+        remaining = self.budget_tokens
+        chosen: List[Tuple[ContextPiece, Any]] = []
+
+        for piece in sorted(self._pieces, key=lambda p: (p.priority, p.order)):
+            if piece.tokens <= remaining:
+                chosen.append((piece, piece.value if piece.value is not None else piece.text))
+                remaining -= piece.tokens
+            elif piece.truncatable and remaining >= MIN_PIECE_TOKENS:
+                text = truncate_to_tokens(piece.text, remaining)
+                chosen.append((piece, text))
+                remaining -= estimate_tokens(text)
+
+        packed: Dict[str, List[Any]] = {}
+        for piece, value in sorted(chosen, key=lambda item: item[0].order):
+            packed.setdefault(piece.key, []).append(value)
+        return packed
+
+
+def pack_readme(readme: Optional[str], budget_tokens: int) -> str:
+    """A README cleaned of boilerplate and packed into ``budget_tokens``."""
+    return "\n\n".join(ContextBuilder(budget_tokens).add_readme(readme or "").build().get("readme", []))
@@ -0,0 +1,108 @@
+"""
+Deferred polling for GitHub statistics that are still being computed.
+
+The ``/stats/*`` endpoints answer 202 while GitHub builds the statistics in
+the background. Instead of blocking on them (or scoring them as zero), the
+repository is registered here and re-polled with backoff while the scanner
+keeps working on other candidates.
+"""
+import logging
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PendingStat:
+    """One repository waiting for its statistics."""
+
+    def __init__(self, key: str, payload: Any, next_poll_at: float, delay: float, deadline_at: float):
+        self.key = key
+        self.payload = payload
+        self.next_poll_at = next_poll_at
+        self.delay = delay
+        self.deadline_at = deadline_at
+
+
+class DeferredStats:
+    """
+    Registry of repositories whose stats answered 202.
+
+    ``poll`` is called with the registered key and returns the value, or None
+    while GitHub is still computing it. A repository is finalized once a value
+    arrives or its deadline passes, in which case the value is None.
+    """
+
+    def __init__(self, poll: Callable[[str], Optional[Any]], initial_delay: float = 2.0,
+                 backoff: float = 2.0, max_delay: float = 30.0, deadline: float = 60.0,
+                 sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            poll: Fetches the stat for a key; returns None while it is pending.
+            initial_delay: Seconds before the first re-poll.
+            backoff: Factor applied to the delay after each pending answer.
+            max_delay: Upper bound for the delay between polls.
+            deadline: Seconds after registration when a repo is finalized without stats.
+            sleep: Sleep function (injectable for tests).
+            clock: Clock returning epoch seconds (injectable for tests).
+        """
+        self._poll = poll
+        self.initial_delay = initial_delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._sleep = sleep
+        self._clock = clock
+        self._pending: Dict[str, PendingStat] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def register(self, key: str, payload: Any = None) -> None:
+        """Start tracking ``key``; ``payload`` is handed back when it is finalized."""
+        now = self._clock()
+        self._pending[key] = PendingStat(key, payload, now + self.initial_delay,
+                                         self.initial_delay, now + self.deadline)
+        logger.info(f"⏳ Stats for {key} still computing, will re-check in {self.initial_delay:.0f}s")
+
+    def poll_due(self) -> List[Tuple[str, Any, Optional[Any]]]:
+        """
+        Re-poll every entry whose delay has elapsed, without waiting.
+
+        Returns:
+            ``(key, payload, value)`` for each finalized entry. ``value`` is None
+            when the deadline passed before the stats arrived.
+        """
+        finalized = []
+        now = self._clock()
+
+        for key, entry in list(self._pending.items()):
+            if entry.next_poll_at > now:
+                continue
+
+            value = self._poll(key)
+            if value is not None:
+                del self._pending[key]
+                finalized.append((key, entry.payload, value))
+                continue
+
+            now = self._clock()
+            if now >= entry.deadline_at:
+                del self._pending[key]
+                logger.warning(f"⚠️ Stats for {key} not ready before the deadline, finalizing without them")
+                finalized.append((key, entry.payload, None))
+                continue
+
+            entry.delay = min(entry.delay * self.backoff, self.max_delay)
+            entry.next_poll_at = min(now + entry.delay, entry.deadline_at)
+
+        return finalized
+
+    def drain(self) -> Iterator[Tuple[str, Any, Optional[Any]]]:
+        """Wait for the remaining entries, yielding each one as it is finalized."""
+        while self._pending:
+            wait = min(entry.next_poll_at for entry in self._pending.values()) - self._clock()
+            if wait > 0:
+                self._sleep(wait)
+            yield from self.poll_due()
@@ -1,21 +1,122 @@
 """
 Hidden Gems Analyzer - Deep analysis for quality low-visibility projects
 """
+import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 import logging
 
+try:
+    from .analysis_context import RepoAnalysisContext
+    from .keyword_matcher import COMMIT_NEGATIVE_KEYWORDS
+except ImportError:
+    from src.scanner.analysis_context import RepoAnalysisContext
+    from src.scanner.keyword_matcher import COMMIT_NEGATIVE_KEYWORDS
+
 logger = logging.getLogger(__name__)
 
 
+class ScoringConfig:
+    """Weights and thresholds that turn the four sub-scores into a recommendation"""
+
+    DEFAULT_WEIGHTS = {
+        "commit_activity": 0.30,
+        "code_quality": 0.25,
+        "developer_engagement": 0.25,
+        "project_maturity": 0.20,
+    }
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None,
+                 approve_threshold: float = 70, review_threshold: float = 60):
+        """
+        Args:
+            weights: Weight per sub-score; missing keys keep their default.
+            approve_threshold: Minimum total for APPROVE (HIGH priority).
+            review_threshold: Minimum total for REVIEW (MEDIUM priority).
+        """
+        self.weights = {**self.DEFAULT_WEIGHTS, **(weights or {})}
+        self.approve_threshold = approve_threshold  # Lowered from 75 to generate more blog posts
+        self.review_threshold = review_threshold
+
+    def total(self, scores: Dict[str, float]) -> float:
+        """Weighted total of the raw sub-scores"""
+        return sum(scores.get(name, 0) * weight for name, weight in self.weights.items())
+
+    def recommend(self, total_score: float) -> Tuple[str, str]:
+        """Recommendation and priority for a total score"""
+        if total_score >= self.approve_threshold:
+            return "APPROVE", "HIGH"
+        if total_score >= self.review_threshold:
+            return "REVIEW", "MEDIUM"
+        return "REJECT", "LOW"
+
+    def evaluate(self, scores: Dict[str, float]) -> Tuple[float, str, str]:
+        """Total score, recommendation and priority for raw sub-scores"""
+        total_score = self.total(scores)
+        recommendation, priority = self.recommend(total_score)
+        return total_score, recommendation, priority
+
+    def to_dict(self) -> Dict:
+        return {
+            "weights": dict(self.weights),
+            "approve_threshold": self.approve_threshold,
+            "review_threshold": self.review_threshold,
+        }
+
+    @classmethod
+    def from_dict(cls, config: Dict) -> "ScoringConfig":
+        return cls(
+            weights=config.get("weights"),
+            approve_threshold=config.get("approve_threshold", 70),
+            review_threshold=config.get("review_threshold", 60),
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "ScoringConfig":
+        """Load a config saved as JSON (same layout as ``to_dict``)"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
 class GemAnalyzer:
     """Analyzes repositories to find hidden gems"""
 
-    def __init__(self, github_client):
+    def __init__(self, github_client, local_backend=None, scoring: Optional[ScoringConfig] = None,
+                 store=None):
+        """
+        Args:
+            github_client: PyGithub ``Github`` client.
+            local_backend: Optional ``LocalGitBackend``. When set, commits, README,
+                project structure and file samples are read from a shallow clone
+                instead of the API.
+            scoring: Weights and thresholds; the defaults when omitted.
+            store: Optional ``AnalysisStore``. Every analysis is saved with its
+                raw sub-scores so it can be rescored later without the network.
+        """
         self.client = github_client
+        self.local_backend = local_backend
+        self.scoring = scoring or ScoringConfig()
+        self.store = store
+
+    def context_for(self, repo) -> RepoAnalysisContext:
+        """
+        Wrap a PyGithub repository (or an existing context) for analysis.
+
+        Share the returned context between ``has_red_flags`` and ``analyze_repo``
+        so they don't fetch the same resources twice.
+        """
+        if isinstance(repo, RepoAnalysisContext):
+            return repo
+        if self.local_backend is not None:
+            try:
+                return self.local_backend.context_for(repo)
+            except Exception as e:
+                logger.warning(f"⚠️ Local clone of {repo.full_name} failed, using the API: {e}")
+        return RepoAnalysisContext(repo)
 
-    def analyze_repo(self, repo_full_name: str) -> Dict:
+    def analyze_repo(self, repo_full_name: str, context: Optional[RepoAnalysisContext] = None) -> Dict:
         """
         Perform deep analysis on a repository
         Returns scoring and recommendation
@@ -23,32 +124,24 @@ class GemAnalyzer:
         logger.info(f"🔍 Analyzing {repo_full_name} for hidden gem potential...")
 
         try:
-            repo = self.client.get_repo(repo_full_name)
-
-            # Gather all metrics
-            commit_score, commit_data = self._analyze_commits(repo)
-            quality_score, quality_data = self._analyze_code_quality(repo)
-            engagement_score, engagement_data = self._analyze_engagement(repo)
-            maturity_score, maturity_data = self._analyze_maturity(repo)
-
-            # Calculate weighted total score
-            total_score = (
-                commit_score * 0.30 +
-                quality_score * 0.25 +
-                engagement_score * 0.25 +
-                maturity_score * 0.20
-            )
+            ctx = context or self.context_for(self.client.get_repo(repo_full_name))
+            repo = ctx.repo
+
+            # Gather all metrics (the context fetches each resource only once)
+            commit_score, commit_data = self._analyze_commits(ctx)
+            quality_score, quality_data = self._analyze_code_quality(ctx)
+            engagement_score, engagement_data = self._analyze_engagement(ctx)
+            maturity_score, maturity_data = self._analyze_maturity(ctx)
+
+            raw_scores = {
+                "commit_activity": commit_score,
+                "code_quality": quality_score,
+                "developer_engagement": engagement_score,
+                "project_maturity": maturity_score
+            }
 
-            # Determine recommendation
-            if total_score >= 70:  # Lowered from 75 to generate more blog posts
-                recommendation = "APPROVE"
-                priority = "HIGH"
-            elif total_score >= 60:
-                recommendation = "REVIEW"
-                priority = "MEDIUM"
-            else:
-                recommendation = "REJECT"
-                priority = "LOW"
+            # Weighted total score and recommendation
+            total_score, recommendation, priority = self.scoring.evaluate(raw_scores)
 
             result = {
                 "repo": repo_full_name,
@@ -76,6 +169,9 @@ class GemAnalyzer:
                 }
             }
 
+            if self.store is not None:
+                self.store.save(result, raw_scores)
+
             logger.info(f"✅ Analysis complete: {total_score:.2f}/100 - {recommendation}")
             return result
 
@@ -83,10 +179,24 @@ class GemAnalyzer:
             logger.error(f"❌ Failed to analyze {repo_full_name}: {e}")
             return None
 
-    def _analyze_commits(self, repo) -> Tuple[float, Dict]:
+    def analyze_repos(self, repo_full_names: List[str], max_workers: int = 4) -> Dict[str, Optional[Dict]]:
+        """
+        Analyze several repositories concurrently.
+
+        Returns:
+            Analysis per repo, in input order. Failed analyses map to None.
+        """
+        if max_workers <= 1 or len(repo_full_names) <= 1:
+            return {name: self.analyze_repo(name) for name in repo_full_names}
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(repo_full_names))) as executor:
+            futures = {name: executor.submit(self.analyze_repo, name) for name in repo_full_names}
+            return {name: future.result() for name, future in futures.items()}
+
+    def _analyze_commits(self, ctx: RepoAnalysisContext) -> Tuple[float, Dict]:
         """Analyze commit activity and quality"""
         try:
-            commits = list(repo.get_commits()[:50])  # Last 50 commits
+            commits = ctx.commits()  # Last 50 commits
 
             if len(commits) < 10:
                 return 0, {"reason": "Too few commits"}
@@ -97,13 +207,9 @@ class GemAnalyzer:
             commits_per_week = len(recent_commits) / 26  # ~26 weeks in 6 months
 
             # Check for negative keywords in recent commits
-            negative_keywords = ["alpha", "test", "wip", "beta", "experimental", "todo", "fix typo"]
             messages = [c.commit.message.lower() for c in recent_commits[:20]]
 
-            negative_count = sum(
-                1 for msg in messages
-                if any(kw in msg for kw in negative_keywords)
-            )
+            negative_count = sum(1 for msg in messages if COMMIT_NEGATIVE_KEYWORDS.search(msg))
             negative_ratio = negative_count / len(messages) if messages else 1
 
             # Check message quality (length and descriptiveness)
@@ -148,16 +254,16 @@ class GemAnalyzer:
             logger.error(f"Error analyzing commits: {e}")
             return 0, {"error": str(e)}
 
-    def _analyze_code_quality(self, repo) -> Tuple[float, Dict]:
+    def _analyze_code_quality(self, ctx: RepoAnalysisContext) -> Tuple[float, Dict]:
         """Analyze code structure and quality indicators"""
         try:
+            repo = ctx.repo
             score = 0
             data = {}
 
             # README quality (0-25 points)
             try:
-                readme = repo.get_readme()
-                readme_content = readme.decoded_content.decode('utf-8')
+                readme_content = ctx.readme().decode('utf-8')
                 readme_length = len(readme_content)
 
                 readme_score = min(readme_length / 2000, 1.0) * 25  # Max at 2000 chars
@@ -177,7 +283,7 @@ class GemAnalyzer:
 
             # Project structure (0-25 points)
             try:
-                contents = repo.get_contents("")
+                contents = ctx.contents("")
                 file_names = [c.name for c in contents]
                 dir_names = [c.name for c in contents if c.type == "dir"]
 
@@ -209,7 +315,7 @@ class GemAnalyzer:
 
             # CI/CD (0-20 points)
             try:
-                workflows_dir = repo.get_contents(".github/workflows")
+                workflows_dir = ctx.contents(".github/workflows")
                 if workflows_dir:
                     score += 20
                     data["has_ci_cd"] = True
@@ -217,7 +323,7 @@ class GemAnalyzer:
             except:
                 try:
                     # Check for other CI configs
-                    root_contents = repo.get_contents("")
+                    root_contents = ctx.contents("")
                     ci_files = [".travis.yml", ".circleci", "azure-pipelines.yml", ".gitlab-ci.yml"]
                     has_ci = any(c.name in ci_files for c in root_contents)
                     if has_ci:
@@ -227,7 +333,7 @@ class GemAnalyzer:
                     data["has_ci_cd"] = False
 
             # Language-specific quality indicators (0-15 points)
-            lang_score = self._analyze_language_specifics(repo)
+            lang_score = self._analyze_language_specifics(ctx)
             score += lang_score
             data["language_specific_score"] = round(lang_score, 2)
 
@@ -237,14 +343,14 @@ class GemAnalyzer:
             logger.error(f"Error analyzing code quality: {e}")
             return 0, {"error": str(e)}
 
-    def _analyze_language_specifics(self, repo) -> float:
+    def _analyze_language_specifics(self, ctx: RepoAnalysisContext) -> float:
         """Check language-specific quality indicators"""
-        lang = repo.language
+        lang = ctx.repo.language
         if not lang:
             return 0
 
         try:
-            contents = repo.get_contents("")
+            contents = ctx.contents("")
             file_names = [c.name for c in contents]
 
             score = 0
@@ -280,26 +386,26 @@ class GemAnalyzer:
         except:
             return 0
 
-    def _analyze_engagement(self, repo) -> Tuple[float, Dict]:
+    def _analyze_engagement(self, ctx: RepoAnalysisContext) -> Tuple[float, Dict]:
         """Analyze developer responsiveness and community engagement"""
         try:
+            repo = ctx.repo
             score = 0
             data = {}
 
             # Issues analysis (0-50 points)
             try:
                 open_issues = repo.open_issues_count
-                closed_issues_list = list(repo.get_issues(state='closed')[:30])
+                closed_issues_list = ctx.closed_issues()
 
                 if closed_issues_list:
-                    # Calculate average response time
-                    response_times = []
-                    for issue in closed_issues_list[:10]:
-                        if issue.comments > 0:
-                            comments = list(issue.get_comments()[:1])
-                            if comments:
-                                time_to_response = (comments[0].created_at - issue.created_at).days
-                                response_times.append(time_to_response)
+                    # Calculate average response time (first comments fetched in bulk)
+                    sampled = closed_issues_list[:10]
+                    first_comments = ctx.first_comment_times(sampled)
+                    response_times = [
+                        (first_comments[issue.number] - issue.created_at).days
+                        for issue in sampled if issue.number in first_comments
+                    ]
 
                     if response_times:
                         avg_response_time = sum(response_times) / len(response_times)
@@ -332,7 +438,7 @@ class GemAnalyzer:
 
             # Pull Requests analysis (0-50 points)
             try:
-                prs = list(repo.get_pulls(state='all')[:20])
+                prs = ctx.pulls()
 
                 if prs:
                     merged_prs = [pr for pr in prs if pr.merged]
@@ -362,15 +468,16 @@ class GemAnalyzer:
             logger.error(f"Error analyzing engagement: {e}")
             return 0, {"error": str(e)}
 
-    def _analyze_maturity(self, repo) -> Tuple[float, Dict]:
+    def _analyze_maturity(self, ctx: RepoAnalysisContext) -> Tuple[float, Dict]:
         """Analyze project maturity and stability"""
         try:
+            repo = ctx.repo
             score = 0
             data = {}
 
             # Releases (0-40 points)
             try:
-                releases = list(repo.get_releases()[:10])
+                releases = ctx.releases()
 
                 if releases:
                     latest_release = releases[0]
@@ -407,7 +514,7 @@ class GemAnalyzer:
 
             # Documentation (0-30 points)
             try:
-                contents = repo.get_contents("")
+                contents = ctx.contents("")
                 file_names = [c.name.lower() for c in contents]
 
                 # Changelog
@@ -422,7 +529,7 @@ class GemAnalyzer:
 
                 # Documentation directory
                 if "docs" in file_names:
-                    docs_contents = repo.get_contents("docs")
+                    docs_contents = ctx.contents("docs")
                     if isinstance(docs_contents, list) and len(docs_contents) > 2:
                         score += 10
                         data["has_detailed_docs"] = True
@@ -462,10 +569,13 @@ class GemAnalyzer:
             return 0, {"error": str(e)}
 
     def has_red_flags(self, repo) -> Tuple[bool, List[str]]:
-        """Check for automatic rejection criteria"""
+        """Check for automatic rejection criteria (accepts a repo or its analysis context)"""
         red_flags = []
 
         try:
+            ctx = self.context_for(repo)
+            repo = ctx.repo
+
             # No activity in >6 months
             six_months_ago = datetime.now(timezone.utc) - timedelta(days=180)
             if repo.updated_at < six_months_ago:
@@ -473,8 +583,7 @@ class GemAnalyzer:
 
             # Very short README
             try:
-                readme = repo.get_readme()
-                if len(readme.decoded_content) < 200:
+                if len(ctx.readme()) < 200:
                     red_flags.append("README too short (<200 chars)")
             except:
                 red_flags.append("No README found")
@@ -485,7 +594,7 @@ class GemAnalyzer:
 
             # Check issues response rate
             try:
-                issues = list(repo.get_issues(state='open')[:20])
+                issues = ctx.open_issues()
                 if len(issues) > 10:
                     responded = sum(1 for i in issues if i.comments > 0)
                     response_rate = responded / len(issues)
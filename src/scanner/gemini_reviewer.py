@@ -1,37 +1,88 @@
 """
 AI Code Reviewer using Google Gemini API
-Uses multiple API keys for load balancing and better rate limits
+Uses multiple API keys concurrently for throughput and better rate limits
 """
 import json
 import logging
 import os
-import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from google import genai
 from google.genai import types
 
+try:
+    from .context_builder import CONTEXT_BUILDER_VERSION, estimate_tokens, pack_readme
+    from .key_dispatcher import KeyDispatcher
+    from .review_batching import chunked, parse_batch_entries, review_in_batches
+    from .review_cache import ReviewCache, prompt_template_hash
+except ImportError:
+    from src.scanner.context_builder import CONTEXT_BUILDER_VERSION, estimate_tokens, pack_readme
+    from src.scanner.key_dispatcher import KeyDispatcher
+    from src.scanner.review_batching import chunked, parse_batch_entries, review_in_batches
+    from src.scanner.review_cache import ReviewCache, prompt_template_hash
+
 logger = logging.getLogger(__name__)
 
+MAX_OUTPUT_TOKENS = 1000
+
+REVIEW_CRITERIA = """## Evaluation Criteria
+Evaluate this project on these 5 dimensions (score 1-10 each):
+
+1. **Architecture** (1-10): Code structure, modularity, design patterns, scalability
+2. **Documentation** (1-10): README quality, code comments, API docs, examples
+3. **Testing** (1-10): Test coverage indicators, CI/CD presence, quality assurance
+4. **Best Practices** (1-10): Code style, security considerations, performance awareness
+5. **Innovation** (1-10): Uniqueness, creative problem-solving, value proposition
+
+Also provide:
+- 3 key strengths of the project
+- 3 areas for improvement
+- A one-sentence overall assessment"""
+
+REVIEW_SCHEMA = """{
+  "architecture_score": <1-10>,
+  "documentation_score": <1-10>,
+  "testing_score": <1-10>,
+  "practices_score": <1-10>,
+  "innovation_score": <1-10>,
+  "key_strengths": ["strength1", "strength2", "strength3"],
+  "improvements": ["improvement1", "improvement2", "improvement3"],
+  "assessment": "one sentence overall assessment"
+}"""
+
 
 class GeminiReviewer:
-    """Uses Google Gemini API to perform code quality review with key rotation"""
+    """Uses Google Gemini API to perform code quality review across a pool of keys"""
 
-    def __init__(self, model: str = "gemini-2.0-flash"):
+    def __init__(self, model: str = "gemini-2.0-flash", review_cache: Optional[ReviewCache] = None,
+                 rpm: int = 15, tpm: int = 1_000_000, readme_budget: int = 1000):
         """
         Initialize with Gemini API keys
 
         Args:
             model: Model to use. Options: 'gemini-2.0-flash', 'gemini-1.5-pro', etc.
+            review_cache: Reuse reviews of repos whose HEAD commit hasn't changed.
+            rpm: Requests per minute allowed per API key.
+            tpm: Tokens per minute allowed per API key.
+            readme_budget: Estimated tokens of README context per repository.
         """
         self.model_name = model
+        self.readme_budget = readme_budget
+        self.review_cache = review_cache
+        context_params = {"readme_budget": readme_budget, "context_builder": CONTEXT_BUILDER_VERSION}
+        self.prompt_hash = prompt_template_hash(self._create_review_prompt, **context_params)
+        self.batch_prompt_hash = prompt_template_hash(lambda context: self._create_batch_prompt([context, context]),
+                                                      **context_params)
         self.api_keys = self._collect_api_keys()
-        self.current_key_index = 0
         self.available = len(self.api_keys) > 0
-        self.client: genai.Client = None
+        self.clients: List[genai.Client] = []
+        self.dispatcher: Optional[KeyDispatcher] = None
 
         if self.available:
-            self._configure_current_key()
+            # One client per key; the dispatcher keeps one request in flight on each
+            self.clients = [genai.Client(api_key=key) for key in self.api_keys]
+            self.dispatcher = KeyDispatcher(self.api_keys, rpm=rpm, tpm=tpm)
             logger.info(f"✅ Gemini reviewer initialized with {len(self.api_keys)} API keys (model: {self.model_name})")
         else:
             logger.warning("⚠️ No Gemini API keys found, AI reviewer disabled")
@@ -54,21 +105,8 @@ class GeminiReviewer:
 
         return keys
 
-    def _configure_current_key(self):
-        """Configure Gemini with the current API key"""
-        if self.api_keys:
-            self.client = genai.Client(api_key=self.api_keys[self.current_key_index])
-
-    def _rotate_key(self):
-        """Rotate to the next available API key"""
-        if len(self.api_keys) <= 1:
-            return
-
-        self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
-        self._configure_current_key()
-        logger.info(f"🔄 Rotated to Gemini API key #{self.current_key_index + 1}")
-
-    def review_repository(self, repo, readme_content: str, recent_files: list) -> Optional[Dict]:
+    def review_repository(self, repo, readme_content: str, recent_files: list,
+                          head_sha: Optional[str] = None) -> Optional[Dict]:
         """
         Perform AI-powered code review using Gemini
 
@@ -76,6 +114,8 @@ class GeminiReviewer:
             repo: Repository object with name, description, language, etc.
             readme_content: Full README text
             recent_files: List of recently modified files (not used currently)
+            head_sha: HEAD commit the review covers, used as the review cache key.
+                Resolved through the cache when omitted.
 
         Returns:
             Dictionary with review scores and insights, or None if failed
@@ -83,6 +123,106 @@ class GeminiReviewer:
         if not self.available:
             return None
 
+        if self.review_cache is None:
+            return self._review(repo, readme_content)
+        return self.review_cache.get_or_review(
+            repo.full_name, head_sha, self.model_name, self.prompt_hash,
+            lambda: self._review(repo, readme_content),
+            is_valid=lambda scores: scores != self._default_scores(),
+        )
+
+    def review_many(self, repos: List[Tuple[Any, str]], batch_size: int = 1) -> List[Optional[Dict]]:
+        """
+        Review several repositories concurrently, one in-flight request per API key
+
+        Args:
+            repos: (repo, readme_content) pairs
+            batch_size: Repositories per prompt (see ``review_batch``)
+
+        Returns:
+            Review results in the same order as ``repos``; None for repos
+            whose review failed, so one bad repo doesn't sink the rest
+        """
+        if not repos:
+            return []
+        if not self.available:
+            return [None] * len(repos)
+
+        def review_one(item: Tuple[Any, str]) -> Optional[Dict]:
+            try:
+                return self.review_repository(item[0], item[1], [])
+            except Exception as e:
+                logger.error(f"Error during AI review of {getattr(item[0], 'full_name', item[0])}: {e}")
+                return None
+
+        def review_chunk(batch: List[Tuple[Any, str]]) -> List[Optional[Dict]]:
+            try:
+                return self.review_batch(batch, batch_size)
+            except Exception as e:
+                logger.error(f"Error during batched AI review, reviewing one by one: {e}")
+                return [review_one(item) for item in batch]
+
+        with ThreadPoolExecutor(max_workers=len(self.api_keys)) as executor:
+            if batch_size <= 1:
+                return list(executor.map(review_one, repos))
+            batches = executor.map(review_chunk, chunked(repos, batch_size))
+            return [result for batch in batches for result in batch]
+
+    def review_batch(self, repos: List[Tuple[Any, str]], batch_size: int = 4,
+                     head_shas: Optional[List[Optional[str]]] = None) -> List[Optional[Dict]]:
+        """
+        Review repositories ``batch_size`` per prompt, sending the instructions once per batch
+
+        Repositories the batched answer doesn't cover with a valid entry are
+        reviewed again with the single-repo prompt, and cached under its key.
+
+        Args:
+            repos: (repo, readme_content) pairs
+            batch_size: Repositories per prompt
+            head_shas: HEAD commit per repo for the review cache (resolved when omitted)
+
+        Returns:
+            Review results in the same order as ``repos``
+        """
+        if not self.available:
+            return [None] * len(repos)
+
+        if self.review_cache is None:
+            return review_in_batches(repos, batch_size, self._review_batch,
+                                     lambda item: self._review(item[0], item[1]))
+
+        def review(indexes: List[int]) -> List[Optional[Dict]]:
+            # Uncovered repos come back None; the cache reviews them singly under prompt_hash
+            return review_in_batches([repos[index] for index in indexes], batch_size,
+                                     self._review_batch, lambda item: None)
+
+        return self.review_cache.get_or_review_batched(
+            [repo.full_name for repo, _ in repos], head_shas, self.model_name,
+            self.batch_prompt_hash, self.prompt_hash, review, lambda index: self._review(*repos[index]),
+            is_valid=lambda scores: scores != self._default_scores(),
+        )
+
+    def _review_batch(self, repos: List[Tuple[Any, str]]) -> List[Optional[Dict]]:
+        try:
+            contexts = [self._build_context(repo, readme_content) for repo, readme_content in repos]
+            response = self._call_gemini_with_retry(
+                self._create_batch_prompt(contexts),
+                max_output_tokens=MAX_OUTPUT_TOKENS * len(repos),
+            )
+        except Exception as e:
+            logger.error(f"Error during batched AI review: {e}")
+            return [None] * len(repos)
+
+        if not response:
+            return [None] * len(repos)
+        results = []
+        for entry in parse_batch_entries(response, len(repos)):
+            scores = self._parse_ai_response(json.dumps(entry)) if entry else None
+            # Default scores mean the entry didn't parse; review that repo on its own
+            results.append(None if scores == self._default_scores() else scores)
+        return results
+
+    def _review(self, repo, readme_content: str) -> Optional[Dict]:
         try:
             # Build context
             context = self._build_context(repo, readme_content)
@@ -90,7 +230,7 @@ class GeminiReviewer:
             # Create prompt
             prompt = self._create_review_prompt(context)
 
-            # Call Gemini API with retry and key rotation
+            # Call Gemini API on whichever key is free, retrying on another
             response = self._call_gemini_with_retry(prompt)
 
             if response:
@@ -120,15 +260,13 @@ class GeminiReviewer:
             "stars": getattr(repo, 'stargazers_count', 0),
             "forks": getattr(repo, 'forks_count', 0),
             "topics": ", ".join(topics) if topics else "None",
-            "readme": readme_content[:4000],  # First 4000 chars for Gemini
+            "readme": pack_readme(readme_content, self.readme_budget),
             "has_license": bool(getattr(repo, 'license', False)),
         }
 
-    def _create_review_prompt(self, context: Dict) -> str:
-        """Create the review prompt for Gemini"""
-        return f"""You are an expert code reviewer analyzing open source projects. Provide a quality assessment for this GitHub repository.
-
-## Repository Information
+    def _repo_section(self, context: Dict) -> str:
+        """Repository information and README for one repository"""
+        return f"""## Repository Information
 - **Name**: {context['name']}
 - **Description**: {context['description']}
 - **Primary Language**: {context['language']}
@@ -139,75 +277,82 @@ class GeminiReviewer:
 ## README Content
 ```
 {context['readme']}
-```
+```"""
 
-## Evaluation Criteria
-Evaluate this project on these 5 dimensions (score 1-10 each):
+    def _create_review_prompt(self, context: Dict) -> str:
+        """Create the review prompt for Gemini"""
+        return f"""You are an expert code reviewer analyzing open source projects. Provide a quality assessment for this GitHub repository.
 
-1. **Architecture** (1-10): Code structure, modularity, design patterns, scalability
-2. **Documentation** (1-10): README quality, code comments, API docs, examples
-3. **Testing** (1-10): Test coverage indicators, CI/CD presence, quality assurance
-4. **Best Practices** (1-10): Code style, security considerations, performance awareness
-5. **Innovation** (1-10): Uniqueness, creative problem-solving, value proposition
+{self._repo_section(context)}
 
-Also provide:
-- 3 key strengths of the project
-- 3 areas for improvement
-- A one-sentence overall assessment
+{REVIEW_CRITERIA}
 
 ## Response Format
 Respond ONLY with valid JSON (no markdown, no explanation):
-{{
-  "architecture_score": <1-10>,
-  "documentation_score": <1-10>,
-  "testing_score": <1-10>,
-  "practices_score": <1-10>,
-  "innovation_score": <1-10>,
-  "key_strengths": ["strength1", "strength2", "strength3"],
-  "improvements": ["improvement1", "improvement2", "improvement3"],
-  "assessment": "one sentence overall assessment"
-}}"""
+{REVIEW_SCHEMA}"""
+
+    def _create_batch_prompt(self, contexts: List[Dict]) -> str:
+        """Create one review prompt covering several repositories"""
+        repos = "\n\n".join(
+            f"# Repository {index}\n\n{self._repo_section(context)}"
+            for index, context in enumerate(contexts, 1)
+        )
+        return f"""You are an expert code reviewer analyzing open source projects. Provide a quality assessment for each of these {len(contexts)} GitHub repositories.
+
+{repos}
 
-    def _call_gemini_with_retry(self, prompt: str, max_retries: int = 3) -> Optional[str]:
-        """Call Gemini API with retry and key rotation"""
+{REVIEW_CRITERIA}
+
+Review each repository on its own merits.
+
+## Response Format
+Respond ONLY with a valid JSON array (no markdown, no explanation) holding one object per repository, in the order given.
+Each object has an "index" field with the repository number, plus these fields:
+{REVIEW_SCHEMA}"""
+
+    def _call_gemini_with_retry(self, prompt: str, max_retries: int = 3,
+                                max_output_tokens: int = MAX_OUTPUT_TOKENS) -> Optional[str]:
+        """Call Gemini API, moving each retry to the next free key instead of sleeping"""
+        tokens = estimate_tokens(prompt) + max_output_tokens
 
         for attempt in range(1, max_retries + 1):
+            key_index = self.dispatcher.acquire(tokens)
             try:
-                logger.info(f"🤖 Calling Gemini API (attempt {attempt}/{max_retries}, key #{self.current_key_index + 1})...")
+                logger.info(f"🤖 Calling Gemini API (attempt {attempt}/{max_retries}, key #{key_index + 1})...")
 
-                response = self.client.models.generate_content(
+                response = self.clients[key_index].models.generate_content(
                     model=self.model_name,
                     contents=prompt,
                     config=types.GenerateContentConfig(
                         temperature=0.3,
-                        max_output_tokens=1000,
+                        max_output_tokens=max_output_tokens,
                     )
                 )
 
                 if response and response.text:
                     logger.info("✅ Gemini API call successful")
-                    # Rotate key after success to distribute load
-                    self._rotate_key()
+                    self.dispatcher.release(key_index)
                     return response.text
-                else:
-                    logger.warning("Gemini returned empty response")
-                    self._rotate_key()
 
-            except Exception as e:
-                error_msg = str(e)
-                logger.warning(f"Gemini API error (attempt {attempt}): {error_msg}")
+                logger.warning("Gemini returned empty response")
+                self.dispatcher.release(key_index, failed=True)
 
-                # Rotate key on error
-                self._rotate_key()
-
-                if attempt < max_retries:
-                    wait_time = 2 ** attempt
-                    logger.info(f"Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
+            except Exception as e:
+                logger.warning(f"Gemini API error (attempt {attempt}, key #{key_index + 1}): {e}")
+                self.dispatcher.release(key_index, failed=True, retry_after=self._retry_after(e))
 
         logger.error("Max retries reached for Gemini API")
         return None
 
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Retry-After seconds from a rate-limited Gemini response, if it sent one"""
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        try:
+            return float(headers.get('retry-after'))
+        except (TypeError, ValueError):
+            return None
+
     def _parse_ai_response(self, response_text: str) -> Dict:
         """Parse AI JSON response"""
         try:
@@ -0,0 +1,232 @@
+"""
+Shared HTTP client for GitHub REST callers.
+
+Keeps one pooled, keep-alive session per client so repeated small JSON calls
+reuse TCP/TLS connections instead of opening a new one per request. An
+optional ResponseCache turns repeat GETs into conditional requests, and an
+optional RateLimitScheduler paces requests against the token's budget.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from .rate_limiter import RateLimitScheduler
+    from .response_cache import ResponseCache
+    from .token_pool import TokenPool
+except ImportError:
+    from src.scanner.rate_limiter import RateLimitScheduler
+    from src.scanner.response_cache import ResponseCache
+    from src.scanner.token_pool import TokenPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = "https://api.github.com"
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class GitHubClient:
+    """
+    Pooled HTTP client shared by the scanner, insights collector and reviewers.
+
+    Only the transport lives here: callers still build URLs and interpret
+    status codes themselves. The token, if given, is sent on every request
+    unless the caller overrides the Authorization header.
+    """
+
+    def __init__(self, token: Optional[str] = None, api_url: str = DEFAULT_API_URL,
+                 timeout: Timeout = (5.0, 30.0), pool_connections: int = 10,
+                 pool_maxsize: int = 20, http2: bool = False,
+                 cache: Optional[ResponseCache] = None,
+                 scheduler: Optional[RateLimitScheduler] = None, rate_limit_retries: int = 3,
+                 token_pool: Optional[TokenPool] = None):
+        """
+        Args:
+            token: GitHub API token sent as ``Authorization: token ...``.
+            api_url: Base URL used to resolve relative paths.
+            timeout: Default ``(connect, read)`` timeout in seconds.
+            pool_connections: Number of distinct hosts kept in the pool.
+            pool_maxsize: Keep-alive connections kept per host. Size this to the
+                number of threads that share the client.
+            http2: Use an HTTP/2 transport when ``httpx[http2]`` is installed.
+            cache: On-disk ETag cache. When set, GETs are sent as conditional
+                requests and 304 answers are served from the cache.
+            scheduler: Rate-limit scheduler consulted around every request.
+                Rate-limited requests are parked and retried instead of failing.
+            rate_limit_retries: Retries for a request that hit a rate limit.
+            token_pool: Several tokens to spread requests across. Each request
+                uses the pool's token with the most remaining quota, and the
+                pool's scheduler replaces ``scheduler``.
+        """
+        self.token_pool = token_pool
+        if token_pool is not None:
+            token = token or token_pool.tokens[0]
+            scheduler = token_pool.scheduler
+        self.token = token
+        self.cache = cache
+        self.scheduler = scheduler
+        self.rate_limit_retries = rate_limit_retries
+        self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+        self.default_headers = {"Accept": "application/vnd.github.v3+json"}
+        if token:
+            self.default_headers["Authorization"] = f"token {token}"
+
+        self.http2 = False
+        self._httpx_client = None
+        if http2:
+            self._httpx_client = self._create_http2_client(pool_maxsize)
+            self.http2 = self._httpx_client is not None
+
+        self.session = requests.Session()
+        self.session.headers.update(self.default_headers)
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _create_http2_client(self, pool_maxsize: int):
+        """Create an httpx HTTP/2 client, or None if httpx/h2 are unavailable."""
+        try:
+            import httpx
+
+            return httpx.Client(
+                http2=True,
+                headers=self.default_headers,
+                timeout=self._httpx_timeout(self.timeout),
+                limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize),
+            )
+        except ImportError:
+            logger.warning("⚠️ httpx[http2] not installed, falling back to HTTP/1.1 keep-alive")
+            return None
+
+    @staticmethod
+    def _httpx_timeout(timeout: Timeout):
+        import httpx
+
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    def url(self, path: str) -> str:
+        """Resolve a path like ``/repos/owner/name`` against ``api_url``."""
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.api_url}/{path.lstrip('/')}"
+
+    def request(self, method: str, path: str, headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[Timeout] = None, **kwargs: Any):
+        """Send a request over the pooled connection and return the response."""
+        url = self.url(path)
+        timeout = timeout if timeout is not None else self.timeout
+
+        if self.cache is None or method != "GET":
+            return self._send(method, url, headers, timeout, **kwargs)
+
+        cache_key = url
+        if kwargs.get("params"):
+            cache_key = requests.Request("GET", url, params=kwargs["params"]).prepare().url
+        token = self._token_for(headers)
+
+        entry = self.cache.get(cache_key, token)
+        if entry:
+            headers = {**(headers or {}), **self.cache.conditional_headers(entry)}
+
+        response = self._send(method, url, headers, timeout, **kwargs)
+
+        if response.status_code == 304 and entry:
+            return self.cache.to_response(entry)
+        self.cache.store(cache_key, token, response)
+        return response
+
+    def _token_for(self, headers: Optional[Dict[str, str]]) -> Optional[str]:
+        """The credential a request is sent with, used to scope cache entries."""
+        if headers and headers.get("Authorization"):
+            return headers["Authorization"]
+        if self.token_pool is not None:
+            return self.token_pool.scope
+        return self.token
+
+    def _authorize(self, url: str, headers: Optional[Dict[str, str]]):
+        """Pick the token for one attempt and return it with the headers to send."""
+        if headers and headers.get("Authorization"):
+            return headers["Authorization"], headers
+        if self.token_pool is None:
+            return self.token, headers
+
+        token = self.token_pool.select(url)
+        return token, {**(headers or {}), "Authorization": f"token {token}"}
+
+    def _send(self, method: str, url: str, headers: Optional[Dict[str, str]],
+              timeout: Timeout, **kwargs: Any):
+        if self.scheduler is None:
+            return self._transport(method, url, headers, timeout, **kwargs)
+
+        for attempt in range(self.rate_limit_retries + 1):
+            # Re-pick per attempt so a parked token hands over to another one in the pool
+            token, attempt_headers = self._authorize(url, headers)
+            self.scheduler.acquire(token, url)
+            try:
+                response = self._transport(method, url, attempt_headers, timeout, **kwargs)
+            except Exception as e:
+                self.scheduler.cancel(token, url)
+                if self.token_pool is not None:
+                    self.token_pool.report(token, error=e)
+                raise
+
+            if self.token_pool is not None:
+                self.token_pool.report(token, response)
+            if not self.scheduler.record(token, url, response) or attempt == self.rate_limit_retries:
+                return response
+
+    def _transport(self, method: str, url: str, headers: Optional[Dict[str, str]],
+                   timeout: Timeout, **kwargs: Any):
+        if self._httpx_client is not None:
+            return self._httpx_client.request(
+                method, url, headers=headers, timeout=self._httpx_timeout(timeout), **kwargs
+            )
+
+        return self.session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+
+    def remaining_budget(self, resource: str = "core") -> Optional[int]:
+        """Requests left for this client's token(s), or None if no scheduler / not yet known."""
+        if self.token_pool is not None:
+            return self.token_pool.remaining(resource)
+        if self.scheduler is None:
+            return None
+        return self.scheduler.remaining(self.token, resource)
+
+    def get(self, path: str, **kwargs: Any):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs: Any):
+        return self.request("POST", path, **kwargs)
+
+    def close(self):
+        """Release all pooled connections."""
+        self.session.close()
+        if self._httpx_client is not None:
+            self._httpx_client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def create_github_client(token: Union[str, List[str], None], cache_dir: Optional[str] = None,
+                         **kwargs: Any) -> GitHubClient:
+    """
+    Build the default scanning client: rate-limit scheduling, an optional ETag
+    cache, and a token pool when more than one token is given.
+    """
+    tokens = [t for t in token if t] if isinstance(token, (list, tuple)) else [token]
+    cache = ResponseCache(cache_dir) if cache_dir else None
+
+    if len(tokens) > 1:
+        return GitHubClient(tokens[0], cache=cache, token_pool=TokenPool(tokens), **kwargs)
+    return GitHubClient(tokens[0] if tokens else None, cache=cache, scheduler=RateLimitScheduler(), **kwargs)
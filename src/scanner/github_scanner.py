@@ -1,35 +1,73 @@
-import requests
 import datetime
 import os
 import logging
-from typing import List, Dict, Any, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
 
 try:
+    from .deferred_stats import DeferredStats
+    from .github_client import DEFAULT_API_URL, GitHubClient, create_github_client
+    from .graphql_collector import GraphQLInsightsCollector
     from .insights_collector import InsightsCollector
+    from .insights_store import InsightsStore
+    from .keyword_matcher import SCANNER_EXCLUDE_KEYWORDS
     from .repo_classifier import RepoClassifier
 except ImportError:
     # Fallback for when running scripts from different cwd
+    from src.scanner.deferred_stats import DeferredStats
+    from src.scanner.github_client import DEFAULT_API_URL, GitHubClient, create_github_client
+    from src.scanner.graphql_collector import GraphQLInsightsCollector
     from src.scanner.insights_collector import InsightsCollector
+    from src.scanner.insights_store import InsightsStore
+    from src.scanner.keyword_matcher import SCANNER_EXCLUDE_KEYWORDS
     from src.scanner.repo_classifier import RepoClassifier
 
+# REST calls spent on one candidate by InsightsCollector.collect_insights
+REQUESTS_PER_REPO = 7
+
+
 class GitHubScanner:
-    def __init__(self, token):
-        self.token = token
-        self.headers = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        self.api_url = "https://api.github.com"
+    def __init__(self, token: Union[str, List[str]], client: Optional[GitHubClient] = None,
+                 cache_dir: Optional[str] = None, use_graphql: bool = False, workers: int = 4,
+                 insights_store: Optional[InsightsStore] = None, stats_deadline: float = 60.0,
+                 api_url: str = DEFAULT_API_URL):
+        # token may be a list to spread requests across several rate-limit budgets
+        self.token = token[0] if isinstance(token, (list, tuple)) else token
+        # Candidates whose insights are collected at the same time
+        self.workers = max(1, workers)
+        # Longest wait for GitHub to finish computing a candidate's commit stats
+        self.stats_deadline = stats_deadline
+        # One pooled client shared with the insights collector so every call
+        # reuses the same keep-alive connections (and the same ETag cache).
+        # api_url points it at GitHub Enterprise or a local fake server.
+        self.client = client or create_github_client(
+            token, cache_dir=cache_dir, pool_maxsize=max(self.workers * REQUESTS_PER_REPO, 10), api_url=api_url
+        )
+        self.api_url = self.client.api_url
         self.logger = logging.getLogger(__name__)
 
         # Initialize helpers
-        self.insights_collector = InsightsCollector(token)
+        # insights_store lets repeat scans reuse metrics that are still fresh
+        self.insights_collector = InsightsCollector(self.token, client=self.client, store=insights_store)
         self.classifier = RepoClassifier()
 
-    def scan_recent_repos(self, query="created:>2023-01-01", limit=10) -> List[Dict[str, Any]]:
+        # Optional batched GraphQL path: one query per ~25 repos instead of 7 REST calls each
+        self.graphql_collector = GraphQLInsightsCollector(self.token, client=self.client) if use_graphql else None
+        self._readme_sizes: Dict[str, int] = {}
+
+    def scan_recent_repos(self, query="created:>2023-01-01", limit=10, stream=False) -> List[Dict[str, Any]]:
         """
         Scans for recent repositories and filters them using enhanced analysis.
 
+        Args:
+            query: GitHub search query.
+            limit: Number of accepted repositories to return.
+            stream: Page through search results lazily instead of reading a single
+                page of ``limit * 2`` items. Analysis starts on the first page while
+                the next one loads, and paging stops once ``limit`` repos are accepted.
+                With GraphQL enabled, insights are prefetched per window of candidates.
+
         Returns:
             List of filtered and enriched repository data.
         """
@@ -37,42 +75,216 @@ class GitHubScanner:
         # one_hour_ago = (datetime.datetime.utcnow() - datetime.timedelta(hours=1)).isoformat()
         # query = f"created:>{one_hour_ago} {query}"
 
+        if stream:
+            items = self.iter_search_results(query, per_page=min(limit * 2, 100))
+            # 1. Basic Validation (Cheap), applied as results arrive
+            candidates = (repo for repo in items if self.validate_repo_basic(repo))
+            prefetched = {}
+            if self.graphql_collector:
+                window = min(self.graphql_collector.batch_size, limit * 2)
+                candidates = self._prefetch_windows(candidates, prefetched, window)
+            try:
+                return self._analyze_candidates(candidates, prefetched, limit, check_budget=True)
+            finally:
+                # Stops the background page prefetch if we finished early
+                items.close()
+
         url = f"{self.api_url}/search/repositories?q={query}&sort=updated&order=desc&per_page={limit * 2}" # Fetch more to allow filtering
-        response = requests.get(url, headers=self.headers)
+        response = self.client.get(url)
         if response.status_code != 200:
             self.logger.error(f"Error searching repos: {response.text}")
             return []
 
         items = response.json().get("items", [])
+
+        # 1. Basic Validation (Cheap)
+        candidates = [repo for repo in items if self.validate_repo_basic(repo)]
+
+        affordable = self.affordable_repos()
+        if affordable is not None and affordable < len(candidates):
+            self.logger.warning(f"⚠️ Rate limit budget covers {affordable} of {len(candidates)} candidates, trimming batch")
+            candidates = candidates[:affordable]
+
+        prefetched = {}
+        if self.graphql_collector:
+            prefetched = self.prefetch_insights([repo["full_name"] for repo in candidates])
+
+        return self._analyze_candidates(candidates, prefetched, limit)
+
+    def _analyze_candidates(self, candidates: Iterable[Dict[str, Any]], prefetched: Dict[str, Dict[str, Any]],
+                            limit: int, check_budget: bool = False) -> List[Dict[str, Any]]:
+        """
+        Collect insights for and classify candidates until ``limit`` are accepted.
+
+        Insights for up to ``self.workers`` candidates are collected concurrently
+        while results are classified in candidate order. Work still queued once
+        ``limit`` is reached is cancelled.
+
+        Candidates whose commit stats are still being computed by GitHub (202)
+        are set aside and re-polled with backoff while other candidates are
+        analyzed; they are classified once the stats arrive or
+        ``self.stats_deadline`` passes.
+        """
         results = []
+        candidates = iter(candidates)
+        in_flight = deque()
+        exhausted = False
+        deferred = DeferredStats(self.insights_collector.refresh_commit_activity, deadline=self.stats_deadline)
+        executor = ThreadPoolExecutor(max_workers=self.workers)
 
-        for repo in items:
-            # 1. Basic Validation (Cheap)
-            if not self.validate_repo_basic(repo):
-                continue
+        try:
+            while len(results) < limit:
+                # Keep the expensive stage fed without reading ahead of the window
+                while not exhausted and len(in_flight) < self.workers:
+                    repo = next(candidates, None)
+                    if repo is None:
+                        exhausted = True
+                    elif check_budget and self.affordable_repos() == 0:
+                        self.logger.warning("⚠️ Rate limit budget exhausted, stopping scan early")
+                        exhausted = True
+                    else:
+                        in_flight.append((repo, executor.submit(self._collect_insights, repo, prefetched)))
 
-            # 2. Enhanced Analysis (Expensive)
-            try:
-                insights = self.insights_collector.collect_insights(repo["full_name"])
-                classification = self.classifier.classify_repo(repo, insights)
-
-                if classification["is_real_project"]:
-                    # Merge data
-                    enriched_repo = repo.copy()
-                    enriched_repo["insights"] = insights
-                    enriched_repo["analysis"] = classification
-                    results.append(enriched_repo)
-                    self.logger.info(f"✅ Accepted {repo['full_name']} (Score: {classification['score']})")
-                else:
-                    self.logger.info(f"❌ Rejected {repo['full_name']} (Score: {classification['score']}). Reasons: {classification['reasons']}")
-            except Exception as e:
-                self.logger.error(f"Error analyzing {repo['full_name']}: {e}")
-                continue
-
-            if len(results) >= limit:
-                break
-
-        return results
+                for _, (repo, insights), activity in deferred.poll_due():
+                    insights["commit_frequency_score"] = activity
+                    self._classify_candidate(repo, insights, results)
+
+                if not in_flight:
+                    break
+
+                repo, future = in_flight.popleft()
+                # 2. Enhanced Analysis (Expensive)
+                try:
+                    insights = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error analyzing {repo['full_name']}: {e}")
+                    continue
+
+                if "commit_frequency_score" in insights and insights["commit_frequency_score"] is None:
+                    deferred.register(repo["full_name"], (repo, insights))
+                    continue
+
+                self._classify_candidate(repo, insights, results)
+
+            # Nothing else left to analyze: wait out the repos still pending stats
+            for _, (repo, insights), activity in deferred.drain():
+                if len(results) >= limit:
+                    break
+                insights["commit_frequency_score"] = activity
+                self._classify_candidate(repo, insights, results)
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        return results[:limit]
+
+    def _classify_candidate(self, repo: Dict[str, Any], insights: Dict[str, Any],
+                            results: List[Dict[str, Any]]) -> None:
+        """Classify one candidate and append it to ``results`` if accepted."""
+        try:
+            classification = self.classifier.classify_repo(repo, insights)
+
+            if classification["is_real_project"]:
+                # Merge data
+                enriched_repo = repo.copy()
+                enriched_repo["insights"] = insights
+                enriched_repo["analysis"] = classification
+                results.append(enriched_repo)
+                self.logger.info(f"✅ Accepted {repo['full_name']} (Score: {classification['score']})")
+            else:
+                self.logger.info(f"❌ Rejected {repo['full_name']} (Score: {classification['score']}). Reasons: {classification['reasons']}")
+        except Exception as e:
+            self.logger.error(f"Error analyzing {repo['full_name']}: {e}")
+
+    def _prefetch_windows(self, candidates: Iterable[Dict[str, Any]], prefetched: Dict[str, Dict[str, Any]],
+                          window: int) -> Iterator[Dict[str, Any]]:
+        """
+        Yield ``candidates``, prefetching insights for each ``window`` of them first.
+
+        Results are added to ``prefetched`` before the window's candidates are
+        handed on, so the streaming path gets one GraphQL query per window.
+        """
+        batch = []
+        for repo in candidates:
+            batch.append(repo)
+            if len(batch) >= window:
+                prefetched.update(self.prefetch_insights([r["full_name"] for r in batch]))
+                yield from batch
+                batch = []
+        if batch:
+            prefetched.update(self.prefetch_insights([r["full_name"] for r in batch]))
+            yield from batch
+
+    def _collect_insights(self, repo: Dict[str, Any], prefetched: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        return prefetched.get(repo["full_name"]) or self.insights_collector.collect_insights(repo["full_name"])
+
+    def iter_search_results(self, query: str, per_page: int = 100) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield repository search results, following the Link header.
+
+        The next page is requested in the background while the caller works
+        through the current one. GitHub stops serving search results after
+        1000 items.
+        """
+        url = f"{self.api_url}/search/repositories?q={query}&sort=updated&order=desc&per_page={per_page}"
+        executor = ThreadPoolExecutor(max_workers=1)
+        pending = executor.submit(self.client.get, url)
+
+        try:
+            while pending is not None:
+                response = pending.result()
+                pending = None
+
+                if response.status_code != 200:
+                    self.logger.error(f"Error searching repos: {response.text}")
+                    return
+
+                next_url = response.links.get("next", {}).get("url")
+                if next_url:
+                    pending = executor.submit(self.client.get, next_url)
+
+                for repo in response.json().get("items", []):
+                    yield repo
+        finally:
+            if pending is not None:
+                pending.cancel()
+            executor.shutdown(wait=False)
+
+    def remaining_budget(self) -> Optional[int]:
+        """Core API requests left across this scanner's tokens, or None if not known yet."""
+        return self.client.remaining_budget("core")
+
+    def affordable_repos(self) -> Optional[int]:
+        """How many candidates the remaining budget can fully analyze, or None if unknown."""
+        remaining = self.remaining_budget()
+        if remaining is None:
+            return None
+        if self.graphql_collector:
+            # GraphQL is billed separately; only README/CI fallbacks hit the core budget
+            return None
+        return max(remaining, 0) // REQUESTS_PER_REPO
+
+    def prefetch_insights(self, repo_full_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch insights (and README sizes) for many repos with batched GraphQL queries.
+
+        Repos missing from the result should be collected through the REST path.
+        """
+        if not repo_full_names:
+            return {}
+
+        collector = self.graphql_collector or GraphQLInsightsCollector(self.token, client=self.client)
+        nodes = collector.fetch_batch(repo_full_names)
+        for name, node in nodes.items():
+            size = collector.readme_size(node)
+            if size:
+                # No README in the root tree: leave it to the REST endpoint, which
+                # also finds READMEs in docs/ and .github/
+                self._readme_sizes[name] = size
+
+        self.logger.info(f"Prefetched insights for {len(nodes)}/{len(repo_full_names)} repos via GraphQL")
+        return {name: collector.to_insights(node) for name, node in nodes.items()}
 
     def validate_repo_basic(self, repo):
         """
@@ -94,8 +306,7 @@ class GitHubScanner:
 
         # 2. Keyword Filtering (Exclude toy projects)
         name_desc = (repo["name"] + " " + (repo["description"] or "")).lower()
-        exclude_keywords = ["alpha", "test", "demo", "example", "tutorial", "course", "starter", "template"]
-        if any(k in name_desc for k in exclude_keywords):
+        if SCANNER_EXCLUDE_KEYWORDS.search(name_desc):
             # Exception for "beta" if it looks solid otherwise
             if "beta" not in name_desc:
                 self.logger.debug(f"Skipping {repo['full_name']}: Contains exclude keywords.")
@@ -108,9 +319,12 @@ class GitHubScanner:
         return self.validate_repo_basic(repo)
 
     def _has_substantial_readme(self, repo_full_name):
+        if repo_full_name in self._readme_sizes:
+            # Already known from a GraphQL prefetch
+            return self._readme_sizes[repo_full_name] > 500
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/readme"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
             if response.status_code == 200:
                 data = response.json()
                 # size is in bytes. Let's require at least 500 bytes of documentation.
@@ -123,7 +337,7 @@ class GitHubScanner:
         # Check for successful workflow runs in the last 24 hours
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/actions/runs?per_page=5&status=success"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
             if response.status_code == 200:
                 runs = response.json().get("workflow_runs", [])
                 return len(runs) > 0
@@ -135,7 +349,7 @@ class GitHubScanner:
         """Fetches the latest commit hash for the default branch."""
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/commits/HEAD"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
             if response.status_code == 200:
                 return response.json()["sha"]
             return None
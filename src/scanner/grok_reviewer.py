@@ -2,29 +2,86 @@
 AI Code Reviewer using GitHub Models API (via GitHub Copilot subscription)
 Uses the official GitHub Models REST API endpoint
 """
+import asyncio
 import json
 import logging
+import random
 import subprocess
 import time
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+try:
+    from .context_builder import CONTEXT_BUILDER_VERSION, pack_readme
+    from .github_client import GitHubClient
+    from .review_batching import parse_batch_entries, review_in_batches
+    from .review_cache import ReviewCache, prompt_template_hash
+except ImportError:
+    from src.scanner.context_builder import CONTEXT_BUILDER_VERSION, pack_readme
+    from src.scanner.github_client import GitHubClient
+    from src.scanner.review_batching import parse_batch_entries, review_in_batches
+    from src.scanner.review_cache import ReviewCache, prompt_template_hash
 
 logger = logging.getLogger(__name__)
 
+MAX_OUTPUT_TOKENS = 800
+
+# Statuses worth retrying: rate limits and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Longest Retry-After worth waiting for; a daily-quota 429 asks for hours
+MAX_RETRY_AFTER = 60.0
+
+REVIEW_CRITERIA = """Evaluate the project on these 5 dimensions (score 1-10 each):
+1. Architecture: Code structure, modularity, design patterns
+2. Documentation: README quality, comments, guides
+3. Testing: Test coverage, CI/CD, quality assurance
+4. Best Practices: Code style, security, performance
+5. Innovation: Uniqueness, problem-solving approach
+
+Also provide:
+- 3 key strengths
+- 3 areas for improvement
+- Overall assessment (1 sentence)"""
+
+REVIEW_SCHEMA = """{
+  "architecture_score": <1-10>,
+  "documentation_score": <1-10>,
+  "testing_score": <1-10>,
+  "practices_score": <1-10>,
+  "innovation_score": <1-10>,
+  "key_strengths": ["strength1", "strength2", "strength3"],
+  "improvements": ["improvement1", "improvement2", "improvement3"],
+  "assessment": "one sentence summary"
+}"""
+
 
 class GrokReviewer:
     """Uses GitHub Models API to perform code quality review"""
 
-    def __init__(self, model: str = "gpt-4o"):
+    def __init__(self, model: str = "gpt-4o", http_client: Optional[GitHubClient] = None,
+                 review_cache: Optional[ReviewCache] = None, readme_budget: int = 750):
         """
         Initialize with GitHub authentication
 
         Args:
             model: Model to use. Options: 'gpt-4o', 'gpt-4o-mini', 'claude-3.5-sonnet', 'o1', etc.
+            http_client: Shared pooled HTTP client. A private one is created if omitted.
+            review_cache: Reuse reviews of repos whose HEAD commit hasn't changed.
+            readme_budget: Estimated tokens of README context per repository.
         """
         self.model = model
+        self.readme_budget = readme_budget
+        self.review_cache = review_cache
+        context_params = {"readme_budget": readme_budget, "context_builder": CONTEXT_BUILDER_VERSION}
+        self.prompt_hash = prompt_template_hash(self._create_review_prompt, **context_params)
+        self.batch_prompt_hash = prompt_template_hash(lambda context: self._create_batch_prompt([context, context]),
+                                                      **context_params)
         self.api_endpoint = "https://models.inference.ai.azure.com/chat/completions"
         self.github_token = self._get_github_token()
         self.available = bool(self.github_token)
+        self.http_client = http_client or GitHubClient()
 
         if self.available:
             logger.info(f"✅ GitHub Models reviewer initialized (model: {self.model})")
@@ -56,7 +113,8 @@ class GrokReviewer:
 
         return None
 
-    def review_repository(self, repo, readme_content: str, recent_files: list) -> Optional[Dict]:
+    def review_repository(self, repo, readme_content: str, recent_files: list,
+                          head_sha: Optional[str] = None) -> Optional[Dict]:
         """
         Perform AI-powered code review using GitHub Models
 
@@ -64,6 +122,8 @@ class GrokReviewer:
             repo: PyGithub Repository object
             readme_content: Full README text
             recent_files: List of recently modified files with content samples
+            head_sha: HEAD commit the review covers, used as the review cache key.
+                Resolved through the cache when omitted.
 
         Returns:
             Dictionary with review scores and insights, or None if failed
@@ -71,6 +131,137 @@ class GrokReviewer:
         if not self.available:
             return None
 
+        if self.review_cache is None:
+            return self._review(repo, readme_content, recent_files)
+        return self.review_cache.get_or_review(
+            repo.full_name, head_sha, self.model, self.prompt_hash,
+            lambda: self._review(repo, readme_content, recent_files),
+            is_valid=lambda scores: scores != self._default_scores(),
+        )
+
+    def review_batch(self, repos: List[Tuple[Any, str, list]], batch_size: int = 4,
+                     head_shas: Optional[List[Optional[str]]] = None) -> List[Optional[Dict]]:
+        """
+        Review repositories ``batch_size`` per prompt, sending the instructions once per batch
+
+        Repositories the batched answer doesn't cover with a valid entry are
+        reviewed again with the single-repo prompt, and cached under its key.
+
+        Args:
+            repos: (repo, readme_content, recent_files) triples
+            batch_size: Repositories per prompt
+            head_shas: HEAD commit per repo for the review cache (resolved when omitted)
+
+        Returns:
+            Review results in the same order as ``repos``
+        """
+        if not self.available:
+            return [None] * len(repos)
+
+        if self.review_cache is None:
+            return review_in_batches(repos, batch_size, self._review_batch, lambda item: self._review(*item))
+
+        def review(indexes: List[int]) -> List[Optional[Dict]]:
+            # Uncovered repos come back None; the cache reviews them singly under prompt_hash
+            return review_in_batches([repos[index] for index in indexes], batch_size,
+                                     self._review_batch, lambda item: None)
+
+        return self.review_cache.get_or_review_batched(
+            [repo.full_name for repo, _, _ in repos], head_shas, self.model,
+            self.batch_prompt_hash, self.prompt_hash, review, lambda index: self._review(*repos[index]),
+            is_valid=lambda scores: scores != self._default_scores(),
+        )
+
+    def _review_batch(self, repos: List[Tuple[Any, str, list]]) -> List[Optional[Dict]]:
+        try:
+            contexts = [self._build_context(*item) for item in repos]
+            response = self._call_model_with_retry(
+                self._create_batch_prompt(contexts),
+                max_tokens=MAX_OUTPUT_TOKENS * len(repos),
+            )
+        except Exception as e:
+            logger.error(f"Error during batched AI review: {e}")
+            return [None] * len(repos)
+
+        if not response:
+            return [None] * len(repos)
+        results = []
+        for entry in parse_batch_entries(response, len(repos)):
+            scores = self._parse_ai_response(json.dumps(entry)) if entry else None
+            # Default scores mean the entry didn't parse; review that repo on its own
+            results.append(None if scores == self._default_scores() else scores)
+        return results
+
+    async def review_many(self, repos: List[Tuple[Any, str, list]], concurrency: int = 8,
+                          head_shas: Optional[List[Optional[str]]] = None) -> List[Optional[Dict]]:
+        """
+        Review several repositories concurrently over one pooled async connection
+
+        Args:
+            repos: (repo, readme_content, recent_files) triples
+            concurrency: Most requests in flight at once
+            head_shas: HEAD commit per repo for the review cache (resolved when omitted)
+
+        Returns:
+            Review results in the same order as ``repos``; None for repos
+            whose review failed, so one bad repo doesn't sink the rest
+        """
+        if not repos:
+            return []
+        if not self.available:
+            return [None] * len(repos)
+
+        head_shas = head_shas or [None] * len(repos)
+        results = await self._gather_reviews(repos, concurrency, head_shas)
+        for (repo, _, _), result in zip(repos, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error during AI review of {getattr(repo, 'full_name', repo)}: {result}")
+        return [None if isinstance(result, Exception) else result for result in results]
+
+    async def _gather_reviews(self, repos: List[Tuple[Any, str, list]], concurrency: int,
+                              head_shas: List[Optional[str]]) -> List[Any]:
+        """Review every repo, returning the exception instead of the result for failures"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        try:
+            import httpx
+        except ImportError:
+            logger.warning("⚠️ httpx not installed, reviewing on threads with the blocking client")
+
+            async def review_blocking(item, head_sha):
+                async with semaphore:
+                    return await asyncio.to_thread(self.review_repository, *item, head_sha=head_sha)
+
+            return await asyncio.gather(*(review_blocking(item, sha) for item, sha in zip(repos, head_shas)),
+                                        return_exceptions=True)
+
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(60.0, connect=10.0)) as client:
+            return await asyncio.gather(*(
+                self._review_async(client, semaphore, repo, readme_content, recent_files, head_sha)
+                for (repo, readme_content, recent_files), head_sha in zip(repos, head_shas)
+            ), return_exceptions=True)
+
+    async def _review_async(self, client, semaphore: asyncio.Semaphore, repo, readme_content: str,
+                            recent_files: list, head_sha: Optional[str]) -> Optional[Dict]:
+        async def review():
+            try:
+                prompt = self._create_review_prompt(self._build_context(repo, readme_content, recent_files))
+                async with semaphore:
+                    response = await self._call_model_async(client, prompt)
+                return self._parse_ai_response(response) if response else None
+            except Exception as e:
+                logger.error(f"Error during AI review of {getattr(repo, 'full_name', repo.name)}: {e}")
+                return None
+
+        if self.review_cache is None:
+            return await review()
+        return await self.review_cache.aget_or_review(
+            repo.full_name, head_sha, self.model, self.prompt_hash, review,
+            is_valid=lambda scores: scores != self._default_scores(),
+        )
+
+    def _review(self, repo, readme_content: str, recent_files: list) -> Optional[Dict]:
         try:
             # Build context
             context = self._build_context(repo, readme_content, recent_files)
@@ -101,17 +292,15 @@ class GrokReviewer:
             "stars": repo.stargazers_count,
             "forks": repo.forks_count,
             "topics": ", ".join(repo.get_topics()[:5]),
-            "readme": readme_content[:3000],  # First 3000 chars
+            "readme": pack_readme(readme_content, self.readme_budget),
             "recent_files": recent_files[:3],  # Top 3 files
             "has_license": bool(repo.license),
             "has_wiki": repo.has_wiki,
         }
 
-    def _create_review_prompt(self, context: Dict) -> str:
-        """Create the review prompt for AI"""
-        return f"""Analyze this GitHub repository and provide a quality assessment.
-
-Repository: {context['name']}
+    def _repo_section(self, context: Dict) -> str:
+        """Repository facts and README excerpt for one repository"""
+        return f"""Repository: {context['name']}
 Description: {context['description']}
 Language: {context['language']}
 Stars: {context['stars']} | Forks: {context['forks']}
@@ -119,65 +308,122 @@ Topics: {context['topics']}
 License: {'Yes' if context['has_license'] else 'No'}
 
 README excerpt:
-{context['readme']}
+{context['readme']}"""
 
-Evaluate the project on these 5 dimensions (score 1-10 each):
-1. Architecture: Code structure, modularity, design patterns
-2. Documentation: README quality, comments, guides
-3. Testing: Test coverage, CI/CD, quality assurance
-4. Best Practices: Code style, security, performance
-5. Innovation: Uniqueness, problem-solving approach
+    def _create_review_prompt(self, context: Dict) -> str:
+        """Create the review prompt for AI"""
+        return f"""Analyze this GitHub repository and provide a quality assessment.
 
-Also provide:
-- 3 key strengths
-- 3 areas for improvement
-- Overall assessment (1 sentence)
+{self._repo_section(context)}
+
+{REVIEW_CRITERIA}
 
 Respond ONLY with valid JSON:
-{{
-  "architecture_score": <1-10>,
-  "documentation_score": <1-10>,
-  "testing_score": <1-10>,
-  "practices_score": <1-10>,
-  "innovation_score": <1-10>,
-  "key_strengths": ["strength1", "strength2", "strength3"],
-  "improvements": ["improvement1", "improvement2", "improvement3"],
-  "assessment": "one sentence summary"
-}}"""
+{REVIEW_SCHEMA}"""
 
-    def _call_model_with_retry(self, prompt: str, max_retries: int = 2) -> Optional[str]:
-        """Call GitHub Models API with retry"""
-        import requests
+    def _create_batch_prompt(self, contexts: List[Dict]) -> str:
+        """Create one review prompt covering several repositories"""
+        repos = "\n\n".join(
+            f"=== Repository {index} ===\n{self._repo_section(context)}"
+            for index, context in enumerate(contexts, 1)
+        )
+        return f"""Analyze these {len(contexts)} GitHub repositories and provide a quality assessment of each.
+
+{repos}
+
+{REVIEW_CRITERIA}
+
+Review each repository on its own merits.
+
+Respond ONLY with a valid JSON array holding one object per repository, in the order given.
+Each object has an "index" field with the repository number, plus these fields:
+{REVIEW_SCHEMA}"""
+
+    def _request_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.github_token}",
+            "Accept": "application/json",
+            "Content-Type": "application/json"
+        }
+
+    def _request_payload(self, prompt: str, max_tokens: int = MAX_OUTPUT_TOKENS) -> Dict:
+        return {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a code review expert. Respond only with valid JSON."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "model": self.model,
+            "temperature": 0.3,
+            "max_tokens": max_tokens
+        }
+
+    @staticmethod
+    def _backoff(attempt: int, response=None) -> Optional[float]:
+        """
+        Seconds before retry ``attempt + 1``: the server's Retry-After, else jittered exponential
 
+        Returns None when Retry-After is longer than ``MAX_RETRY_AFTER``; the
+        caller gives up on that request instead of stalling the batch.
+        """
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("Retry-After"))
+            except (TypeError, ValueError):
+                pass
+            else:
+                return retry_after if retry_after <= MAX_RETRY_AFTER else None
+        # Full jitter keeps a batch of concurrent retries from landing together
+        return random.uniform(0, 2 ** attempt)
+
+    async def _call_model_async(self, client, prompt: str, max_retries: int = 3) -> Optional[str]:
+        """Call GitHub Models API on an httpx.AsyncClient with retry"""
         for attempt in range(1, max_retries + 1):
+            response = None
             try:
-                logger.info(f"🤖 Calling GitHub Models API (attempt {attempt}/{max_retries})...")
+                response = await client.post(
+                    self.api_endpoint,
+                    headers=self._request_headers(),
+                    json=self._request_payload(prompt)
+                )
 
-                headers = {
-                    "Authorization": f"Bearer {self.github_token}",
-                    "Content-Type": "application/json"
-                }
+                if response.status_code == 200:
+                    result = response.json()
+                    return result.get('choices', [{}])[0].get('message', {}).get('content', '')
 
-                payload = {
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a code review expert. Respond only with valid JSON."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "model": self.model,
-                    "temperature": 0.3,
-                    "max_tokens": 800
-                }
+                logger.warning(f"GitHub Models API error {response.status_code}: {response.text[:200]}")
+                if response.status_code not in RETRYABLE_STATUSES:
+                    return None
+
+            except Exception as e:
+                logger.warning(f"GitHub Models API call failed (attempt {attempt}): {e!r}")
+
+            if attempt < max_retries:
+                wait_time = self._backoff(attempt, response)
+                if wait_time is None:
+                    logger.error(f"GitHub Models asked to retry after {response.headers.get('Retry-After')}s, giving up")
+                    return None
+                await asyncio.sleep(wait_time)
+
+        logger.error("Max retries reached for GitHub Models API")
+        return None
+
+    def _call_model_with_retry(self, prompt: str, max_retries: int = 2,
+                               max_tokens: int = MAX_OUTPUT_TOKENS) -> Optional[str]:
+        """Call GitHub Models API with retry"""
+        for attempt in range(1, max_retries + 1):
+            try:
+                logger.info(f"🤖 Calling GitHub Models API (attempt {attempt}/{max_retries})...")
 
-                response = requests.post(
+                response = self.http_client.post(
                     self.api_endpoint,
-                    headers=headers,
-                    json=payload,
+                    headers=self._request_headers(),
+                    json=self._request_payload(prompt, max_tokens),
                     timeout=60
                 )
 
@@ -191,8 +437,12 @@ Respond ONLY with valid JSON:
                     logger.warning(f"GitHub Models API error {response.status_code}: {error_msg}")
 
                     if attempt < max_retries:
-                        wait_time = 2 ** attempt
-                        logger.info(f"Retrying in {wait_time}s...")
+                        wait_time = self._backoff(attempt, response)
+                        if wait_time is None:
+                            logger.error(f"GitHub Models asked to retry after "
+                                         f"{response.headers.get('Retry-After')}s, giving up")
+                            return None
+                        logger.info(f"Retrying in {wait_time:.1f}s...")
                         time.sleep(wait_time)
 
             except requests.exceptions.Timeout:
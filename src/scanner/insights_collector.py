@@ -1,40 +1,136 @@
-import requests
 import logging
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union
+
+try:
+    from .github_client import DEFAULT_API_URL, GitHubClient, create_github_client
+    from .insights_store import InsightsStore
+except ImportError:
+    from src.scanner.github_client import DEFAULT_API_URL, GitHubClient, create_github_client
+    from src.scanner.insights_store import InsightsStore
+
+# Reported for a metric that couldn't be fetched. Fetchers return None
+# instead, so a failed request is never stored as if it were real data.
+METRIC_FALLBACKS = {
+    "contributors_count": 0,
+    "commit_frequency_score": 0.0,
+    "health_percentage": 0,
+    "pr_merge_ratio": 0.0,
+    "top_contributors": [],
+    "last_commit_date": "",
+    "open_issues_count": 0,
+}
+
+# Returned by _get_commit_activity while GitHub is still computing the stats (202)
+STATS_PENDING = object()
 
 class InsightsCollector:
     """
     Collects advanced metrics and insights from GitHub repositories.
     """
 
-    def __init__(self, token: str):
-        self.token = token
-        self.headers = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        self.api_url = "https://api.github.com"
+    def __init__(self, token: Union[str, List[str]], max_workers: int = 7,
+                 client: Optional[GitHubClient] = None, cache_dir: Optional[str] = None,
+                 store: Optional[InsightsStore] = None, api_url: str = DEFAULT_API_URL):
+        """
+        Args:
+            token: GitHub API token, or a list of tokens to spread requests across.
+            max_workers: Number of metric requests issued concurrently per repository.
+                Use 1 to fetch the metrics sequentially.
+            client: Shared pooled HTTP client. A private one is created if omitted.
+            cache_dir: Directory for the on-disk ETag cache used by the private
+                client. Ignored when ``client`` is given.
+            store: Local insights store consulted before the network. Only stale
+                or missing metrics are fetched, and fresh results are written back.
+            api_url: Base URL for the private client (GitHub Enterprise or a
+                local fake server). Ignored when ``client`` is given.
+        """
+        self.token = token[0] if isinstance(token, (list, tuple)) else token
+        self.max_workers = max_workers
+        self.store = store
+        self.client = client or create_github_client(
+            token, cache_dir=cache_dir, pool_maxsize=max(max_workers, 10), api_url=api_url
+        )
+        self.api_url = self.client.api_url
         self.logger = logging.getLogger(__name__)
 
     def collect_insights(self, repo_full_name: str) -> Dict[str, Any]:
         """
         Collects comprehensive insights for a repository.
+
+        ``commit_frequency_score`` is None while GitHub is still computing the
+        statistics; re-poll it with ``refresh_commit_activity``.
         """
         self.logger.info(f"Collecting insights for {repo_full_name}")
 
-        insights = {
-            "contributors_count": self._get_contributors_count(repo_full_name),
-            "commit_frequency_score": self._get_commit_activity(repo_full_name),
-            "health_percentage": self._get_community_health(repo_full_name),
-            "pr_merge_ratio": self._get_pr_merge_ratio(repo_full_name),
-            "top_contributors": self._get_top_contributors(repo_full_name),
-            "last_commit_date": self._get_last_commit_date(repo_full_name),
-            "open_issues_count": self._get_open_issues_count(repo_full_name)
-        }
+        fetchers = self._metric_fetchers()
+
+        cached = {}
+        if self.store is not None:
+            cached = self.store.get_fresh(repo_full_name, fetchers)
+            if cached:
+                self.logger.info(f"Reusing {len(cached)}/{len(fetchers)} stored metrics for {repo_full_name}")
+        missing = {name: fetch for name, fetch in fetchers.items() if name not in cached}
+
+        fetched = self._fetch_metrics(repo_full_name, missing)
+        if self.store is not None and fetched:
+            # put() skips None, i.e. every metric whose request failed
+            self.store.put(repo_full_name, {
+                name: None if value is STATS_PENDING else value for name, value in fetched.items()
+            })
 
+        # Keep the usual key order regardless of where each value came from
+        insights = {}
+        for name in fetchers:
+            value = cached[name] if name in cached else fetched[name]
+            if value is STATS_PENDING:
+                insights[name] = None
+            else:
+                insights[name] = METRIC_FALLBACKS.get(name) if value is None else value
         return insights
 
-    def _get_contributors_count(self, repo_full_name: str) -> int:
+    def refresh_commit_activity(self, repo_full_name: str) -> Optional[float]:
+        """
+        Re-poll commit activity after a 202, storing the score once it is ready.
+
+        Returns None while the stats are still pending. A failed request ends
+        the wait with the fallback score, which is not stored.
+        """
+        score = self._get_commit_activity(repo_full_name)
+        if score is STATS_PENDING:
+            return None
+        if score is None:
+            return METRIC_FALLBACKS["commit_frequency_score"]
+        if self.store is not None:
+            self.store.put(repo_full_name, {"commit_frequency_score": score})
+        return score
+
+    def _fetch_metrics(self, repo_full_name: str, fetchers: Dict[str, Any]) -> Dict[str, Any]:
+        if not fetchers:
+            return {}
+
+        if self.max_workers <= 1 or len(fetchers) == 1:
+            return {name: fetch(repo_full_name) for name, fetch in fetchers.items()}
+
+        # The metrics are independent, so issue all requests at once and let the
+        # per-repo latency collapse to roughly the slowest single call.
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(fetchers))) as executor:
+            futures = {name: executor.submit(fetch, repo_full_name) for name, fetch in fetchers.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def _metric_fetchers(self) -> Dict[str, Any]:
+        """Map each insight key to the method that fetches it."""
+        return {
+            "contributors_count": self._get_contributors_count,
+            "commit_frequency_score": self._get_commit_activity,
+            "health_percentage": self._get_community_health,
+            "pr_merge_ratio": self._get_pr_merge_ratio,
+            "top_contributors": self._get_top_contributors,
+            "last_commit_date": self._get_last_commit_date,
+            "open_issues_count": self._get_open_issues_count
+        }
+
+    def _get_contributors_count(self, repo_full_name: str) -> Optional[int]:
         """Get the number of contributors (capped at 100 per page usually)."""
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/contributors?per_page=1&anon=true"
@@ -42,7 +138,7 @@ class InsightsCollector:
             # For efficiency, we can just check page 1 size or use the Link header.
             # GitHub API doesn't give total count directly in body.
             # Faster way: check page 1.
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
             if response.status_code == 200:
                 # Check Link header for last page
                 if "Link" in response.headers:
@@ -55,18 +151,24 @@ class InsightsCollector:
                     except:
                         return 1 # Fallback
                 return len(response.json()) # Should be 1 if per_page=1
-            return 0
+            return None
         except Exception as e:
             self.logger.warning(f"Failed to get contributors: {e}")
-            return 0
+            return None
 
-    def _get_commit_activity(self, repo_full_name: str) -> float:
+    def _get_commit_activity(self, repo_full_name: str) -> Any:
         """
         Get commit activity score (0-10) based on weekly participation.
+
+        Returns STATS_PENDING while GitHub is still computing the statistics
+        (202), so callers can re-poll later instead of scoring the repo as
+        inactive, and None when the request fails.
         """
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/stats/participation"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
+            if response.status_code == 202:
+                return STATS_PENDING
             if response.status_code == 200:
                 data = response.json()
                 if "all" in data:
@@ -75,30 +177,31 @@ class InsightsCollector:
                     # Normalize: if > 20 commits in last month, high score
                     score = min(recent_commits / 2, 10.0) # 20 commits -> 10 points
                     return round(score, 1)
-            return 0.0
+                return 0.0
+            return None
         except Exception:
-            return 0.0
+            return None
 
-    def _get_community_health(self, repo_full_name: str) -> int:
+    def _get_community_health(self, repo_full_name: str) -> Optional[int]:
         """Get community profile health percentage."""
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/community/profile"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
             if response.status_code == 200:
                 data = response.json()
                 return data.get("health_percentage", 0)
-            return 0
+            return None
         except Exception:
-            return 0
+            return None
 
-    def _get_pr_merge_ratio(self, repo_full_name: str) -> float:
+    def _get_pr_merge_ratio(self, repo_full_name: str) -> Optional[float]:
         """
         Calculate ratio of merged PRs to closed PRs (last 100).
         """
         try:
             # We want closed PRs
             url = f"{self.api_url}/repos/{repo_full_name}/pulls?state=closed&per_page=100"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
             if response.status_code == 200:
                 prs = response.json()
                 if not prs:
@@ -108,15 +211,15 @@ class InsightsCollector:
                 total_closed = len(prs)
 
                 return round(merged_count / total_closed, 2)
-            return 0.0
+            return None
         except Exception:
-            return 0.0
+            return None
 
-    def _get_top_contributors(self, repo_full_name: str) -> list:
+    def _get_top_contributors(self, repo_full_name: str) -> Optional[list]:
         """Get top 5 contributors with their commit counts."""
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/contributors?per_page=5"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
             if response.status_code == 200:
                 contributors = []
                 for contrib in response.json():
@@ -127,33 +230,33 @@ class InsightsCollector:
                         "contributions": contrib["contributions"]
                     })
                 return contributors
-            return []
+            return None
         except Exception as e:
             self.logger.warning(f"Failed to get top contributors: {e}")
-            return []
+            return None
 
-    def _get_last_commit_date(self, repo_full_name: str) -> str:
+    def _get_last_commit_date(self, repo_full_name: str) -> Optional[str]:
         """Get the date of the last commit."""
         try:
             url = f"{self.api_url}/repos/{repo_full_name}/commits/HEAD"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
             if response.status_code == 200:
                 commit = response.json()
                 # Return ISO format date
                 return commit["commit"]["committer"]["date"]
-            return ""
+            return None
         except Exception as e:
             self.logger.warning(f"Failed to get last commit date: {e}")
-            return ""
+            return None
 
-    def _get_open_issues_count(self, repo_full_name: str) -> int:
+    def _get_open_issues_count(self, repo_full_name: str) -> Optional[int]:
         """Get the number of open issues."""
         try:
             url = f"{self.api_url}/repos/{repo_full_name}"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
             if response.status_code == 200:
                 return response.json().get("open_issues_count", 0)
-            return 0
+            return None
         except Exception as e:
             self.logger.warning(f"Failed to get open issues count: {e}")
-            return 0
+            return None
@@ -0,0 +1,122 @@
+"""
+Local SQLite store for repository insights with a freshness TTL per metric.
+
+Fast-moving metrics such as ``last_commit_date`` expire within hours, while
+slow-moving ones such as ``health_percentage`` stay valid for days, so repeat
+scans and backfills only re-fetch what is actually stale.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Seconds each metric stays fresh. Metrics not listed use DEFAULT_TTL.
+METRIC_TTLS = {
+    "last_commit_date": 1 * HOUR,
+    "open_issues_count": 6 * HOUR,
+    "commit_frequency_score": 1 * DAY,
+    "pr_merge_ratio": 1 * DAY,
+    "contributors_count": 3 * DAY,
+    "top_contributors": 7 * DAY,
+    "health_percentage": 7 * DAY,
+}
+DEFAULT_TTL = 1 * DAY
+
+
+class InsightsStore:
+    """
+    Per-metric insights cache keyed by repository ``full_name``.
+
+    Safe to share between threads; all access goes through one connection
+    guarded by a lock.
+    """
+
+    def __init__(self, db_path: str = ".cache/insights.sqlite", ttls: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            db_path: SQLite database file. Use ``":memory:"`` for a throwaway store.
+            ttls: Overrides for METRIC_TTLS, in seconds.
+            clock: Clock returning epoch seconds (injectable for tests).
+        """
+        self.logger = logging.getLogger(__name__)
+        self.ttls = {**METRIC_TTLS, **(ttls or {})}
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS insights (
+                full_name TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                value TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (full_name, metric)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def ttl_for(self, metric: str) -> float:
+        return self.ttls.get(metric, DEFAULT_TTL)
+
+    def get_fresh(self, repo_full_name: str, metrics: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Return the metrics for a repository that are still within their TTL.
+
+        Args:
+            repo_full_name: Repository as ``owner/name``.
+            metrics: Restrict the lookup to these metric names.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT metric, value, fetched_at FROM insights WHERE full_name = ?",
+                (repo_full_name,),
+            ).fetchall()
+
+        wanted = set(metrics) if metrics is not None else None
+        now = self._clock()
+        fresh = {}
+        for metric, value, fetched_at in rows:
+            if wanted is not None and metric not in wanted:
+                continue
+            if now - fetched_at < self.ttl_for(metric):
+                fresh[metric] = json.loads(value)
+        return fresh
+
+    def put(self, repo_full_name: str, insights: Dict[str, Any]) -> None:
+        """Store freshly fetched metrics. ``None`` values are skipped."""
+        now = self._clock()
+        rows = [
+            (repo_full_name, metric, json.dumps(value), now)
+            for metric, value in insights.items()
+            if value is not None
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO insights (full_name, metric, value, fetched_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def invalidate(self, repo_full_name: str) -> None:
+        """Drop every stored metric for a repository."""
+        with self._lock:
+            self._conn.execute("DELETE FROM insights WHERE full_name = ?", (repo_full_name,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,147 @@
+"""
+Concurrent dispatch of LLM requests across a pool of API keys.
+
+Each key serves one in-flight request at a time and has its own
+requests-per-minute and tokens-per-minute buckets. A request goes to
+whichever key is free and has budget; callers only wait when every key is
+busy, cooling down after an error, or out of budget.
+"""
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class KeyBudget:
+    """Token buckets and in-flight state for one API key."""
+
+    def __init__(self, rpm: int, tpm: int, now: float):
+        self.requests = float(rpm)
+        self.tokens = float(tpm)
+        self.updated = now
+        self.busy = False
+        self.failures = 0
+        self.cooldown_until = 0.0
+
+
+class KeyDispatcher:
+    """
+    Hands out API keys to concurrent callers.
+
+    ``acquire`` blocks until some key may take a request and returns its
+    index; ``release`` gives it back and, after a failure, rests the key with
+    exponential backoff (or the server's ``Retry-After``) so retries move to
+    the other keys instead of sleeping.
+    """
+
+    def __init__(self, keys: List[str], rpm: int = 15, tpm: int = 1_000_000,
+                 cooldown: float = 2.0, max_cooldown: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            keys: API keys to spread requests over.
+            rpm: Requests per minute allowed per key.
+            tpm: Tokens (prompt plus output) per minute allowed per key.
+            cooldown: Rest after a key's first consecutive failure, doubled per
+                further failure.
+            max_cooldown: Longest rest in seconds.
+            clock: Monotonic clock in seconds (injectable for tests).
+        """
+        if not keys:
+            raise ValueError("KeyDispatcher needs at least one key")
+
+        self.keys = list(keys)
+        self.rpm = rpm
+        self.tpm = tpm
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._clock = clock
+        now = clock()
+        self._budgets = [KeyBudget(rpm, tpm, now) for _ in self.keys]
+        self._cond = threading.Condition()
+
+    def _refill(self, budget: KeyBudget, now: float) -> None:
+        elapsed = max(0.0, now - budget.updated)
+        budget.requests = min(self.rpm, budget.requests + elapsed * self.rpm / 60.0)
+        budget.tokens = min(self.tpm, budget.tokens + elapsed * self.tpm / 60.0)
+        budget.updated = now
+
+    def _wait_time(self, budget: KeyBudget, tokens: int, now: float) -> float:
+        """Seconds until ``budget`` could take a request of ``tokens``; inf while busy."""
+        if budget.busy:
+            return float("inf")
+
+        wait = max(0.0, budget.cooldown_until - now)
+        if budget.requests < 1:
+            wait = max(wait, (1 - budget.requests) * 60.0 / self.rpm)
+        # A request larger than the whole bucket is let through once it is full
+        needed = min(tokens, self.tpm)
+        if budget.tokens < needed:
+            wait = max(wait, (needed - budget.tokens) * 60.0 / self.tpm)
+        return wait
+
+    def wait_time(self, tokens: int = 0) -> float:
+        """Seconds until any key could take a request of ``tokens`` (inf while all are busy)."""
+        with self._cond:
+            now = self._clock()
+            waits = []
+            for budget in self._budgets:
+                self._refill(budget, now)
+                waits.append(self._wait_time(budget, tokens, now))
+            return min(waits)
+
+    def acquire(self, tokens: int = 0) -> int:
+        """
+        Reserve a key for one request of about ``tokens`` tokens.
+
+        Returns:
+            Index of the key in ``keys``. Pass it to ``release`` when done.
+        """
+        with self._cond:
+            while True:
+                now = self._clock()
+                ready = []
+                waits = []
+                for index, budget in enumerate(self._budgets):
+                    self._refill(budget, now)
+                    wait = self._wait_time(budget, tokens, now)
+                    if wait == 0:
+                        ready.append(index)
+                    waits.append(wait)
+
+                if ready:
+                    # Spend from the key with the most headroom first
+                    index = max(ready, key=lambda i: (self._budgets[i].requests, self._budgets[i].tokens))
+                    budget = self._budgets[index]
+                    budget.busy = True
+                    budget.requests -= 1
+                    budget.tokens -= min(tokens, self.tpm)
+                    return index
+
+                # Woken early by release(); otherwise when the first bucket refills
+                timeout = min(waits)
+                self._cond.wait(None if timeout == float("inf") else timeout)
+
+    def release(self, index: int, failed: bool = False, retry_after: Optional[float] = None) -> None:
+        """
+        Return a key acquired with ``acquire``.
+
+        Args:
+            index: Key index returned by ``acquire``.
+            failed: The request failed (error or unusable answer).
+            retry_after: Seconds the server asked this key to wait, if any.
+                Capped at ``max_cooldown`` like the exponential backoff.
+        """
+        with self._cond:
+            budget = self._budgets[index]
+            budget.busy = False
+            if failed or retry_after:
+                budget.failures += 1
+                rest = min(self.max_cooldown, retry_after or self.cooldown * 2 ** (budget.failures - 1))
+                budget.cooldown_until = self._clock() + rest
+                logger.info(f"🔄 Resting API key #{index + 1} for {rest:.0f}s")
+            else:
+                budget.failures = 0
+            self._cond.notify_all()
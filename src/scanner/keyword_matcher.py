@@ -0,0 +1,57 @@
+"""
+Single-pass keyword matching shared by the scanner, classifier and gem analyzer.
+
+All keywords are compiled into one alternation regex, so a text is scanned
+once no matter how many keywords there are. Matches must start a word, where
+``_``, ``-`` and camelCase humps also separate words ("flask_tutorial",
+"foo-demo" and "FooExample" match, "latest" and "contest" don't), but may run
+on ("tests", "testing", "demos" still match). Words glued together in lower
+case ("reactdemo") are not split.
+"""
+import re
+from typing import Iterable, List, Set
+
+
+class KeywordMatcher:
+    """Compiled, case-insensitive matcher for a fixed keyword list."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(k.lower() for k in keywords))
+        # Longest first so a keyword is never shadowed by one of its own prefixes
+        alternation = "|".join(re.escape(k) for k in sorted(self.keywords, key=len, reverse=True))
+        # Not preceded by a letter or digit, or starting a camelCase hump
+        # (the hump check is case-sensitive despite IGNORECASE)
+        start = r"(?:(?<![a-z0-9])|(?-i:(?<=[a-z0-9])(?=[A-Z])))"
+        self._pattern = re.compile(rf"{start}(?:{alternation})", re.IGNORECASE)
+
+    def hits(self, text: str) -> Set[str]:
+        """All keywords found in ``text``, lowercased."""
+        if not text:
+            return set()
+        return {match.group(0).lower() for match in self._pattern.finditer(text)}
+
+    def flags(self, text: str) -> List[bool]:
+        """One flag per keyword, in keyword order."""
+        found = self.hits(text)
+        return [kw in found for kw in self.keywords]
+
+    def search(self, text: str) -> bool:
+        """True if any keyword occurs in ``text``."""
+        return bool(text) and self._pattern.search(text) is not None
+
+
+# Toy-project markers rejected by GitHubScanner.validate_repo_basic
+SCANNER_EXCLUDE_KEYWORDS = KeywordMatcher([
+    "alpha", "test", "demo", "example", "tutorial", "course", "starter", "template"
+])
+
+# Negative signals scored by RepoClassifier.classify_repo
+CLASSIFIER_NEGATIVE_KEYWORDS = KeywordMatcher([
+    "demo", "test", "example", "tutorial", "course", "starter",
+    "template", "boilerplate", "assignment", "homework", "learn", "study"
+])
+
+# Low-quality commit message markers counted by GemAnalyzer._analyze_commits
+COMMIT_NEGATIVE_KEYWORDS = KeywordMatcher([
+    "alpha", "test", "wip", "beta", "experimental", "todo", "fix typo"
+])
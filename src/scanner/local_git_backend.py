@@ -0,0 +1,263 @@
+"""
+Local git backend for GemAnalyzer.
+
+Deep analysis through the API costs dozens of requests per repo. A shallow,
+blob-filtered clone (``git clone --depth 50 --filter=blob:limit=10k``)
+answers the commit, README, project-structure and file-sample questions
+locally, so those parts of the analysis no longer touch the rate limit.
+Issues, pull requests and releases are not in git and still come from the
+API through the regular context.
+"""
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from .analysis_context import RepoAnalysisContext
+except ImportError:
+    from src.scanner.analysis_context import RepoAnalysisContext
+
+logger = logging.getLogger(__name__)
+
+# Field and record separators for ``git log --format``
+FIELD_SEP = "\x1f"
+RECORD_SEP = "\x1e"
+
+
+class LocalEntry:
+    """
+    A tree entry, shaped like the PyGithub ContentFile/GitTreeElement fields the scorers read.
+
+    ``size`` is None for blobs the clone filter left out (larger than the limit).
+    """
+
+    def __init__(self, path: str, type: str, size: Optional[int], sha: str):
+        self.path = path
+        self.name = path.rsplit("/", 1)[-1]
+        self.type = type
+        self.size = size
+        self.sha = sha
+
+
+class LocalAuthor:
+    def __init__(self, name: str, date: datetime):
+        self.name = name
+        self.date = date
+
+
+class LocalGitCommit:
+    def __init__(self, message: str, author: LocalAuthor):
+        self.message = message
+        self.author = author
+
+
+class LocalCommitRef:
+    def __init__(self, sha: str):
+        self.sha = sha
+
+
+class LocalCommit:
+    """A commit, shaped like the PyGithub Commit fields the scorers read."""
+
+    def __init__(self, sha: str, parents: List[str], commit: LocalGitCommit):
+        self.sha = sha
+        self.parents = [LocalCommitRef(p) for p in parents]
+        self.commit = commit
+
+
+def run_git(*args: str, cwd: Optional[Path] = None, timeout: float = 120) -> bytes:
+    """Run a git command and return its raw stdout, raising RuntimeError on failure."""
+    result = subprocess.run(
+        ["git", *args],
+        cwd=str(cwd) if cwd else None,
+        capture_output=True,
+        text=False,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="ignore").strip()
+        raise RuntimeError(f"git {args[0]} failed: {stderr}")
+    return result.stdout
+
+
+class LocalRepoContext(RepoAnalysisContext):
+    """
+    Analysis context that reads commits, README, directory listings and file
+    samples from a local bare clone; everything else falls through to the API.
+    """
+
+    def __init__(self, repo, path: Path, **kwargs):
+        super().__init__(repo, **kwargs)
+        self.path = Path(path)
+
+    def _git(self, *args: str) -> str:
+        return run_git(*args, cwd=self.path).decode("utf-8", errors="ignore")
+
+    def commits(self) -> List[LocalCommit]:
+        return self._memo("commits", self._read_commits)
+
+    def _read_commits(self) -> List[LocalCommit]:
+        output = self._git("log", "-n", "50", f"--format=%H{FIELD_SEP}%P{FIELD_SEP}%an{FIELD_SEP}%aI{FIELD_SEP}%B{RECORD_SEP}")
+        commits = []
+        for record in output.split(RECORD_SEP):
+            record = record.strip("\n")
+            if not record:
+                continue
+            sha, parents, author, date, message = record.split(FIELD_SEP, 4)
+            commits.append(LocalCommit(
+                sha, parents.split(),
+                LocalGitCommit(message.strip(), LocalAuthor(author, datetime.fromisoformat(date)))
+            ))
+        return commits
+
+    def contents(self, path: str = "") -> List[LocalEntry]:
+        """Directory listing at ``path``. Raises FileNotFoundError for missing directories."""
+        return self._memo(("contents", path), lambda: self._list_tree(path))
+
+    def _list_tree(self, path: str) -> List[LocalEntry]:
+        treeish = f"HEAD:{path.strip('/')}" if path.strip("/") else "HEAD"
+        try:
+            output = self._git("ls-tree", treeish)
+        except RuntimeError:
+            raise FileNotFoundError(f"{path} not found in {self.full_name}")
+
+        prefix = f"{path.strip('/')}/" if path.strip("/") else ""
+        return [self._parse_tree_line(line, prefix) for line in output.splitlines() if line]
+
+    def _object_sizes(self) -> Dict[str, int]:
+        """
+        Sizes of the objects present in the clone.
+
+        ``ls-tree -l`` would lazily fetch every blob the clone filter left out
+        just to report its size, so sizes come from the local object store only.
+        """
+        def read():
+            output = self._git("cat-file", "--batch-check=%(objectname) %(objectsize)", "--batch-all-objects")
+            return {sha: int(size) for sha, size in (line.split() for line in output.splitlines() if line)}
+
+        return self._memo("object_sizes", read)
+
+    def _parse_tree_line(self, line: str, prefix: str = "") -> LocalEntry:
+        # "<mode> <type> <sha>\t<path>"
+        meta, name = line.split("\t", 1)
+        _, kind, sha = meta.split()
+        return LocalEntry(
+            f"{prefix}{name}",
+            "dir" if kind == "tree" else "file",
+            self._object_sizes().get(sha) if kind == "blob" else 0,
+            sha,
+        )
+
+    def readme(self) -> bytes:
+        return self._memo("readme", self._read_readme)
+
+    def _read_readme(self) -> bytes:
+        for entry in self.contents(""):
+            if entry.type == "file" and entry.name.lower().startswith("readme"):
+                return run_git("cat-file", "blob", entry.sha, cwd=self.path)
+        raise FileNotFoundError(f"No README in {self.full_name}")
+
+    def recent_blobs(self, max_commits: int = 10) -> List[LocalEntry]:
+        changed = self._git("log", "-n", str(max_commits), "--name-only", "--format=")
+        listing = self._git("ls-tree", "-r", "HEAD").splitlines()
+        tree = {entry.path: entry for entry in (self._parse_tree_line(line) for line in listing if line)}
+        return [tree[path] for path in dict.fromkeys(changed.split("\n")) if path in tree]
+
+    def read_blob(self, sha: str) -> Optional[str]:
+        try:
+            return run_git("cat-file", "blob", sha, cwd=self.path).decode("utf-8")
+        except Exception:
+            return None
+
+
+class LocalGitBackend:
+    """
+    Bounded on-disk cache of shallow clones, evicted least recently used first.
+
+    ``context_for(repo)`` returns a LocalRepoContext for a PyGithub repository,
+    cloning it on first use.
+    """
+
+    def __init__(self, cache_dir: str = ".cache/clones", max_repos: int = 20, depth: int = 50,
+                 blob_limit: str = "10k", max_age: float = 24 * 3600,
+                 url_template: str = "https://github.com/{full_name}.git", timeout: float = 120):
+        """
+        Args:
+            cache_dir: Directory holding the clones.
+            max_repos: Clones kept on disk; the least recently used are removed.
+                Keep it above the number of repos analyzed in parallel.
+            depth: Commits fetched per clone.
+            blob_limit: Blobs larger than this are left out of the clone.
+            max_age: Seconds before a cached clone is fetched again.
+            url_template: Clone URL, formatted with ``full_name``.
+            timeout: Seconds allowed for one git command.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_repos = max_repos
+        self.depth = depth
+        self.blob_limit = blob_limit
+        self.max_age = max_age
+        self.url_template = url_template
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._repo_locks: Dict[str, threading.Lock] = {}
+
+    def path_for(self, full_name: str) -> Path:
+        return self.cache_dir / full_name.replace("/", "__")
+
+    def context_for(self, repo) -> LocalRepoContext:
+        return LocalRepoContext(repo, self.checkout(repo.full_name))
+
+    def checkout(self, full_name: str) -> Path:
+        """Return a fresh local clone of ``full_name``, cloning it if needed."""
+        with self._lock:
+            repo_lock = self._repo_locks.setdefault(full_name, threading.Lock())
+
+        with repo_lock:
+            path = self.path_for(full_name)
+            # HEAD is written at clone time and left alone afterwards, so it dates the clone
+            if path.exists() and time.time() - (path / "HEAD").stat().st_mtime > self.max_age:
+                shutil.rmtree(path, ignore_errors=True)
+
+            if not path.exists():
+                self._clone(full_name, path)
+
+            # The directory mtime doubles as the LRU timestamp
+            os.utime(path)
+
+        self._evict()
+        return path
+
+    def _clone(self, full_name: str, path: Path) -> None:
+        logger.info(f"📥 Shallow-cloning {full_name}")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+        run_git(
+            "clone", "--quiet", "--bare",
+            "--depth", str(self.depth),
+            f"--filter=blob:limit={self.blob_limit}",
+            self.url_template.format(full_name=full_name),
+            str(tmp_path),
+            timeout=self.timeout,
+        )
+        # Rename into place so a half-finished clone is never picked up
+        os.replace(tmp_path, path)
+
+    def _evict(self) -> None:
+        with self._lock:
+            clones = [p for p in self.cache_dir.iterdir() if p.is_dir() and not p.name.endswith(".tmp")]
+            if len(clones) <= self.max_repos:
+                return
+
+            clones.sort(key=lambda p: p.stat().st_mtime)
+            for stale in clones[:len(clones) - self.max_repos]:
+                logger.info(f"🧹 Evicting cached clone {stale.name}")
+                shutil.rmtree(stale, ignore_errors=True)
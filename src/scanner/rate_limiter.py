@@ -0,0 +1,179 @@
+"""
+Rate-limit-aware request scheduling for the GitHub API.
+
+Tracks the budget GitHub reports in ``X-RateLimit-*`` headers per token and
+per rate-limit resource (core, search, graphql), paces requests when the
+budget runs low, and parks them until the reset time or ``Retry-After``
+instead of letting them fail.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# GitHub asks clients to wait at least a minute after a secondary rate limit
+# that comes without a Retry-After header.
+SECONDARY_LIMIT_WAIT = 60.0
+
+
+class TokenBudget:
+    """Last known rate-limit state for one token and resource."""
+
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        self.parked_until: float = 0.0
+        # Requests reserved by acquire() whose response hasn't been recorded yet
+        self.in_flight = 0
+
+
+class RateLimitScheduler:
+    """
+    Shared scheduler consulted before and after every GitHub request.
+
+    ``acquire`` blocks until the token may send another request; ``record``
+    updates the budget from the response and reports whether the request was
+    rate limited and should be retried.
+    """
+
+    def __init__(self, pace_below: float = 0.1, max_wait: float = 3600.0,
+                 sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            pace_below: Fraction of the limit under which requests are spread
+                evenly over the time left until reset.
+            max_wait: Longest single wait in seconds. Longer waits are capped and
+                the request goes out anyway.
+            sleep: Sleep function (injectable for tests).
+            clock: Clock returning epoch seconds (injectable for tests).
+        """
+        self.pace_below = pace_below
+        self.max_wait = max_wait
+        self._sleep = sleep
+        self._clock = clock
+        self._budgets: Dict[Tuple[str, str], TokenBudget] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def resource_for(url: str) -> str:
+        """The rate-limit resource GitHub bills a URL against."""
+        path = urlparse(url).path
+        if path.startswith("/search/"):
+            return "search"
+        if path.startswith("/graphql"):
+            return "graphql"
+        return "core"
+
+    def _budget(self, token: Optional[str], resource: str) -> TokenBudget:
+        key = (token or "anonymous", resource)
+        if key not in self._budgets:
+            self._budgets[key] = TokenBudget()
+        return self._budgets[key]
+
+    def wait_time(self, token: Optional[str], resource: str = "core") -> float:
+        """Seconds to wait before the token may send its next request."""
+        with self._lock:
+            return self._wait_time(self._budget(token, resource))
+
+    def _wait_time(self, budget: TokenBudget) -> float:
+        now = self._clock()
+        if budget.parked_until > now:
+            return budget.parked_until - now
+        if budget.remaining is None:
+            return 0.0
+
+        until_reset = max(budget.reset_at - now, 0.0)
+        if budget.remaining <= 0:
+            return until_reset
+        if budget.limit and budget.remaining < budget.limit * self.pace_below:
+            # Spread the last few requests over the rest of the window
+            return until_reset / budget.remaining
+        return 0.0
+
+    def acquire(self, token: Optional[str], url: str) -> None:
+        """Block until a request to ``url`` with ``token`` fits in the budget."""
+        resource = self.resource_for(url)
+        with self._lock:
+            budget = self._budget(token, resource)
+            wait = self._wait_time(budget)
+            # Reserve one request so concurrent callers don't all spend the last unit
+            budget.in_flight += 1
+            if budget.remaining is not None:
+                budget.remaining -= 1
+
+        if wait > 0:
+            if wait > self.max_wait:
+                logger.warning(f"⏳ Rate limit wait of {wait:.0f}s capped at {self.max_wait:.0f}s ({resource})")
+                wait = self.max_wait
+            logger.info(f"⏳ Waiting {wait:.1f}s for GitHub {resource} rate limit")
+            self._sleep(wait)
+
+    def cancel(self, token: Optional[str], url: str) -> None:
+        """Give back the reservation of a request that got no response."""
+        with self._lock:
+            budget = self._budget(token, self.resource_for(url))
+            if budget.in_flight > 0:
+                budget.in_flight -= 1
+                if budget.remaining is not None:
+                    budget.remaining += 1
+
+    def record(self, token: Optional[str], url: str, response) -> bool:
+        """
+        Update the budget from a response.
+
+        Returns:
+            True if the request was rate limited and should be retried.
+        """
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource") or self.resource_for(url)
+
+        with self._lock:
+            budget = self._budget(token, resource)
+            now = self._clock()
+            budget.in_flight = max(budget.in_flight - 1, 0)
+
+            if headers.get("X-RateLimit-Remaining") is not None:
+                # The server's count is authoritative (a 304 from the ETag cache
+                # costs nothing); only requests still in flight come off it
+                budget.remaining = int(headers["X-RateLimit-Remaining"]) - budget.in_flight
+                budget.reset_at = float(headers.get("X-RateLimit-Reset", budget.reset_at))
+                if headers.get("X-RateLimit-Limit") is not None:
+                    budget.limit = int(headers["X-RateLimit-Limit"])
+
+            if not self._is_rate_limited(response):
+                return False
+
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                budget.parked_until = now + float(retry_after)
+            elif budget.remaining == 0 and budget.reset_at > now:
+                budget.parked_until = budget.reset_at
+            else:
+                budget.parked_until = now + SECONDARY_LIMIT_WAIT
+
+            logger.warning(
+                f"🚦 GitHub {resource} rate limit hit, parking until "
+                f"{time.strftime('%H:%M:%S', time.localtime(budget.parked_until))}"
+            )
+            return True
+
+    @staticmethod
+    def _is_rate_limited(response) -> bool:
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        headers = response.headers
+        if headers.get("Retry-After") is not None or headers.get("X-RateLimit-Remaining") == "0":
+            return True
+        return "rate limit" in (response.text or "").lower()
+
+    def remaining(self, token: Optional[str], resource: str = "core") -> Optional[int]:
+        """Last known remaining requests for the token, or None if unknown."""
+        with self._lock:
+            return self._budget(token, resource).remaining
@@ -1,5 +1,34 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+try:
+    from .keyword_matcher import CLASSIFIER_NEGATIVE_KEYWORDS
+except ImportError:
+    from src.scanner.keyword_matcher import CLASSIFIER_NEGATIVE_KEYWORDS
+
+# NumPy is only needed for batch scoring
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Reasons that can appear after the negative-keyword reasons, in the order
+# classify_repo emits them. Bit i + len(negative_keywords) of a reason mask
+# stands for BATCH_REASONS[i].
+BATCH_REASONS = [
+    "Detailed description",
+    "Short description",
+    "Has topics",
+    "Has license",
+    "High stars (>100)",
+    "Multiple contributors",
+    "Single contributor",
+    "Commit activity unknown",
+    "High commit activity",
+    "No recent activity",
+    "Archived",
+]
 
 class RepoClassifier:
     """
@@ -8,10 +37,9 @@ class RepoClassifier:
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.negative_keywords = [
-            "demo", "test", "example", "tutorial", "course", "starter",
-            "template", "boilerplate", "assignment", "homework", "learn", "study"
-        ]
+        # Compiled once at import time; see keyword_matcher
+        self.keyword_matcher = CLASSIFIER_NEGATIVE_KEYWORDS
+        self.negative_keywords = self.keyword_matcher.keywords
         self.positive_files = [
             "package.json", "requirements.txt", "setup.py", "Cargo.toml",
             "go.mod", "pom.xml", "build.gradle", "Dockerfile", "Makefile"
@@ -33,12 +61,10 @@ class RepoClassifier:
 
         # 1. Metadata Checks
         desc = (repo_data.get("description") or "").lower()
-        name = (repo_data.get("name") or "").lower()
-        full_text = f"{name} {desc}"
 
-        # Negative keywords
-        for kw in self.negative_keywords:
-            if kw in full_text:
+        # Negative keywords (same flags classify_batch uses)
+        for kw, found in zip(self.negative_keywords, self._keyword_flags(repo_data)):
+            if found:
                 score -= 20
                 reasons.append(f"Contains negative keyword: {kw}")
 
@@ -77,7 +103,10 @@ class RepoClassifier:
             reasons.append("Single contributor")
 
         commit_activity = insights.get("commit_frequency_score", 0)
-        if commit_activity > 5.0:
+        if commit_activity is None:
+            # Stats still being computed by GitHub: unknown, not inactive
+            reasons.append("Commit activity unknown")
+        elif commit_activity > 5.0:
             score += 10
             reasons.append("High commit activity")
         elif commit_activity == 0:
@@ -105,3 +134,131 @@ class RepoClassifier:
             "is_real_project": is_real,
             "reasons": reasons
         }
+
+    def _keyword_flags(self, repo_data: Dict[str, Any]) -> List[bool]:
+        """Which negative keywords occur in the repo name/description, in keyword order."""
+        desc = (repo_data.get("description") or "").lower()
+        name = (repo_data.get("name") or "").lower()
+        return self.keyword_matcher.flags(f"{name} {desc}")
+
+    def batch_columns(self, repos: List[Dict[str, Any]], insights: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build the columnar input for ``classify_batch`` from repo/insights dicts.
+
+        A missing or None commit activity becomes NaN (unknown).
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for batch scoring. Install with: pip install numpy")
+
+        activity = [i.get("commit_frequency_score", 0) for i in insights]
+        return {
+            "stars": np.array([r.get("stargazers_count", 0) for r in repos], dtype=np.int64),
+            "contributors": np.array([i.get("contributors_count", 0) for i in insights], dtype=np.int64),
+            "commit_activity": np.array([np.nan if a is None else a for a in activity], dtype=np.float64),
+            "health": np.array([i.get("health_percentage", 0) for i in insights], dtype=np.float64),
+            "description_length": np.array(
+                [len((r.get("description") or "").lower()) for r in repos], dtype=np.int64
+            ),
+            "has_topics": np.array([bool(r.get("topics")) for r in repos], dtype=bool),
+            "has_license": np.array([bool(r.get("license")) for r in repos], dtype=bool),
+            "archived": np.array([bool(r.get("archived")) for r in repos], dtype=bool),
+            "keyword_flags": np.array(
+                [self._keyword_flags(r) for r in repos], dtype=bool
+            ).reshape(len(repos), len(self.negative_keywords)),
+        }
+
+    def classify_batch(self, columns: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Vectorized ``classify_repo`` over columnar data.
+
+        Args:
+            columns: Equal-length arrays ``stars``, ``contributors``,
+                ``commit_activity`` (NaN for unknown), ``health``,
+                ``description_length``, ``has_topics``, ``has_license``,
+                ``archived`` and an ``(n, len(negative_keywords))`` boolean
+                ``keyword_flags`` matrix. See ``batch_columns``.
+
+        Returns:
+            Dict of arrays: ``score`` (int), ``is_real_project`` (bool) and
+            ``reason_mask`` (int bitmask, decode with ``reasons_from_mask``).
+            Results match ``classify_repo`` exactly.
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for batch scoring. Install with: pip install numpy")
+
+        stars = np.asarray(columns["stars"])
+        contributors = np.asarray(columns["contributors"])
+        activity = np.asarray(columns["commit_activity"], dtype=np.float64)
+        health = np.asarray(columns["health"])
+        desc_len = np.asarray(columns["description_length"])
+        keyword_flags = np.asarray(columns["keyword_flags"], dtype=bool)
+        n = len(stars)
+        keyword_flags = keyword_flags.reshape(n, len(self.negative_keywords))
+
+        known = ~np.isnan(activity)
+        conditions = [
+            desc_len > 100,
+            desc_len < 20,
+            np.asarray(columns["has_topics"], dtype=bool),
+            np.asarray(columns["has_license"], dtype=bool),
+            stars > 100,
+            contributors > 1,
+            contributors <= 1,
+            ~known,
+            known & (np.nan_to_num(activity) > 5.0),
+            known & (np.nan_to_num(activity, nan=1.0) == 0),
+            np.asarray(columns["archived"], dtype=bool),
+        ]
+        detailed, short, topics, license_, high_stars, multi, single, unknown, high_activity, inactive, archived = conditions
+
+        score = np.full(n, 50, dtype=np.int64)
+        score -= 20 * keyword_flags.sum(axis=1)
+        score += 10 * detailed - 10 * short
+        score += 10 * topics + 10 * license_
+        score += 20 * high_stars + 5 * (~high_stars & (stars > 10))
+        score += 10 * multi - 5 * single
+        score += 10 * high_activity - 10 * inactive
+        score += 5 * (health > 50)
+        score = np.where(archived, 0, score)
+        score = np.clip(score, 0, 100)
+
+        reason_mask = np.zeros(n, dtype=np.int64)
+        for bit in range(len(self.negative_keywords)):
+            reason_mask |= keyword_flags[:, bit].astype(np.int64) << bit
+        offset = len(self.negative_keywords)
+        for i, condition in enumerate(conditions):
+            reason_mask |= condition.astype(np.int64) << (offset + i)
+
+        return {
+            "score": score,
+            "is_real_project": score >= 60,
+            "reason_mask": reason_mask,
+        }
+
+    def reasons_from_mask(self, mask: int) -> List[str]:
+        """Decode a ``classify_batch`` reason bitmask into ``classify_repo`` reasons."""
+        mask = int(mask)
+        labels = [f"Contains negative keyword: {kw}" for kw in self.negative_keywords] + BATCH_REASONS
+        return [label for bit, label in enumerate(labels) if mask & (1 << bit)]
+
+    def classify_many(self, repos: List[Dict[str, Any]],
+                      insights: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Classify many repos at once; same output as calling ``classify_repo`` on each.
+
+        Uses ``classify_batch`` when NumPy is installed and falls back to the
+        scalar path otherwise.
+        """
+        insights = insights if insights is not None else [r.get("insights") or {} for r in repos]
+        if not NUMPY_AVAILABLE:
+            return [self.classify_repo(r, i) for r, i in zip(repos, insights)]
+
+        batch = self.classify_batch(self.batch_columns(repos, insights))
+        return [
+            {
+                "score": int(score),
+                "is_real_project": bool(is_real),
+                "reasons": self.reasons_from_mask(mask),
+            }
+            for score, is_real, mask in zip(batch["score"], batch["is_real_project"], batch["reason_mask"])
+        ]
@@ -0,0 +1,105 @@
+"""
+Rescoring engine for stored GemAnalyzer results.
+
+Recomputes total score, recommendation and priority for every analysis in
+an AnalysisStore from its raw sub-scores, and reports which repos change
+category under the new ScoringConfig.
+"""
+import logging
+from collections import Counter
+from typing import Dict, List, Tuple
+
+try:
+    from .analysis_store import AnalysisStore
+    from .gem_analyzer import ScoringConfig
+except ImportError:
+    from src.scanner.analysis_store import AnalysisStore
+    from src.scanner.gem_analyzer import ScoringConfig
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ["APPROVE", "REVIEW", "REJECT"]
+
+
+class RescoredRepo:
+    """Old and new verdict for one repo."""
+
+    def __init__(self, repo: str, old_score: float, new_score: float,
+                 old_recommendation: str, new_recommendation: str, new_priority: str):
+        self.repo = repo
+        self.old_score = old_score
+        self.new_score = new_score
+        self.old_recommendation = old_recommendation
+        self.new_recommendation = new_recommendation
+        self.new_priority = new_priority
+
+    @property
+    def flipped(self) -> bool:
+        return self.old_recommendation != self.new_recommendation
+
+
+def rescore(store: AnalysisStore, config: ScoringConfig, apply: bool = False) -> List[RescoredRepo]:
+    """
+    Rescore every stored analysis with ``config``.
+
+    Args:
+        store: Analyses to rescore.
+        config: New weights and thresholds.
+        apply: Write the new verdicts back to the store.
+
+    Returns:
+        One entry per stored repo, ordered by repo name.
+    """
+    results = []
+    for analysis in store.all():
+        total_score, recommendation, priority = config.evaluate(analysis.scores)
+        results.append(RescoredRepo(
+            analysis.repo, analysis.total_score, round(total_score, 2),
+            analysis.recommendation, recommendation, priority,
+        ))
+
+    if apply:
+        for result in results:
+            store.update_verdict(result.repo, result.new_score, result.new_recommendation, result.new_priority)
+        logger.info(f"💾 Applied new verdicts to {len(results)} stored analyses")
+
+    return results
+
+
+def summarize(results: List[RescoredRepo]) -> Dict[str, Dict]:
+    """Category counts before and after, and the number of repos per (old, new) flip."""
+    return {
+        "before": dict(Counter(r.old_recommendation for r in results)),
+        "after": dict(Counter(r.new_recommendation for r in results)),
+        "flips": dict(Counter((r.old_recommendation, r.new_recommendation) for r in results if r.flipped)),
+    }
+
+
+def format_diff(results: List[RescoredRepo]) -> str:
+    """Human-readable report of the repos that change category."""
+    summary = summarize(results)
+    lines = [f"Rescored {len(results)} repos"]
+
+    for category in CATEGORIES:
+        before = summary["before"].get(category, 0)
+        after = summary["after"].get(category, 0)
+        lines.append(f"  {category:<8} {before:>6} -> {after:<6} ({after - before:+d})")
+
+    flipped = sorted((r for r in results if r.flipped), key=_flip_order)
+    if not flipped:
+        lines.append("No repos change category.")
+        return "\n".join(lines)
+
+    lines.append(f"{len(flipped)} repos change category:")
+    for r in flipped:
+        lines.append(
+            f"  {r.old_recommendation:>7} -> {r.new_recommendation:<7} "
+            f"{r.repo} ({r.old_score:.2f} -> {r.new_score:.2f})"
+        )
+    return "\n".join(lines)
+
+
+def _flip_order(result: RescoredRepo) -> Tuple[int, int, str]:
+    return (CATEGORIES.index(result.old_recommendation) if result.old_recommendation in CATEGORIES else len(CATEGORIES),
+            CATEGORIES.index(result.new_recommendation),
+            result.repo)
@@ -0,0 +1,170 @@
+"""
+On-disk conditional-request cache for GitHub API responses.
+
+Stores the body of each successful GET together with its ETag and
+Last-Modified validators, so repeat scans can send If-None-Match /
+If-Modified-Since and serve 304 Not Modified answers from disk. GitHub does
+not count 304s against the primary rate limit.
+
+Entries unused for ``max_age_days`` are dropped, and the oldest go first once
+there are more than ``max_entries``, so a long-running daemon's cache stays
+bounded. Eviction runs while writing, every ``prune_every`` stores.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# Response headers worth replaying on a cache hit (pagination and rate data).
+_KEPT_HEADERS = ("Content-Type", "Link", "ETag", "Last-Modified")
+
+
+class ResponseCache:
+    """Persistent response cache keyed by URL and token scope."""
+
+    def __init__(self, cache_dir: str = ".cache/github", max_age_days: float = 30.0,
+                 max_entries: int = 50_000, prune_every: int = 500):
+        """
+        Args:
+            cache_dir: Directory holding the entries.
+            max_age_days: Entries not written or read for this long are evicted.
+            max_entries: Most entries kept; the least recently used go first.
+            prune_every: Stores between two eviction passes (the first store
+                always runs one).
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age_days * 86400
+        self.max_entries = max_entries
+        self.prune_every = max(1, prune_every)
+        self._stores = 0
+        self._prune_lock = threading.Lock()
+
+    @staticmethod
+    def token_scope(token: Optional[str]) -> str:
+        """Short, non-reversible identifier for the token a response was fetched with."""
+        if not token:
+            return "anonymous"
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+    def _path(self, url: str, token: Optional[str]) -> Path:
+        key = hashlib.sha256(f"{self.token_scope(token)} {url}".encode("utf-8")).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, url: str, token: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for this URL and token, if any."""
+        path = self._path(url, token)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            # Entries still being revalidated stay clear of eviction
+            os.utime(path)
+            return entry
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path.name}: {e}")
+            return None
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Validators to send with a request for a cached URL."""
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, token: Optional[str], response) -> None:
+        """Persist a 200 response that carries at least one validator."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+
+        entry = {
+            "url": url,
+            "status_code": response.status_code,
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {h: response.headers[h] for h in _KEPT_HEADERS if h in response.headers},
+            "body": response.content.decode("utf-8", errors="replace"),
+        }
+
+        path = self._path(url, token)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry for {url}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        with self._prune_lock:
+            due = self._stores % self.prune_every == 0
+            self._stores += 1
+        if due:
+            self.prune()
+
+    def prune(self) -> int:
+        """
+        Evict expired entries, then the least recently used ones above ``max_entries``.
+
+        Returns:
+            Number of entries removed.
+        """
+        if not self._prune_lock.acquire(blocking=False):
+            return 0  # Another thread is already pruning
+        try:
+            entries = []
+            for path in self.cache_dir.glob("*/*.json"):
+                try:
+                    entries.append((path.stat().st_mtime, path))
+                except OSError:
+                    continue
+
+            cutoff = time.time() - self.max_age
+            entries.sort()
+            expired = [path for mtime, path in entries if mtime < cutoff]
+            kept = len(entries) - len(expired)
+            overflow = [path for _, path in entries[len(expired):len(expired) + max(0, kept - self.max_entries)]]
+
+            removed = 0
+            for path in expired + overflow:
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+            if removed:
+                logger.info(f"🧹 Evicted {removed} GitHub response cache entries")
+            return removed
+        finally:
+            self._prune_lock.release()
+
+    def to_response(self, entry: Dict[str, Any]) -> requests.Response:
+        """Rebuild a 200 response from a cache entry."""
+        response = requests.Response()
+        response.status_code = entry.get("status_code", 200)
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response.headers["X-From-Cache"] = "1"
+        response.encoding = "utf-8"
+        response._content = entry["body"].encode("utf-8")
+        return response
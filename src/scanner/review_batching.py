@@ -0,0 +1,101 @@
+"""
+Batched AI reviews: several repositories per prompt.
+
+The reviewers' instructions are long and identical for every repo, so
+sending them once for a handful of repos saves prompt tokens and requests.
+The model answers with a JSON array; each entry is checked against the
+review schema, and repos whose entry is missing or malformed are reviewed
+again on their own.
+"""
+import json
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Fields every review entry must carry (the single-repo response schema)
+REVIEW_SCORE_FIELDS = ['architecture_score', 'documentation_score', 'testing_score',
+                       'practices_score', 'innovation_score']
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[List[T]]:
+    for start in range(0, len(items), max(1, size)):
+        yield list(items[start:start + max(1, size)])
+
+
+def _is_score(value: Any) -> bool:
+    """Whether ``value`` is a score ``_parse_ai_response`` can turn into an int."""
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    if isinstance(value, str):
+        try:
+            int(value.strip())
+            return True
+        except ValueError:
+            return False
+    return False
+
+
+def parse_batch_entries(response_text: str, count: int) -> List[Optional[Dict[str, Any]]]:
+    """
+    Split a batched answer into one raw entry per repository.
+
+    Entries are matched to repositories by their 1-based ``index`` field, or
+    by position when the model left it out.
+
+    Returns:
+        ``count`` entries in repository order; None where the answer had no
+        usable entry (missing, duplicate, or lacking a numeric score field).
+    """
+    text = response_text.strip()
+    start = text.find('[')
+    end = text.rfind(']')
+    try:
+        data = json.loads(text[start:end + 1]) if start != -1 and end > start else None
+    except json.JSONDecodeError as e:
+        logger.warning(f"Failed to parse batched review response: {e}")
+        data = None
+    if not isinstance(data, list):
+        return [None] * count
+
+    entries: List[Optional[Dict[str, Any]]] = [None] * count
+    for position, entry in enumerate(data):
+        if not isinstance(entry, dict):
+            continue
+        index = entry.get('index', position + 1)
+        if not isinstance(index, int) or not 1 <= index <= count or entries[index - 1] is not None:
+            continue
+        if all(_is_score(entry.get(field)) for field in REVIEW_SCORE_FIELDS):
+            entries[index - 1] = entry
+
+    missing = sum(1 for entry in entries if entry is None)
+    if missing:
+        logger.warning(f"⚠️ Batched review left {missing}/{count} repos without a valid entry")
+    return entries
+
+
+def review_in_batches(items: Sequence[T], batch_size: int,
+                      review_batch: Callable[[List[T]], List[Optional[Dict]]],
+                      review_single: Callable[[T], Optional[Dict]]) -> List[Optional[Dict]]:
+    """
+    Review ``items`` ``batch_size`` at a time, falling back to single reviews.
+
+    Args:
+        items: Whatever the reviewer needs per repository.
+        batch_size: Repositories per prompt.
+        review_batch: Reviews one batch; returns a result or None per item.
+        review_single: Reviews one item with the single-repo prompt.
+
+    Returns:
+        One result per item, in order.
+    """
+    results: List[Optional[Dict]] = []
+    for batch in chunked(items, batch_size):
+        entries = review_batch(batch) if len(batch) > 1 else [None]
+        for item, entry in zip(batch, entries):
+            results.append(entry if entry is not None else review_single(item))
+    return results
@@ -0,0 +1,248 @@
+"""
+Persistent cache of AI code reviews.
+
+A review only depends on the code it looked at, the model that wrote it and
+the prompt it was asked, so it is keyed by (repo, HEAD commit SHA, model,
+prompt-template hash). Re-reviewing a repo that hasn't changed is served from
+disk; a new commit, a model switch or a prompt edit all miss and re-review.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _TemplateFields(dict):
+    """Context stand-in that renders every ``context[key]`` as ``{key}``."""
+
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+def prompt_template_hash(build_prompt: Callable[[Dict], str], **context_params: Any) -> str:
+    """
+    Hash of a reviewer's prompt template and of how its context is built.
+
+    ``build_prompt`` is rendered with placeholders instead of repository data,
+    so the hash changes when the prompt wording changes but not per repo.
+
+    Args:
+        build_prompt: Renders the prompt from a context dict.
+        context_params: Settings that change what goes into the placeholders
+            (token budgets, ``CONTEXT_BUILDER_VERSION``); part of the hash.
+    """
+    template = build_prompt(_TemplateFields())
+    params = json.dumps(context_params, sort_keys=True, default=str)
+    return hashlib.sha256(f"{template}\n{params}".encode("utf-8")).hexdigest()[:16]
+
+
+class ReviewCache:
+    """
+    SQLite store of AI reviews shared by every reviewer.
+
+    Safe to share between threads; all access goes through one connection
+    guarded by a lock.
+    """
+
+    def __init__(self, db_path: str = ".cache/ai_reviews.sqlite",
+                 resolve_head: Optional[Callable[[str], Optional[str]]] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            db_path: SQLite database file. Use ``":memory:"`` for a throwaway cache.
+            resolve_head: Returns the HEAD commit SHA of a repo (for example
+                ``GitHubScanner.get_latest_commit``). Used when a reviewer is not
+                told the SHA; without either, the review bypasses the cache.
+            clock: Clock returning epoch seconds (injectable for tests).
+        """
+        self.resolve_head = resolve_head
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reviews (
+                repo TEXT NOT NULL,
+                head_sha TEXT NOT NULL,
+                model TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                review TEXT NOT NULL,
+                reviewed_at REAL NOT NULL,
+                PRIMARY KEY (repo, head_sha, model, prompt_hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, repo: str, head_sha: str, model: str, prompt_hash: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT review FROM reviews WHERE repo = ? AND head_sha = ? AND model = ? AND prompt_hash = ?",
+                (repo, head_sha, model, prompt_hash),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, repo: str, head_sha: str, model: str, prompt_hash: str, review: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reviews (repo, head_sha, model, prompt_hash, review, reviewed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (repo, head_sha, model, prompt_hash, json.dumps(review), self._clock()),
+            )
+            self._conn.commit()
+
+    def get_or_review(self, repo: str, head_sha: Optional[str], model: str, prompt_hash: str,
+                      review: Callable[[], Optional[Dict[str, Any]]],
+                      is_valid: Callable[[Dict[str, Any]], bool] = lambda result: True) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached review for this key, or run ``review`` and cache its result.
+
+        Args:
+            repo: Repository ``full_name``.
+            head_sha: HEAD commit the review covers; resolved with ``resolve_head`` if None.
+            model: Model name the reviewer calls.
+            prompt_hash: ``prompt_template_hash`` of the reviewer's prompt.
+            review: Runs the actual LLM review.
+            is_valid: Results it rejects (fallback scores after a failed call)
+                are returned but not cached.
+        """
+        head_sha = self._resolve(repo, head_sha)
+        if not head_sha:
+            # Without a commit to pin the review to, a cached one could be stale
+            return review()
+
+        cached = self._cached(repo, head_sha, model, prompt_hash)
+        if cached is not None:
+            return cached
+
+        result = review()
+        if result is not None and is_valid(result):
+            self.put(repo, head_sha, model, prompt_hash, result)
+        return result
+
+    async def aget_or_review(self, repo: str, head_sha: Optional[str], model: str, prompt_hash: str,
+                             review: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+                             is_valid: Callable[[Dict[str, Any]], bool] = lambda result: True) -> Optional[Dict[str, Any]]:
+        """Coroutine version of ``get_or_review`` for an async ``review``."""
+        if head_sha is None:
+            head_sha = await asyncio.to_thread(self._resolve, repo, head_sha)
+        if not head_sha:
+            return await review()
+
+        cached = self._cached(repo, head_sha, model, prompt_hash)
+        if cached is not None:
+            return cached
+
+        result = await review()
+        if result is not None and is_valid(result):
+            self.put(repo, head_sha, model, prompt_hash, result)
+        return result
+
+    def get_or_review_many(self, repos: List[str], head_shas: Optional[List[Optional[str]]], model: str,
+                           prompt_hash: str, review: Callable[[List[int]], List[Optional[Dict[str, Any]]]],
+                           is_valid: Callable[[Dict[str, Any]], bool] = lambda result: True) -> List[Optional[Dict[str, Any]]]:
+        """
+        Batch version of ``get_or_review``.
+
+        Args:
+            repos: Repository ``full_name`` per item.
+            head_shas: HEAD commit per item (None entries are resolved).
+            review: Reviews the items at the given indexes (the cache misses)
+                and returns their results in that order.
+
+        Returns:
+            One result per repo, in order.
+        """
+        head_shas = head_shas or [None] * len(repos)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(repos)
+        misses = []
+        for index, (repo, head_sha) in enumerate(zip(repos, head_shas)):
+            head_sha = self._resolve(repo, head_sha)
+            cached = self._cached(repo, head_sha, model, prompt_hash) if head_sha else None
+            if cached is None:
+                misses.append((index, head_sha))
+            results[index] = cached
+
+        if misses:
+            reviewed = review([index for index, _ in misses])
+            for (index, head_sha), result in zip(misses, reviewed):
+                results[index] = result
+                if head_sha and result is not None and is_valid(result):
+                    self.put(repos[index], head_sha, model, prompt_hash, result)
+        return results
+
+    def get_or_review_batched(self, repos: List[str], head_shas: Optional[List[Optional[str]]], model: str,
+                              batch_prompt_hash: str, prompt_hash: str,
+                              review_batch: Callable[[List[int]], List[Optional[Dict[str, Any]]]],
+                              review_single: Callable[[int], Optional[Dict[str, Any]]],
+                              is_valid: Callable[[Dict[str, Any]], bool] = lambda result: True) -> List[Optional[Dict[str, Any]]]:
+        """
+        Batched reviews with a single-prompt fallback, each cached under its own prompt's key.
+
+        Repos with a cached single-prompt review are served from it. The rest
+        go through ``get_or_review_many`` under ``batch_prompt_hash``, and those
+        the batched answers don't cover are reviewed with ``review_single``
+        under ``prompt_hash``, so later single or batched calls find them there.
+
+        Args:
+            repos: Repository ``full_name`` per item.
+            head_shas: HEAD commit per item (None entries are resolved).
+            batch_prompt_hash: ``prompt_template_hash`` of the batched prompt.
+            prompt_hash: ``prompt_template_hash`` of the single-repo prompt.
+            review_batch: Reviews the items at the given indexes with batched
+                prompts; None for items the answers didn't cover.
+            review_single: Reviews the item at an index with the single-repo prompt.
+
+        Returns:
+            One result per repo, in order.
+        """
+        head_shas = [self._resolve(repo, head_sha) for repo, head_sha in zip(repos, head_shas or [None] * len(repos))]
+        results = [self._cached(repo, head_sha, model, prompt_hash) if head_sha else None
+                   for repo, head_sha in zip(repos, head_shas)]
+
+        pending = [index for index, result in enumerate(results) if result is None]
+        batched = self.get_or_review_many(
+            [repos[index] for index in pending], [head_shas[index] for index in pending], model,
+            batch_prompt_hash, lambda positions: review_batch([pending[p] for p in positions]), is_valid,
+        ) if pending else []
+
+        for index, result in zip(pending, batched):
+            if result is None and head_shas[index]:
+                result = self.get_or_review(repos[index], head_shas[index], model, prompt_hash,
+                                            lambda: review_single(index), is_valid)
+            elif result is None:
+                result = review_single(index)
+            results[index] = result
+        return results
+
+    def _resolve(self, repo: str, head_sha: Optional[str]) -> Optional[str]:
+        if head_sha is None and self.resolve_head is not None:
+            try:
+                head_sha = self.resolve_head(repo)
+            except Exception as e:
+                logger.warning(f"Could not resolve HEAD of {repo}: {e}")
+        return head_sha
+
+    def _cached(self, repo: str, head_sha: str, model: str, prompt_hash: str) -> Optional[Dict[str, Any]]:
+        cached = self.get(repo, head_sha, model, prompt_hash)
+        if cached is not None:
+            logger.info(f"♻️ Reusing AI review of {repo}@{head_sha[:7]} ({model})")
+        return cached
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,22 +1,321 @@
 """
 Rust Scanner Bridge - Integrates Rust-based GitHub scanner with Python workflow
+
+The Rust binaries print one repository per line as newline-delimited JSON
+(NDJSON) as soon as each one passes validation. ``stream_repos`` yields them
+while the scan is still running, so callers can start working on the first
+candidates without waiting for the whole scan.
+
+``RustWorker`` keeps one ``hidden-gems-scanner --serve`` process alive and
+sends it scan/analyze commands over stdin, so repeated jobs reuse its runtime
+and warm HTTP connections instead of spawning a new process each time.
 """
+import itertools
 import subprocess
 import json
 import os
 import logging
+import queue
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Delimiters of the single JSON block printed by older binaries
+START_MARKER = "__REPO_JSON__"
+END_MARKER = "__END_JSON__"
+
+
+def _pump(stream, sink: queue.Queue) -> None:
+    """Copy lines from ``stream`` into ``sink``, then a None sentinel at EOF."""
+    try:
+        for line in stream:
+            sink.put(line)
+    finally:
+        sink.put(None)
+
+
+def _parse_block(block: List[str]) -> List[Dict]:
+    data = json.loads("".join(block))
+    return data if isinstance(data, list) else [data]
+
+
+def stream_repos(command: List[str], env: Optional[Dict[str, str]] = None,
+                 idle_timeout: float = 60.0) -> Iterator[Dict]:
+    """
+    Run a Rust scanner binary and yield repositories as it prints them.
+
+    Every stdout line that is a JSON object is one repository. A JSON block
+    between ``__REPO_JSON__`` and ``__END_JSON__`` (the format of older
+    binaries) is also accepted; other lines are ignored.
+
+    Closing the generator early terminates the process.
+
+    Args:
+        command: Binary and arguments.
+        env: Environment for the process.
+        idle_timeout: Seconds allowed between two lines of output. A scan may
+            take as long as it needs as long as it keeps making progress.
+
+    Raises:
+        subprocess.TimeoutExpired: The process printed nothing for ``idle_timeout`` seconds.
+        RuntimeError: The process exited with a non-zero code.
+    """
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        encoding="utf-8",
+        errors="ignore",
+    )
+    lines: queue.Queue = queue.Queue()
+    stderr_tail = deque(maxlen=20)
+    # Both pipes are drained in the background so a chatty RUST_LOG can't block the scanner
+    threading.Thread(target=_pump, args=(process.stdout, lines), daemon=True).start()
+    stderr_reader = threading.Thread(target=lambda: stderr_tail.extend(process.stderr), daemon=True)
+    stderr_reader.start()
+
+    block = None
+    try:
+        while True:
+            try:
+                line = lines.get(timeout=idle_timeout)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(command, idle_timeout)
+            if line is None:
+                break
+
+            stripped = line.strip()
+            if block is not None:
+                if stripped == END_MARKER:
+                    yield from _parse_block(block)
+                    block = None
+                else:
+                    block.append(line)
+            elif stripped == START_MARKER:
+                block = []
+            elif stripped.startswith("{"):
+                try:
+                    repo = json.loads(stripped)
+                except ValueError:
+                    # One garbled line (e.g. interleaved log output) shouldn't end the scan
+                    logger.warning(f"Ignoring malformed Rust scanner output: {stripped[:200]}")
+                    continue
+                yield repo
+
+        returncode = process.wait(timeout=idle_timeout)
+        if returncode != 0:
+            stderr_reader.join(timeout=1)
+            raise RuntimeError(f"Rust scanner exited with code {returncode}: {''.join(stderr_tail).strip()}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+class RustWorker:
+    """
+    Persistent Rust worker process speaking JSON lines over stdin/stdout.
+
+    Each request is ``{"id", "cmd", ...}``; the worker answers with
+    ``{"id", "result"}`` lines followed by ``{"id", "done": true}`` or
+    ``{"id", "error"}``. The worker runs one command at a time, so requests
+    from several threads are queued. The process is started on first use and
+    restarted if it dies.
+    """
+
+    def __init__(self, command: List[str], env: Optional[Dict[str, str]] = None,
+                 idle_timeout: float = 60.0):
+        """
+        Args:
+            command: Worker binary and arguments (e.g. ``[binary, "--serve"]``).
+            env: Environment for the process.
+            idle_timeout: Seconds allowed between two responses of a running
+                command before the worker is considered stuck and killed.
+        """
+        self.command = command
+        self.env = env
+        self.idle_timeout = idle_timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        # Held from sending a command until the worker reports it finished
+        self._busy = threading.Lock()
+        # (request id, process) of the command the worker is running
+        self._running: Optional[Tuple[int, subprocess.Popen]] = None
+        # time.monotonic() of the running command's last response
+        self._last_output = 0.0
+        self._queues: Dict[int, queue.Queue] = {}
+        self._ids = itertools.count(1)
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _ensure_started(self) -> subprocess.Popen:
+        with self._lock:
+            if not self.is_alive():
+                logger.info("🦀 Starting persistent Rust worker...")
+                self._process = subprocess.Popen(
+                    self.command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    env=self.env,
+                    encoding="utf-8",
+                    errors="ignore",
+                )
+                threading.Thread(target=self._read, args=(self._process,), daemon=True).start()
+            return self._process
+
+    def _read(self, process: subprocess.Popen) -> None:
+        """Route worker output to the waiting requests (runs on a background thread)."""
+        try:
+            for line in process.stdout:
+                line = line.strip()
+                if not line.startswith("{"):
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Ignoring malformed Rust worker output: {line[:200]}")
+                    continue
+                request_id = message.get("id")
+                self._last_output = time.monotonic()
+
+                sink = self._queues.get(request_id)
+                if sink is not None:
+                    sink.put(message)
+                if "done" in message or "error" in message:
+                    self._finish((request_id, process))
+        finally:
+            running = self._running
+            if running is not None and running[1] is process:
+                sink = self._queues.get(running[0])
+                if sink is not None:
+                    sink.put({"id": running[0], "error": f"Rust worker exited with code {process.wait()}"})
+                self._finish(running)
+
+    def _finish(self, running: Tuple[int, subprocess.Popen]) -> None:
+        """Mark ``running`` as finished so the next command can be sent."""
+        with self._lock:
+            if self._running == running:
+                self._running = None
+                self._busy.release()
+
+    def request(self, cmd: str, **params: Any) -> Iterator[Dict]:
+        """
+        Send one command and yield its results as the worker produces them.
+
+        A caller may stop iterating early; the worker still finishes the
+        command in the background and its remaining results are discarded.
+        If that abandoned command then goes ``idle_timeout`` seconds without
+        output, the next request kills the worker and starts a fresh one.
+
+        Raises:
+            subprocess.TimeoutExpired: No response for ``idle_timeout`` seconds.
+            RuntimeError: The command failed or the worker died.
+        """
+        self._wait_until_free()
+        request_id = next(self._ids)
+        sink: queue.Queue = queue.Queue()
+        try:
+            process = self._ensure_started()
+        except Exception:
+            self._busy.release()
+            raise
+
+        running = (request_id, process)
+        with self._lock:
+            self._running = running
+            self._last_output = time.monotonic()
+            self._queues[request_id] = sink
+        try:
+            process.stdin.write(json.dumps({"id": request_id, "cmd": cmd, **params}) + "\n")
+            process.stdin.flush()
+        except OSError:
+            self._queues.pop(request_id, None)
+            self._finish(running)
+            raise RuntimeError("Rust worker is not accepting commands")
+
+        try:
+            while True:
+                try:
+                    message = sink.get(timeout=self.idle_timeout)
+                except queue.Empty:
+                    self._kill()
+                    raise subprocess.TimeoutExpired(self.command, self.idle_timeout)
+
+                if "error" in message:
+                    raise RuntimeError(f"Rust worker {cmd} failed: {message['error']}")
+                if message.get("done"):
+                    return
+                yield message["result"]
+        finally:
+            self._queues.pop(request_id, None)
+
+    def _wait_until_free(self) -> None:
+        """Acquire ``_busy``, killing a worker stuck on an abandoned command."""
+        while not self._busy.acquire(timeout=self.idle_timeout):
+            # Another caller may still be streaming a long command; only a
+            # command that stopped producing output counts as stuck
+            with self._lock:
+                stuck = self._running is not None and time.monotonic() - self._last_output >= self.idle_timeout
+            if stuck:
+                logger.warning(f"⚠️ Rust worker silent for {self.idle_timeout:.0f}s, restarting it")
+                # The reader thread then releases _busy and the next command starts a new process
+                self._kill()
+
+    def scan(self, tier: str = "small") -> Iterator[Dict]:
+        """Hidden gem candidates of ``tier``, streamed as they are found."""
+        return self.request("scan", tier=tier)
+
+    def analyze(self, repos: List[Dict]) -> Iterator[Dict]:
+        """Analyses of ``repos`` (repo dicts as returned by ``scan``), in completion order."""
+        return self.request("analyze", repos=repos)
+
+    def _kill(self) -> None:
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the worker, letting it finish the current command for up to ``timeout`` seconds."""
+        process = self._process
+        if process is None or process.poll() is not None:
+            return
+        try:
+            # The worker exits once stdin is closed
+            process.stdin.close()
+            process.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self._kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 
 class RustScanner:
     """Bridge to Rust-based GitHub scanner for faster performance"""
 
-    def __init__(self, token: str):
+    def __init__(self, token: str, idle_timeout: float = 60.0, api_url: Optional[str] = None):
+        """
+        Args:
+            token: GitHub API token.
+            idle_timeout: Seconds the binaries may go without printing a result.
+            api_url: GitHub API base URL passed to the binaries as
+                ``GITHUB_API_URL`` (GitHub Enterprise or a local fake server).
+        """
         self.token = token
+        self.idle_timeout = idle_timeout
+        self.api_url = api_url
         self.rust_binary = self._find_rust_binary()
+        self._worker: Optional[RustWorker] = None
 
     def _find_rust_binary(self) -> Optional[Path]:
         """Find the Rust scanner binary"""
@@ -37,6 +336,61 @@ class RustScanner:
         """Check if Rust scanner is available"""
         return self.rust_binary is not None and self.rust_binary.exists()
 
+    def _env(self) -> Dict[str, str]:
+        """Environment for the Rust binaries"""
+        env = os.environ.copy()
+        env['GITHUB_TOKEN'] = self.token
+        if self.api_url:
+            env['GITHUB_API_URL'] = self.api_url
+        return env
+
+    def _find_worker_binary(self) -> Optional[Path]:
+        """Find the hidden gems binary, which doubles as the persistent worker"""
+        release_dir = Path(__file__).parent.parent.parent / "rust-scanner" / "target" / "release"
+        for path in (release_dir / "hidden-gems-scanner", release_dir / "hidden-gems-scanner.exe"):
+            if path.exists():
+                return path
+        return None
+
+    def worker(self) -> Optional[RustWorker]:
+        """
+        The persistent worker shared by every scan/analyze call on this scanner.
+
+        Long-running callers (daemon loops, webhook job runners) should keep one
+        RustScanner around so the worker's runtime and HTTP connections stay warm.
+        Returns None if the worker binary is not built.
+        """
+        if self._worker is None:
+            binary = self._find_worker_binary()
+            if binary is None:
+                logger.warning("⚠️  hidden-gems-scanner binary not found, persistent worker unavailable")
+                return None
+
+            env = self._env()
+            env.setdefault('RUST_LOG', 'info')
+            self._worker = RustWorker([str(binary), "--serve"], env=env, idle_timeout=self.idle_timeout)
+        return self._worker
+
+    def scan_tier(self, tier: str = "small") -> Iterator[Dict]:
+        """Stream hidden gem candidates of ``tier`` from the persistent worker."""
+        worker = self.worker()
+        if worker is None:
+            return iter(())
+        return worker.scan(tier)
+
+    def analyze_repos(self, repos: List[Dict]) -> Iterator[Dict]:
+        """Stream Rust-side analyses of ``repos`` from the persistent worker."""
+        worker = self.worker()
+        if worker is None:
+            return iter(())
+        return worker.analyze(repos)
+
+    def close(self) -> None:
+        """Stop the persistent worker, if one was started."""
+        if self._worker is not None:
+            self._worker.close()
+            self._worker = None
+
     def scan_and_find_repo(self) -> Optional[Dict]:
         """
         Use Rust scanner to find a valid repository
@@ -46,70 +400,52 @@ class RustScanner:
             logger.warning("Rust scanner not available, falling back to Python scanner")
             return None
 
-        try:
-            logger.info("🦀 Running Rust scanner for faster performance...")
-
-            env = os.environ.copy()
-            env['GITHUB_TOKEN'] = self.token
-            env['RUST_LOG'] = 'info'
-
-            # Run Rust binary
-            result = subprocess.run(
-                [str(self.rust_binary)],
-                capture_output=True,
-                text=True,
-                env=env,
-                timeout=60  # 1 minute timeout
-            )
-
-            if result.returncode != 0:
-                logger.error(f"Rust scanner failed with code {result.returncode}")
-                logger.error(f"stderr: {result.stderr}")
-                return None
+        logger.info("🦀 Running Rust scanner for faster performance...")
 
-            # Parse output
-            output = result.stdout
-            logger.info(f"Rust scanner output:\n{output}")
-
-            # Extract JSON between markers
-            if "__REPO_JSON__" in output and "__END_JSON__" in output:
-                json_start = output.index("__REPO_JSON__") + len("__REPO_JSON__\n")
-                json_end = output.index("__END_JSON__")
-                json_str = output[json_start:json_end].strip()
-
-                repo_data = json.loads(json_str)
-                logger.info(f"✅ Rust scanner found repository: {repo_data.get('full_name')}")
-                return repo_data
-            else:
-                logger.warning("No repository JSON found in Rust scanner output")
-                return None
+        env = self._env()
+        env['RUST_LOG'] = 'info'
 
+        # The first valid repo is all we need; closing the stream stops the scan
+        repos = stream_repos([str(self.rust_binary)], env=env, idle_timeout=self.idle_timeout)
+        try:
+            repo_data = next(repos, None)
         except subprocess.TimeoutExpired:
-            logger.error("Rust scanner timed out after 60 seconds")
+            logger.error(f"Rust scanner produced no output for {self.idle_timeout:.0f} seconds")
             return None
         except Exception as e:
             logger.error(f"Error running Rust scanner: {e}")
             return None
+        finally:
+            repos.close()
+
+        if repo_data is None:
+            logger.warning("No repository found by Rust scanner")
+            return None
+
+        logger.info(f"✅ Rust scanner found repository: {repo_data.get('full_name')}")
+        return repo_data
 
 
-def get_scanner(token: str, prefer_rust: bool = True):
+def get_scanner(token: str, prefer_rust: bool = True, api_url: Optional[str] = None):
     """
     Get the best available scanner (Rust or Python fallback)
 
     Args:
         token: GitHub API token
         prefer_rust: If True, try Rust scanner first
+        api_url: GitHub API base URL; the public API when omitted
 
     Returns:
         Scanner instance (RustScanner or GitHubScanner)
     """
     if prefer_rust:
-        rust_scanner = RustScanner(token)
+        rust_scanner = RustScanner(token, api_url=api_url)
         if rust_scanner.is_available():
             logger.info("🦀 Using Rust scanner (faster)")
             return rust_scanner
 
     # Fallback to Python scanner
+    from scanner.github_client import DEFAULT_API_URL
     from scanner.github_scanner import GitHubScanner
     logger.info("🐍 Using Python scanner (fallback)")
-    return GitHubScanner(token)
+    return GitHubScanner(token, api_url=api_url or DEFAULT_API_URL)
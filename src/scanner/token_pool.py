@@ -0,0 +1,127 @@
+"""
+Pool of GitHub tokens for spreading scan traffic across several rate-limit budgets.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+try:
+    from .rate_limiter import RateLimitScheduler
+except ImportError:
+    from src.scanner.rate_limiter import RateLimitScheduler
+
+logger = logging.getLogger(__name__)
+
+
+def collect_github_tokens() -> List[str]:
+    """Collect GITHUB_TOKEN and GITHUB_TOKEN_2..GITHUB_TOKEN_5 from the environment."""
+    tokens = []
+
+    main_token = os.environ.get("GITHUB_TOKEN")
+    if main_token:
+        tokens.append(main_token)
+
+    for i in range(2, 6):
+        token = os.environ.get(f"GITHUB_TOKEN_{i}")
+        if token and token not in tokens:
+            tokens.append(token)
+
+    return tokens
+
+
+class TokenHealth:
+    """Failure tracking for one token."""
+
+    def __init__(self):
+        self.consecutive_failures = 0
+        self.disabled = False
+        self.cooldown_until = 0.0
+
+
+class TokenPool:
+    """
+    Chooses a token per request by remaining quota and tracks token health.
+
+    A token answering 401 is disabled for the rest of the run; a token that
+    fails ``max_failures`` times in a row (5xx or connection errors) is
+    rested for ``cooldown`` seconds.
+    """
+
+    def __init__(self, tokens: List[str], scheduler: Optional[RateLimitScheduler] = None,
+                 max_failures: int = 3, cooldown: float = 60.0,
+                 clock: Callable[[], float] = time.time):
+        if not tokens:
+            raise ValueError("TokenPool needs at least one token")
+
+        self.tokens = list(dict.fromkeys(tokens))
+        self.scheduler = scheduler or RateLimitScheduler()
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self._clock = clock
+        self._health: Dict[str, TokenHealth] = {t: TokenHealth() for t in self.tokens}
+        self._lock = threading.Lock()
+
+    @property
+    def scope(self) -> str:
+        """Stable identifier for the pool, used to share cache entries across its tokens."""
+        digest = hashlib.sha256("\n".join(sorted(self.tokens)).encode("utf-8")).hexdigest()
+        return f"pool:{digest[:16]}"
+
+    def healthy_tokens(self) -> List[str]:
+        now = self._clock()
+        with self._lock:
+            return [
+                t for t in self.tokens
+                if not self._health[t].disabled and self._health[t].cooldown_until <= now
+            ]
+
+    def select(self, url: str) -> str:
+        """Pick the token with the shortest wait and the most remaining quota."""
+        resource = self.scheduler.resource_for(url)
+        candidates = self.healthy_tokens()
+        if not candidates:
+            logger.warning("⚠️ No healthy GitHub tokens left, using the full pool")
+            candidates = self.tokens
+
+        def rank(token):
+            remaining = self.scheduler.remaining(token, resource)
+            # Unknown budgets rank first so every token gets probed early
+            return (self.scheduler.wait_time(token, resource),
+                    -(remaining if remaining is not None else float("inf")))
+
+        return min(candidates, key=rank)
+
+    def report(self, token: str, response=None, error: Optional[Exception] = None) -> None:
+        """Record the outcome of a request made with ``token``."""
+        with self._lock:
+            health = self._health.get(token)
+            if health is None:
+                return
+
+            if response is not None and response.status_code == 401:
+                health.disabled = True
+                logger.error(f"❌ GitHub token #{self.tokens.index(token) + 1} rejected (401), removing it from the pool")
+                return
+
+            if error is not None or (response is not None and response.status_code >= 500):
+                health.consecutive_failures += 1
+                if health.consecutive_failures >= self.max_failures:
+                    health.cooldown_until = self._clock() + self.cooldown
+                    health.consecutive_failures = 0
+                    logger.warning(f"⚠️ GitHub token #{self.tokens.index(token) + 1} failing, resting it for {self.cooldown:.0f}s")
+                return
+
+            health.consecutive_failures = 0
+
+    def remaining(self, resource: str = "core") -> Optional[int]:
+        """Total remaining quota across healthy tokens, or None while any budget is unknown."""
+        total = 0
+        for token in self.healthy_tokens():
+            remaining = self.scheduler.remaining(token, resource)
+            if remaining is None:
+                return None
+            total += max(remaining, 0)
+        return total
@@ -43,3 +43,11 @@ def mock_repo_data():
         "stargazers_count": 100,
         "forks_count": 10
     }
+
+@pytest.fixture
+def fake_github():
+    """A running offline GitHub API stand-in; see tests/fake_github.py."""
+    from .fake_github import FakeGitHub
+
+    with FakeGitHub() as server:
+        yield server
@@ -0,0 +1,357 @@
+"""
+Offline stand-in for the GitHub REST API.
+
+Serves fixture responses for the endpoints the scanner, the insights
+collector and the Rust binaries call (search, repos, contributors,
+participation stats, community profile, pulls, commits, readme, ...), with
+configurable latency, rate-limit headers, 202 stats responses and ETags.
+
+Use the ``fake_github`` fixture from conftest.py, or start one directly::
+
+    with FakeGitHub(latency=0.05) as server:
+        server.add_repos(20)
+        scanner = GitHubScanner("token", api_url=server.api_url)
+"""
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+DEFAULT_README = (
+    "# {name}\n\n"
+    "A small, focused library with a clear API, examples and a test suite.\n\n"
+    "## Installation\n\n    pip install {name}\n\n"
+    "## Usage\n\nImport it, configure it once, and call it from your code. "
+    "Every public function is documented, and the examples folder covers the common cases.\n\n"
+    "## Contributing\n\nIssues and pull requests are welcome; see CONTRIBUTING.md.\n"
+)
+
+
+def make_repo(full_name: str, **overrides: Any) -> Dict[str, Any]:
+    """A search/repository payload with the fields our clients read."""
+    owner, name = full_name.split("/", 1)
+    repo = {
+        "id": int(hashlib.md5(full_name.encode()).hexdigest()[:8], 16),
+        "name": name,
+        "full_name": full_name,
+        "owner": {"login": owner},
+        "html_url": f"https://github.com/{full_name}",
+        "description": f"{name}: a fast, well documented library for building developer tools",
+        "fork": False,
+        "created_at": "2023-03-01T00:00:00Z",
+        "updated_at": "2024-06-01T00:00:00Z",
+        "pushed_at": "2024-06-01T00:00:00Z",
+        "size": 2048,
+        "stargazers_count": 250,
+        "watchers_count": 250,
+        "forks_count": 30,
+        "open_issues_count": 12,
+        "open_issues": 12,
+        "language": "Python",
+        "license": {"key": "mit", "name": "MIT License", "spdx_id": "MIT"},
+        "topics": ["cli", "developer-tools"],
+        "has_wiki": True,
+        "has_pages": False,
+        "archived": False,
+        "disabled": False,
+        "default_branch": "main",
+    }
+    repo.update(overrides)
+    return repo
+
+
+class FakeGitHub:
+    """
+    Threaded local HTTP server answering like ``api.github.com``.
+
+    Every request is recorded in ``requests`` as ``(method, path)``, and the
+    most requests handled at once in ``max_in_flight``. Rate
+    limits are tracked per resource (``core``/``search``) and reported in
+    ``X-RateLimit-*`` headers; requests over the limit get a 403. Answers to
+    ``If-None-Match`` with the current ETag are a free 304.
+    """
+
+    def __init__(self, latency: float = 0.0, rate_limit: int = 5000, search_rate_limit: int = 30,
+                 stats_pending: int = 0):
+        """
+        Args:
+            latency: Seconds added to every response.
+            rate_limit: Core requests allowed before answering 403.
+            search_rate_limit: Search requests allowed before answering 403.
+            stats_pending: 202 responses returned per repo by
+                ``/stats/participation`` before the stats are ready.
+        """
+        self.latency = latency
+        self.limits = {"core": rate_limit, "search": search_rate_limit}
+        self.remaining = dict(self.limits)
+        self.reset_at = int(time.time()) + 3600
+        # Commit dates are relative to this, so payloads (and ETags) stay stable
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.stats_pending = stats_pending
+        self.repos: Dict[str, Dict[str, Any]] = {}
+        self.extras: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._stats_polls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # -- fixtures ---------------------------------------------------------
+
+    def add_repo(self, full_name: str, contributors: int = 12, weekly_commits: Optional[List[int]] = None,
+                 health_percentage: int = 75, merged_prs: int = 8, closed_prs: int = 10,
+                 readme: Optional[str] = None, **fields: Any) -> Dict[str, Any]:
+        """Register a repository; ``fields`` override the repository payload."""
+        repo = make_repo(full_name, **fields)
+        self.repos[full_name] = repo
+        self.extras[full_name] = {
+            "contributors": contributors,
+            "weekly_commits": weekly_commits if weekly_commits is not None else [3] * 52,
+            "health_percentage": health_percentage,
+            "merged_prs": merged_prs,
+            "closed_prs": closed_prs,
+            "readme": readme if readme is not None else DEFAULT_README.format(name=repo["name"]),
+        }
+        return repo
+
+    def add_repos(self, count: int, owner: str = "fixture", **kwargs: Any) -> List[Dict[str, Any]]:
+        return [self.add_repo(f"{owner}/project-{i:03d}", **kwargs) for i in range(count)]
+
+    def count(self, path_prefix: str = "") -> int:
+        """Number of requests received whose path starts with ``path_prefix``."""
+        with self._lock:
+            return sum(1 for _, path in self.requests if path.startswith(path_prefix))
+
+    # -- lifecycle --------------------------------------------------------
+
+    @property
+    def api_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGitHub":
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeGitHub":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # -- request handling -------------------------------------------------
+
+    def handle(self, method: str, target: str, headers) -> Tuple[int, Dict[str, str], bytes]:
+        with self._lock:
+            self.requests.append((method, target))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            return self._respond(method, target, headers)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _respond(self, method: str, target: str, headers) -> Tuple[int, Dict[str, str], bytes]:
+        url = urlparse(target)
+        path = url.path.rstrip("/") or "/"
+        query = dict(parse_qsl(url.query, keep_blank_values=True))
+
+        if path == "/rate_limit":
+            return self._json(200, self._rate_limit_payload())
+
+        resource = "search" if path.startswith("/search/") else "core"
+        status, payload, extra_headers = self._route(method, path, query)
+        body = json.dumps(payload).encode()
+        response_headers = {"Content-Type": "application/json; charset=utf-8", **extra_headers}
+
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if status == 200 and headers.get("If-None-Match") == etag:
+            # Conditional hits don't count against the rate limit
+            return 304, {**self._rate_headers(resource), "ETag": etag}, b""
+
+        with self._lock:
+            if self.remaining[resource] <= 0:
+                return self._json(403, {"message": "API rate limit exceeded"}, self._rate_headers(resource))
+            self.remaining[resource] -= 1
+
+        response_headers.update(self._rate_headers(resource))
+        if status == 200:
+            response_headers["ETag"] = etag
+        return status, response_headers, body
+
+    def _rate_headers(self, resource: str) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.limits[resource]),
+            "X-RateLimit-Remaining": str(max(self.remaining[resource], 0)),
+            "X-RateLimit-Used": str(self.limits[resource] - max(self.remaining[resource], 0)),
+            "X-RateLimit-Reset": str(self.reset_at),
+            "X-RateLimit-Resource": resource,
+        }
+
+    def _rate_limit_payload(self) -> Dict[str, Any]:
+        resources = {
+            name: {"limit": self.limits[name], "remaining": self.remaining[name],
+                   "reset": self.reset_at, "used": self.limits[name] - self.remaining[name]}
+            for name in self.limits
+        }
+        return {"resources": resources, "rate": resources["core"]}
+
+    @staticmethod
+    def _json(status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        return status, {"Content-Type": "application/json; charset=utf-8", **(headers or {})}, json.dumps(payload).encode()
+
+    def _route(self, method: str, path: str, query: Dict[str, str]) -> Tuple[int, Any, Dict[str, str]]:
+        not_found = (404, {"message": "Not Found"}, {})
+        if method != "GET":
+            return not_found
+
+        if path == "/search/repositories":
+            return self._paginate(path, query, list(self.repos.values()), wrap=True)
+
+        parts = path.strip("/").split("/")
+        if len(parts) < 3 or parts[0] != "repos":
+            return not_found
+        full_name = f"{parts[1]}/{parts[2]}"
+        if full_name not in self.repos:
+            return not_found
+        repo, extras = self.repos[full_name], self.extras[full_name]
+        rest = "/".join(parts[3:])
+
+        if rest == "":
+            return 200, repo, {}
+        if rest == "contributors":
+            return self._paginate(path, query, self._contributors(full_name, extras["contributors"]))
+        if rest == "stats/participation":
+            with self._lock:
+                self._stats_polls[full_name] += 1
+                pending = self._stats_polls[full_name] <= self.stats_pending
+            if pending:
+                return 202, {}, {}
+            weekly = extras["weekly_commits"]
+            return 200, {"all": weekly, "owner": [0] * len(weekly)}, {}
+        if rest == "community/profile":
+            return 200, {"health_percentage": extras["health_percentage"]}, {}
+        if rest == "pulls":
+            return self._paginate(path, query, self._pulls(extras))
+        if rest == "issues":
+            return self._paginate(path, query, [])
+        if rest == "commits":
+            return self._paginate(path, query, self._commits(full_name))
+        if rest.startswith("commits/"):
+            return 200, self._commits(full_name)[0], {}
+        if rest == "readme":
+            content = extras["readme"].encode()
+            return 200, {
+                "name": "README.md", "path": "README.md", "size": len(content),
+                "encoding": "base64", "content": base64.b64encode(content).decode(),
+            }, {}
+        if rest == "contents":
+            return 200, [
+                {"name": "README.md", "path": "README.md", "type": "file"},
+                {"name": "LICENSE", "path": "LICENSE", "type": "file"},
+                {"name": "tests", "path": "tests", "type": "dir"},
+                {"name": ".github", "path": ".github", "type": "dir"},
+            ], {}
+        if rest == "actions/runs":
+            return 200, {"total_count": 1, "workflow_runs": [{"id": 1, "status": "completed", "conclusion": "success"}]}, {}
+        return not_found
+
+    def _paginate(self, path: str, query: Dict[str, str], items: List[Any], wrap: bool = False):
+        per_page = max(1, min(int(query.get("per_page", 30)), 100))
+        page = max(1, int(query.get("page", 1)))
+        last = max(1, -(-len(items) // per_page))
+        chunk = items[(page - 1) * per_page:page * per_page]
+
+        headers = {}
+        if page < last:
+            base = {k: v for k, v in query.items() if k != "page"}
+            # page goes last so clients that scrape the number off the URL find it
+            headers["Link"] = ", ".join(
+                f'<{self.api_url}{path}?{urlencode({**base, "page": number})}>; rel="{rel}"'
+                for rel, number in (("next", page + 1), ("last", last))
+            )
+
+        payload = {"total_count": len(items), "incomplete_results": False, "items": chunk} if wrap else chunk
+        return 200, payload, headers
+
+    @staticmethod
+    def _contributors(full_name: str, count: int) -> List[Dict[str, Any]]:
+        owner = full_name.split("/", 1)[0]
+        return [
+            {"login": f"{owner}-dev{i}", "avatar_url": f"https://avatars.example/{owner}-dev{i}",
+             "html_url": f"https://github.com/{owner}-dev{i}", "contributions": max(100 - 7 * i, 1)}
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def _pulls(extras: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            {"number": i + 1, "state": "closed", "created_at": "2024-05-01T00:00:00Z",
+             "merged_at": "2024-05-02T00:00:00Z" if i < extras["merged_prs"] else None}
+            for i in range(extras["closed_prs"])
+        ]
+
+    def _commits(self, full_name: str) -> List[Dict[str, Any]]:
+        commits = []
+        for i in range(30):
+            date = (self.now - timedelta(days=i)).isoformat().replace("+00:00", "Z")
+            sha = hashlib.sha1(f"{full_name}:{i}".encode()).hexdigest()
+            commits.append({
+                "sha": sha,
+                "commit": {
+                    "message": f"Improve module {i}",
+                    "author": {"name": "dev", "date": date},
+                    "committer": {"name": "dev", "date": date},
+                },
+            })
+        return commits
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections when many worker threads
+    # connect at once, and the client then waits a full second to retry
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        status, headers, body = self.server.fake.handle(self.command, self.path, self.headers)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args) -> None:
+        pass
@@ -0,0 +1,112 @@
+"""
+Offline stand-in for the GitHub Models chat completions endpoint.
+
+Answers every prompt with a fixed review (or whatever ``respond`` returns),
+with configurable latency and a number of initial 429 answers carrying
+``Retry-After``. Point a reviewer at it with::
+
+    with FakeModels(latency=0.1) as server:
+        reviewer.api_endpoint = server.endpoint
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .fake_github import _Server
+
+REVIEW_SCORES = {
+    "architecture_score": 8,
+    "documentation_score": 7,
+    "testing_score": 6,
+    "practices_score": 7,
+    "innovation_score": 9,
+    "key_strengths": ["clear design"],
+    "improvements": ["more tests"],
+    "assessment": "Solid project.",
+}
+
+
+class FakeModels:
+    """Threaded chat completions server recording the prompts it receives."""
+
+    def __init__(self, latency: float = 0.0, throttled: int = 0, retry_after: float = 0.1,
+                 respond: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            latency: Seconds to sleep before answering each request.
+            throttled: Number of requests answered 429 before serving normally.
+            retry_after: ``Retry-After`` seconds sent with each 429.
+            respond: Builds the completion text from the user prompt.
+        """
+        self.latency = latency
+        self.throttled = throttled
+        self.retry_after = retry_after
+        self.respond = respond or (lambda prompt: json.dumps(REVIEW_SCORES))
+        self.prompts: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/chat/completions"
+
+    def start(self) -> "FakeModels":
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.fake = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeModels":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def handle(self, payload: Dict) -> Tuple[int, Dict[str, str], Dict]:
+        prompt = payload["messages"][-1]["content"]
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            throttle = self.throttled > 0
+            if throttle:
+                self.throttled -= 1
+            else:
+                self.prompts.append(prompt)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if throttle:
+                return 429, {"Retry-After": str(self.retry_after)}, {"message": "Too many requests"}
+            return 200, {}, {"choices": [{"message": {"content": self.respond(prompt)}}]}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        status, headers, payload = self.server.fake.handle(json.loads(self.rfile.read(length)))
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in {"Content-Type": "application/json", **headers}.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
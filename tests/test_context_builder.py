@@ -0,0 +1,120 @@
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.context_builder import ContextBuilder, estimate_tokens, pack_readme, strip_boilerplate
+
+README = """<p align="center">
+  <img src="logo.png" width="200">
+</p>
+
+[![CI](https://github.com/octo/widget/actions/workflows/ci.yml/badge.svg)](https://github.com/octo/widget/actions) [![PyPI](https://img.shields.io/pypi/v/widget.svg)](https://pypi.org/project/widget)
+
+<!-- This README is generated, edit docs/README.in -->
+Widget turns slow pipelines into fast ones by caching every intermediate step.
+
+## Table of Contents
+- [Installation](#installation)
+- [Features](#features)
+
+## Installation
+```bash
+# install the extras too
+pip install widget[all]
+```
+
+## Contributing
+Pull requests are welcome. Please open an issue first to discuss what you would like to change.
+
+## Features
+- Content-addressed cache
+- Works offline
+
+## License
+MIT License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software.
+"""
+
+
+def test_boilerplate_is_stripped():
+    packed = pack_readme(README, 1000)
+
+    assert packed.startswith("Widget turns slow pipelines")
+    for boilerplate in ("badge.svg", "<img", "<!--", "Table of Contents", "Permission is hereby granted", "MIT License"):
+        assert boilerplate not in packed
+    # Code blocks survive intact, comments included
+    assert "# install the extras too\npip install widget[all]" in packed
+
+
+def test_sections_are_packed_by_priority_and_kept_in_order():
+    packed = pack_readme(README, 40)
+
+    assert "Widget turns slow pipelines" in packed
+    assert "## Features" in packed
+    assert "Contributing" not in packed
+    assert estimate_tokens(packed) <= 40
+
+    full = pack_readme(README, 1000)
+    assert full.index("## Installation") < full.index("## Contributing") < full.index("## Features")
+
+
+def test_budget_is_shared_across_readme_commits_and_files():
+    commits = [{"message": "Fix cache eviction\n\nLong body explaining why", "author": "ana"},
+               {"message": "Fix cache eviction", "author": "ana"},
+               {"message": "Add offline mode", "author": "bo"}]
+    files = [{"path": "widget/cache.py", "content": "x = 1\n" * 400, "language": "python"}]
+
+    packed = (ContextBuilder(200)
+              .add_readme(README)
+              .add_commits(commits)
+              .add_files(files, max_file_tokens=50)
+              .build())
+
+    assert [c["message"] for c in packed["commits"]] == ["Fix cache eviction", "Add offline mode"]
+    assert packed["files"][0]["path"] == "widget/cache.py"
+    assert estimate_tokens(packed["files"][0]["content"]) <= 50
+    used = sum(estimate_tokens(text) for text in packed["readme"])
+    used += sum(estimate_tokens(c["message"]) for c in packed["commits"])
+    used += sum(estimate_tokens(f"{f['path']}\n{f['content']}") for f in packed["files"])
+    assert used <= 200
+
+
+def test_pieces_that_do_not_fit_make_room_for_smaller_ones():
+    packed = (ContextBuilder(50)
+              .add("notes", "big " * 100, priority=0, truncatable=False)
+              .add("notes", "small note", priority=1)
+              .build())
+
+    assert packed == {"notes": ["small note"]}
+
+
+def test_plain_readme_without_boilerplate_is_unchanged():
+    readme = "# Widget\n\nDoes one thing well."
+
+    assert strip_boilerplate(readme) == readme
+    assert pack_readme(readme, 100) == readme
+
+
+def test_intro_under_a_title_heading_is_kept_first():
+    readme = (
+        "# FastWidget\n\n"
+        "FastWidget renders dashboards from SQL queries without a server.\n\n"
+        "## Installation\n\n" + "pip install fastwidget and then configure every option.\n" * 8 + "\n"
+        "## Usage\n\n" + "Run fastwidget serve and open the browser at the given port.\n" * 8
+    )
+
+    packed = pack_readme(readme, 150)
+
+    assert packed.startswith("# FastWidget\n\nFastWidget renders dashboards")
+    assert "## Usage" in packed
+    assert "## Installation" not in packed
+
+
+def test_h1_section_titles_are_not_all_intro():
+    readme = "# Widget\n\nDoes one thing.\n\n# Installation\n\npip install widget\n\n# Credits\n\nEveryone."
+    builder = ContextBuilder(1000).add_readme(readme)
+
+    assert [piece.priority for piece in builder._pieces] == [0, 4, 5]
@@ -0,0 +1,129 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.deferred_stats import DeferredStats
+from scanner.github_scanner import GitHubScanner
+from scanner.insights_collector import STATS_PENDING, InsightsCollector
+from scanner.repo_classifier import RepoClassifier
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestDeferredStats:
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_repolls_with_backoff_until_ready(self, clock):
+        answers = iter([None, None, 6.5])
+        deferred = DeferredStats(lambda key: next(answers), initial_delay=2, backoff=2,
+                                 sleep=clock.sleep, clock=clock.time)
+        deferred.register("owner/repo", "payload")
+
+        assert deferred.poll_due() == []
+        assert list(deferred.drain()) == [("owner/repo", "payload", 6.5)]
+        assert clock.sleeps == [2, 4, 8]
+        assert len(deferred) == 0
+
+    def test_finalizes_without_value_at_deadline(self, clock):
+        deferred = DeferredStats(lambda key: None, initial_delay=2, deadline=5,
+                                 sleep=clock.sleep, clock=clock.time)
+        deferred.register("owner/repo")
+
+        assert list(deferred.drain()) == [("owner/repo", None, None)]
+        assert clock.now == 1005
+
+
+def test_commit_activity_pending_on_202():
+    collector = InsightsCollector("mock_token")
+    with patch.object(collector.client, "get", return_value=MagicMock(status_code=202)):
+        assert collector._get_commit_activity("owner/repo") is STATS_PENDING
+        assert collector.collect_insights("owner/repo")["commit_frequency_score"] is None
+        assert collector.refresh_commit_activity("owner/repo") is None
+
+
+def test_failed_stats_fall_back_instead_of_pending():
+    collector = InsightsCollector("mock_token")
+    with patch.object(collector.client, "get", return_value=MagicMock(status_code=500)):
+        assert collector.collect_insights("owner/repo")["commit_frequency_score"] == 0.0
+        assert collector.refresh_commit_activity("owner/repo") == 0.0
+
+
+def test_classifier_does_not_penalize_unknown_activity():
+    classifier = RepoClassifier()
+    repo = {"name": "tool", "description": "x" * 50}
+
+    unknown = classifier.classify_repo(repo, {"commit_frequency_score": None})
+    inactive = classifier.classify_repo(repo, {"commit_frequency_score": 0})
+
+    assert unknown["score"] == inactive["score"] + 10
+    assert "Commit activity unknown" in unknown["reasons"]
+
+
+def test_scanner_defers_repos_with_pending_stats():
+    clock = FakeClock()
+    scanner = GitHubScanner("mock_token", workers=1)
+    search = MagicMock(status_code=200)
+    search.json.return_value = {"items": [{"full_name": "owner/slow", "name": "slow"},
+                                          {"full_name": "owner/fast", "name": "fast"}]}
+    insights = {
+        "owner/slow": {"commit_frequency_score": None},
+        "owner/fast": {"commit_frequency_score": 8.0},
+    }
+
+    def make_deferred(poll, deadline):
+        return DeferredStats(poll, deadline=deadline, sleep=clock.sleep, clock=clock.time)
+
+    def classify(repo, repo_insights):
+        return {"is_real_project": True, "score": 80, "reasons": [repo_insights["commit_frequency_score"]]}
+
+    with patch.object(scanner.client, "get", return_value=search), \
+         patch.object(scanner, "validate_repo_basic", return_value=True), \
+         patch.object(scanner.insights_collector, "collect_insights", side_effect=lambda name: dict(insights[name])), \
+         patch.object(scanner.insights_collector, "refresh_commit_activity", side_effect=[None, 4.0]), \
+         patch.object(scanner.classifier, "classify_repo", side_effect=classify), \
+         patch("scanner.github_scanner.DeferredStats", side_effect=make_deferred):
+        repos = scanner.scan_recent_repos(limit=5)
+
+    # The pending repo does not hold up the others and is classified with real stats
+    assert [r["full_name"] for r in repos] == ["owner/fast", "owner/slow"]
+    assert repos[1]["analysis"]["reasons"] == [4.0]
+
+
+def test_scanner_does_not_defer_failed_stats():
+    scanner = GitHubScanner("mock_token", workers=1)
+    search = MagicMock(status_code=200)
+    search.json.return_value = {"items": [{"full_name": "owner/broken", "name": "broken"}]}
+
+    def get(url, *args, **kwargs):
+        if "/search/" in url:
+            return search
+        return MagicMock(status_code=500 if url.endswith("/stats/participation") else 404)
+
+    with patch.object(scanner.client, "get", side_effect=get), \
+         patch.object(scanner, "validate_repo_basic", return_value=True), \
+         patch.object(DeferredStats, "register") as register, \
+         patch.object(scanner.classifier, "classify_repo",
+                      return_value={"is_real_project": True, "score": 80, "reasons": []}) as classify:
+        scanner.scan_recent_repos(limit=5)
+
+    register.assert_not_called()
+    assert classify.call_args[0][1]["commit_frequency_score"] == 0.0
@@ -0,0 +1,94 @@
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.github_scanner import GitHubScanner
+from scanner.insights_collector import InsightsCollector
+from scanner.rust_bridge import RustScanner, stream_repos
+
+from .fake_github import FakeGitHub
+
+
+def test_insights_collected_from_fake_server(fake_github):
+    fake_github.add_repo("octo/widget", contributors=12, weekly_commits=[1] * 48 + [3, 3, 3, 3],
+                         health_percentage=80, merged_prs=3, closed_prs=4)
+    collector = InsightsCollector("token", api_url=fake_github.api_url)
+
+    insights = collector.collect_insights("octo/widget")
+
+    assert insights["contributors_count"] == 12
+    assert insights["commit_frequency_score"] == 6.0
+    assert insights["health_percentage"] == 80
+    assert insights["pr_merge_ratio"] == 0.75
+    assert len(insights["top_contributors"]) == 5
+    assert insights["open_issues_count"] == 12
+    assert insights["last_commit_date"]
+
+
+def test_pending_stats_answer_202_first():
+    with FakeGitHub(stats_pending=1) as server:
+        server.add_repo("octo/widget")
+        collector = InsightsCollector("token", api_url=server.api_url)
+
+        assert collector.collect_insights("octo/widget")["commit_frequency_score"] is None
+        assert collector.refresh_commit_activity("octo/widget") == 6.0
+
+
+def test_etag_hits_are_free(fake_github, tmp_path):
+    fake_github.add_repo("octo/widget")
+    collector = InsightsCollector("token", cache_dir=str(tmp_path), api_url=fake_github.api_url)
+
+    collector.collect_insights("octo/widget")
+    spent = fake_github.limits["core"] - fake_github.remaining["core"]
+    collector.collect_insights("octo/widget")
+
+    assert spent == 7
+    assert fake_github.limits["core"] - fake_github.remaining["core"] == spent
+    # 304s are free on the server, so they must not eat into the client's budget either
+    assert collector.client.remaining_budget("core") == fake_github.remaining["core"]
+
+
+def test_streaming_scan_pages_through_fake_search(fake_github):
+    fake_github.add_repos(30)
+    scanner = GitHubScanner("token", api_url=fake_github.api_url, workers=3)
+
+    results = scanner.scan_recent_repos(limit=4, stream=True)
+
+    assert [r["full_name"] for r in results] == [f"fixture/project-{i:03d}" for i in range(4)]
+    assert all(r["insights"]["contributors_count"] == 12 for r in results)
+    assert fake_github.count("/search/repositories") >= 1
+
+
+def test_concurrent_scan_overlaps_requests():
+    # Throughput regression guard: with several workers, candidates must be
+    # collected concurrently. One repo's insights already fan out over several
+    # requests, so the peak must also beat the single-worker peak.
+    peaks = {}
+    for workers in (1, 4):
+        with FakeGitHub(latency=0.05) as server:
+            server.add_repos(8)
+            scanner = GitHubScanner("token", api_url=server.api_url, workers=workers)
+            assert len(scanner.scan_recent_repos(limit=8)) == 8
+            peaks[workers] = server.max_in_flight
+
+    assert peaks[4] > 1
+    assert peaks[4] > peaks[1]
+
+
+def test_rust_bridge_passes_api_url_to_binaries(fake_github):
+    fake_github.add_repos(3)
+    scanner = RustScanner("token", api_url=fake_github.api_url)
+    # Stands in for the Rust binary: searches GITHUB_API_URL and prints NDJSON
+    script = (
+        "import json, os, urllib.request\n"
+        "url = os.environ['GITHUB_API_URL'] + '/search/repositories?q=stars:10..100&per_page=20'\n"
+        "for repo in json.load(urllib.request.urlopen(url))['items']:\n"
+        "    print(json.dumps(repo), flush=True)\n"
+    )
+
+    repos = list(stream_repos([sys.executable, "-c", script], env=scanner._env()))
+
+    assert [r["full_name"] for r in repos] == [f"fixture/project-{i:03d}" for i in range(3)]
+    assert fake_github.count("/search/repositories") == 1
@@ -0,0 +1,130 @@
+import sys
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.analysis_context import RepoAnalysisContext
+from scanner.gem_analyzer import GemAnalyzer
+
+NOW = datetime.now(timezone.utc)
+
+
+class FakeRepo:
+    """Minimal PyGithub Repository stand-in that counts API calls."""
+
+    def __init__(self, full_name="owner/gem"):
+        self.calls = Counter()
+        self.full_name = full_name
+        self.stargazers_count = 120
+        self.forks_count = 8
+        self.language = "Python"
+        self.license = SimpleNamespace(name="MIT License")
+        self.open_issues_count = 3
+        self.owner = SimpleNamespace(login="owner")
+        self.created_at = NOW - timedelta(days=400)
+        self.updated_at = NOW - timedelta(days=2)
+        self.issues = [
+            SimpleNamespace(number=n, comments=1 if n % 2 else 0, created_at=NOW - timedelta(days=30 + n),
+                            get_comments=self._per_issue_comments)
+            for n in range(1, 13)
+        ]
+
+    def _per_issue_comments(self):
+        self.calls["issue_comments"] += 1
+        return []
+
+    def get_commits(self):
+        self.calls["commits"] += 1
+        author = SimpleNamespace(date=NOW - timedelta(days=3), name="alice")
+        return [SimpleNamespace(commit=SimpleNamespace(author=author, message="Add streaming parser support"))] * 20
+
+    def get_readme(self):
+        self.calls["readme"] += 1
+        return SimpleNamespace(decoded_content=b"# Gem\n" + b"x" * 2500)
+
+    def get_contents(self, path):
+        self.calls[f"contents:{path}"] += 1
+        if path == "":
+            return [SimpleNamespace(name=n, type=t) for n, t in
+                    [("src", "dir"), ("tests", "dir"), ("docs", "dir"), ("pyproject.toml", "file")]]
+        if path == "docs":
+            return [SimpleNamespace(name=n, type="file") for n in ("a.md", "b.md", "c.md")]
+        raise Exception("404 Not Found")
+
+    def get_issues(self, state):
+        self.calls[f"issues:{state}"] += 1
+        return self.issues if state == "closed" else []
+
+    def get_issues_comments(self, sort, direction, since):
+        self.calls["bulk_comments"] += 1
+        return [
+            SimpleNamespace(issue_url=f"https://api.github.com/repos/owner/gem/issues/{i.number}",
+                            created_at=i.created_at + timedelta(days=2))
+            for i in self.issues if i.comments
+        ]
+
+    def get_pulls(self, state):
+        self.calls["pulls"] += 1
+        return [SimpleNamespace(merged=True, user=SimpleNamespace(login="bob"))] * 4
+
+    def get_releases(self):
+        self.calls["releases"] += 1
+        return [SimpleNamespace(tag_name="v1.2.0", created_at=NOW - timedelta(days=10))] * 3
+
+
+class FakeGithub:
+    def __init__(self):
+        self.repos = {}
+
+    def get_repo(self, full_name):
+        return self.repos.setdefault(full_name, FakeRepo(full_name))
+
+
+def test_each_resource_is_fetched_once():
+    client = FakeGithub()
+    analyzer = GemAnalyzer(client)
+
+    result = analyzer.analyze_repo("owner/gem")
+    calls = client.repos["owner/gem"].calls
+
+    assert result["recommendation"] in ("APPROVE", "REVIEW", "REJECT")
+    assert calls["contents:"] == 1
+    assert calls["readme"] == 1
+    assert calls["bulk_comments"] == 1
+    assert calls["issue_comments"] == 0
+    assert result["data"]["engagement"]["avg_response_days"] == 2
+
+
+def test_context_shared_with_red_flag_check():
+    repo = FakeRepo()
+    analyzer = GemAnalyzer(FakeGithub())
+    ctx = analyzer.context_for(repo)
+
+    flagged, _ = analyzer.has_red_flags(ctx)
+    analyzer.analyze_repo(repo.full_name, context=ctx)
+
+    assert flagged is False
+    assert repo.calls["readme"] == 1
+
+
+def test_missing_bulk_comments_fall_back_per_issue():
+    repo = FakeRepo()
+    repo.get_issues_comments = lambda **kwargs: []
+    ctx = RepoAnalysisContext(repo)
+
+    assert ctx.first_comment_times(repo.issues[:10]) == {}
+    assert repo.calls["issue_comments"] == 5
+
+
+def test_analyze_repos_keeps_input_order():
+    analyzer = GemAnalyzer(FakeGithub())
+    names = [f"owner/gem{i}" for i in range(5)]
+
+    results = analyzer.analyze_repos(names, max_workers=3)
+
+    assert list(results) == names
+    assert all(r["repo"] == name for name, r in results.items())
@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.github_client import GitHubClient
+from scanner.github_scanner import GitHubScanner
+from scanner.response_cache import ResponseCache
+
+
+class TestGitHubClient:
+
+    @pytest.fixture
+    def client(self):
+        return GitHubClient(token="mock_token", pool_maxsize=16)
+
+    def test_resolves_relative_paths(self, client):
+        assert client.url("/repos/user/repo") == "https://api.github.com/repos/user/repo"
+        assert client.url("repos/user/repo") == "https://api.github.com/repos/user/repo"
+        assert client.url("https://example.com/x") == "https://example.com/x"
+
+    def test_session_is_pooled_and_authenticated(self, client):
+        adapter = client.session.get_adapter("https://api.github.com")
+        assert adapter._pool_maxsize == 16
+        assert client.session.headers["Authorization"] == "token mock_token"
+
+    def test_request_uses_session_with_default_timeout(self, client):
+        with patch.object(client.session, "request", return_value=MagicMock(status_code=200)) as mock_request:
+            client.get("/rate_limit")
+
+        mock_request.assert_called_once_with(
+            "GET", "https://api.github.com/rate_limit", headers=None, timeout=(5.0, 30.0)
+        )
+
+    def test_conditional_request_served_from_cache(self, tmp_path):
+        client = GitHubClient(token="mock_token", cache=ResponseCache(str(tmp_path)))
+
+        fresh = MagicMock(status_code=200, content=b'{"stargazers_count": 42}',
+                          headers={"ETag": '"abc"', "Content-Type": "application/json"})
+        not_modified = MagicMock(status_code=304, headers={})
+
+        with patch.object(client.session, "request", side_effect=[fresh, not_modified]) as mock_request:
+            first = client.get("/repos/user/repo")
+            second = client.get("/repos/user/repo")
+
+        assert first is fresh
+        assert second.status_code == 200
+        assert second.json() == {"stargazers_count": 42}
+        assert second.headers["X-From-Cache"] == "1"
+        assert mock_request.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+    def test_cache_entries_are_scoped_by_token(self, tmp_path):
+        cache = ResponseCache(str(tmp_path))
+        response = MagicMock(status_code=200, content=b"[]", headers={"ETag": '"v1"'})
+        cache.store("https://api.github.com/repos/user/repo", "token-a", response)
+
+        assert cache.get("https://api.github.com/repos/user/repo", "token-a")["etag"] == '"v1"'
+        assert cache.get("https://api.github.com/repos/user/repo", "token-b") is None
+
+    def test_cache_evicts_old_and_excess_entries(self, tmp_path):
+        cache = ResponseCache(str(tmp_path), max_age_days=1, max_entries=2, prune_every=1000)
+        response = MagicMock(status_code=200, content=b"[]", headers={"ETag": '"v1"'})
+        urls = [f"https://api.github.com/repos/user/repo{i}" for i in range(4)]
+        for url in urls:
+            cache.store(url, "token", response)
+
+        now = time.time()
+        ages = [3 * 86400, 300, 200, 100]
+        for url, age in zip(urls, ages):
+            os.utime(cache._path(url, "token"), (now - age, now - age))
+        # Reading an entry counts as use
+        cache.get(urls[1], "token")
+
+        assert cache.prune() == 2
+        assert [cache.get(url, "token") is not None for url in urls] == [False, True, False, True]
+
+    def test_scanner_shares_client_with_insights_collector(self):
+        client = GitHubClient(token="mock_token")
+        scanner = GitHubScanner(token="mock_token", client=client)
+
+        assert scanner.client is client
+        assert scanner.insights_collector.client is client
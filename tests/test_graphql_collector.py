@@ -0,0 +1,139 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.github_scanner import GitHubScanner
+from scanner.graphql_collector import GraphQLInsightsCollector
+
+
+def make_node(full_name):
+    return {
+        "nameWithOwner": full_name,
+        "description": "A real project",
+        "licenseInfo": {"spdxId": "MIT", "name": "MIT License"},
+        "openIssues": {"totalCount": 3},
+        "openPullRequests": {"totalCount": 2},
+        "closedPullRequests": {"nodes": [{"merged": True}, {"merged": True}, {"merged": False}, {"merged": True}]},
+        "codeOfConduct": None,
+        "contributingGuidelines": {"resourcePath": "/CONTRIBUTING.md"},
+        "issueTemplates": [],
+        "pullRequestTemplates": [],
+        "rootFiles": {"entries": [
+            {"name": "src", "type": "tree", "object": {}},
+            {"name": "README.md", "type": "blob", "object": {"byteSize": 1500}},
+        ]},
+        "defaultBranchRef": {
+            "target": {
+                "committedDate": "2024-05-01T12:00:00Z",
+                "recent": {"totalCount": 9},
+                "sample": {"nodes": [
+                    {"author": {"user": {"login": "alice", "avatarUrl": "a.png", "url": "https://github.com/alice"}}},
+                    {"author": {"user": {"login": "bob", "avatarUrl": "b.png", "url": "https://github.com/bob"}}},
+                    {"author": {"user": {"login": "alice", "avatarUrl": "a.png", "url": "https://github.com/alice"}}},
+                    {"author": {"user": None}},
+                ]}
+            }
+        }
+    }
+
+
+class TestGraphQLInsightsCollector:
+
+    @pytest.fixture
+    def collector(self):
+        return GraphQLInsightsCollector(token="mock_token", batch_size=2)
+
+    def test_build_query_aliases_each_repo(self, collector):
+        query = collector.build_query(["owner/one", "owner/two"])
+
+        assert 'r0: repository(owner: "owner", name: "one")' in query
+        assert 'r1: repository(owner: "owner", name: "two")' in query
+
+    def test_to_insights_matches_rest_structure(self, collector):
+        insights = collector.to_insights(make_node("owner/one"))
+
+        assert insights == {
+            "contributors_count": 2,
+            "commit_frequency_score": 4.5,
+            "health_percentage": 57,
+            "pr_merge_ratio": 0.75,
+            "top_contributors": [
+                {"login": "alice", "avatar_url": "a.png", "html_url": "https://github.com/alice", "contributions": 2},
+                {"login": "bob", "avatar_url": "b.png", "html_url": "https://github.com/bob", "contributions": 1},
+            ],
+            "last_commit_date": "2024-05-01T12:00:00Z",
+            "open_issues_count": 5,
+        }
+
+    def test_readme_names_match_case_insensitively(self, collector):
+        node = make_node("owner/one")
+        node["rootFiles"]["entries"] = [
+            {"name": "readme.zh-CN.md", "type": "blob", "object": {"byteSize": 900}},
+            {"name": "Readme.markdown", "type": "blob", "object": {"byteSize": 1200}},
+            {"name": "readme", "type": "blob", "object": {"byteSize": 40}},
+        ]
+        assert collector.readme_size(node) == 1200
+
+        node["rootFiles"]["entries"] = [{"name": "README", "type": "tree", "object": {}}]
+        assert collector.readme_size(node) == 0
+
+    def test_fetch_batch_chunks_requests(self, collector):
+        def post(path, json):
+            count = json["query"].count(": repository(")
+            response = MagicMock(status_code=200)
+            response.json.return_value = {"data": {f"r{i}": make_node(f"owner/{i}") for i in range(count)}}
+            return response
+
+        with patch.object(collector.client, "post", side_effect=post) as mock_post:
+            nodes = collector.fetch_batch(["owner/a", "owner/b", "owner/c"])
+
+        assert mock_post.call_count == 2
+        assert sorted(nodes) == ["owner/a", "owner/b", "owner/c"]
+
+    def test_scanner_prefetch_feeds_readme_check(self):
+        scanner = GitHubScanner(token="mock_token", use_graphql=True)
+
+        with patch.object(scanner.graphql_collector, "fetch_batch", return_value={"owner/one": make_node("owner/one")}), \
+             patch.object(scanner.client, "get") as mock_get:
+            insights = scanner.prefetch_insights(["owner/one", "owner/missing"])
+            assert scanner._has_substantial_readme("owner/one") is True
+            mock_get.assert_not_called()
+
+        assert list(insights) == ["owner/one"]
+
+    def test_streaming_scan_prefetches_each_window(self):
+        scanner = GitHubScanner(token="mock_token", use_graphql=True, workers=2)
+        scanner.graphql_collector.batch_size = 2
+        repos = [{"full_name": f"owner/{i}", "name": str(i)} for i in range(3)]
+
+        def fetch_batch(names):
+            return {name: make_node(name) for name in names}
+
+        with patch.object(scanner, "iter_search_results", return_value=(repo for repo in repos)), \
+             patch.object(scanner, "validate_repo_basic", return_value=True), \
+             patch.object(scanner.graphql_collector, "fetch_batch", side_effect=fetch_batch) as mock_fetch, \
+             patch.object(scanner.insights_collector, "collect_insights") as mock_rest, \
+             patch.object(scanner.classifier, "classify_repo",
+                          return_value={"is_real_project": True, "score": 80, "reasons": []}):
+            results = scanner.scan_recent_repos(limit=3, stream=True)
+
+        assert [r["full_name"] for r in results] == ["owner/0", "owner/1", "owner/2"]
+        assert [c.args[0] for c in mock_fetch.call_args_list] == [["owner/0", "owner/1"], ["owner/2"]]
+        mock_rest.assert_not_called()
+
+    def test_missing_root_readme_falls_back_to_rest(self):
+        scanner = GitHubScanner(token="mock_token", use_graphql=True)
+        node = make_node("owner/one")
+        node["rootFiles"]["entries"] = []
+
+        with patch.object(scanner.graphql_collector, "fetch_batch", return_value={"owner/one": node}), \
+             patch.object(scanner.client, "get", return_value=MagicMock(status_code=404)) as mock_get:
+            scanner.prefetch_insights(["owner/one"])
+            assert scanner._has_substantial_readme("owner/one") is False
+
+        mock_get.assert_called_once()
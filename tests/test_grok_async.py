@@ -0,0 +1,124 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.grok_reviewer import GrokReviewer
+from scanner.review_cache import ReviewCache
+
+from .fake_models import FakeModels
+
+pytest.importorskip("httpx")
+
+
+class FakeRepo:
+    description = "A widget"
+    language = "Python"
+    stargazers_count = 42
+    forks_count = 3
+    license = None
+    has_wiki = False
+
+    def __init__(self, name):
+        self.full_name = f"octo/{name}"
+        self.name = name
+
+    def get_topics(self):
+        return ["tools"]
+
+
+@pytest.fixture
+def reviewer(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    return GrokReviewer()
+
+
+def batch(count):
+    return [(FakeRepo(f"widget-{i}"), f"# widget-{i}", []) for i in range(count)]
+
+
+def test_review_many_overlaps_requests_and_keeps_order(reviewer):
+    with FakeModels(latency=0.2) as server:
+        reviewer.api_endpoint = server.endpoint
+        started = time.monotonic()
+        results = asyncio.run(reviewer.review_many(batch(8), concurrency=4))
+        elapsed = time.monotonic() - started
+
+    assert [r["architecture"] for r in results] == [8] * 8
+    assert server.max_in_flight == 4
+    # Eight 0.2s calls, four at a time
+    assert elapsed < 1.2
+
+
+def test_results_follow_input_order(reviewer):
+    def respond(prompt):
+        index = int(prompt.split("Repository: widget-")[1].split("\n")[0])
+        # Later repos answer first
+        time.sleep((5 - index) * 0.05)
+        score = index + 1
+        return '{"architecture_score": %d, "documentation_score": 5, "testing_score": 5, ' \
+               '"practices_score": 5, "innovation_score": 5}' % score
+
+    with FakeModels(respond=respond) as server:
+        reviewer.api_endpoint = server.endpoint
+        results = asyncio.run(reviewer.review_many(batch(5)))
+
+    assert [r["architecture"] for r in results] == [1, 2, 3, 4, 5]
+
+
+def test_throttled_requests_wait_for_retry_after(reviewer):
+    with FakeModels(throttled=2, retry_after=0.3) as server:
+        reviewer.api_endpoint = server.endpoint
+        started = time.monotonic()
+        results = asyncio.run(reviewer.review_many(batch(2)))
+
+    assert all(r["architecture"] == 8 for r in results)
+    assert time.monotonic() - started >= 0.3
+    assert len(server.prompts) == 2
+
+
+def test_long_retry_after_gives_up_instead_of_stalling(reviewer):
+    with FakeModels(throttled=1, retry_after=3600) as server:
+        reviewer.api_endpoint = server.endpoint
+        started = time.monotonic()
+        results = asyncio.run(reviewer.review_many(batch(1)))
+
+    assert results == [None]
+    assert time.monotonic() - started < 5
+    assert server.prompts == []
+
+
+def test_one_failing_repo_does_not_sink_the_batch(reviewer, monkeypatch):
+    review_async = reviewer._review_async
+
+    async def review(client, semaphore, repo, *args):
+        if repo.name == "widget-1":
+            raise RuntimeError("boom")
+        return await review_async(client, semaphore, repo, *args)
+
+    monkeypatch.setattr(reviewer, "_review_async", review)
+    with FakeModels() as server:
+        reviewer.api_endpoint = server.endpoint
+        results = asyncio.run(reviewer.review_many(batch(3)))
+
+    assert results[1] is None
+    assert [results[0]["architecture"], results[2]["architecture"]] == [8, 8]
+
+
+def test_review_many_goes_through_the_review_cache(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    reviewer = GrokReviewer(review_cache=ReviewCache(":memory:"))
+    shas = ["sha-0", "sha-1", "sha-2"]
+
+    with FakeModels() as server:
+        reviewer.api_endpoint = server.endpoint
+        asyncio.run(reviewer.review_many(batch(3), head_shas=shas))
+        results = asyncio.run(reviewer.review_many(batch(3), head_shas=shas))
+
+    assert [r["architecture"] for r in results] == [8] * 3
+    assert len(server.prompts) == 3
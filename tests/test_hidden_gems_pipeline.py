@@ -0,0 +1,82 @@
+import base64
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# Add src and scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+pytest.importorskip("github")
+
+from discover_hidden_gems import HiddenGemsPipeline
+from scanner.analysis_context import RepoAnalysisContext
+
+
+@pytest.fixture
+def pipeline():
+    with patch("discover_hidden_gems.GrokReviewer"), patch("discover_hidden_gems.MarkdownWriter"):
+        yield HiddenGemsPipeline("mock_token")
+
+
+def test_parallel_analysis_matches_sequential_order(pipeline):
+    recommendations = ["REVIEW", "APPROVE", "REJECT", "APPROVE", "APPROVE", "APPROVE", "APPROVE", "APPROVE"]
+    candidates = [{"full_name": f"owner/r{i}"} for i in range(len(recommendations))]
+
+    def analyze(name, stop=None):
+        index = int(name.rsplit("r", 1)[-1])
+        # Earlier candidates finish last so completion order differs from input order
+        time.sleep(0.01 * (len(recommendations) - index))
+        return {"repo": name, "recommendation": recommendations[index]}
+
+    with patch.object(pipeline, "analyze_candidate", side_effect=analyze) as mock_analyze:
+        approved, review = pipeline.analyze_candidates(candidates, max_repos=2, parallelism=3)
+
+    assert [a["repo"] for a in approved] == ["owner/r1", "owner/r3"]
+    assert [a["repo"] for a in review] == ["owner/r0"]
+    # Nothing is started beyond the window that reached max_repos
+    assert mock_analyze.call_count < len(candidates)
+
+
+class FakeSamplingRepo:
+    def __init__(self):
+        self.calls = []
+        self.blobs = {"sha-main": "print('hi')\n", "sha-util": "def util():\n    pass\n"}
+
+    def get_commits(self):
+        return [SimpleNamespace(sha=f"c{i}", parents=[SimpleNamespace(sha=f"c{i + 1}")]) for i in range(10)]
+
+    def compare(self, base, head):
+        self.calls.append(("compare", base, head))
+        return SimpleNamespace(files=[SimpleNamespace(filename=n) for n in
+                                      ("README.md", "src/big.py", "src/main.py", "src/gone.py", "src/util.py")])
+
+    def get_git_tree(self, sha, recursive):
+        self.calls.append(("tree", sha))
+        return SimpleNamespace(tree=[
+            SimpleNamespace(path="README.md", type="blob", size=100, sha="sha-readme"),
+            SimpleNamespace(path="src/big.py", type="blob", size=50000, sha="sha-big"),
+            SimpleNamespace(path="src/main.py", type="blob", size=12, sha="sha-main"),
+            SimpleNamespace(path="src/util.py", type="blob", size=21, sha="sha-util"),
+        ])
+
+    def get_git_blob(self, sha):
+        self.calls.append(("blob", sha))
+        return SimpleNamespace(content=base64.b64encode(self.blobs[sha].encode()).decode())
+
+
+def test_recent_files_sampled_from_compare_and_tree(pipeline):
+    repo = FakeSamplingRepo()
+
+    files = pipeline._get_recent_files(RepoAnalysisContext(repo))
+
+    assert [f["path"] for f in files] == ["src/main.py", "src/util.py"]
+    assert files[0]["content"] == "print('hi')\n"
+    assert files[1]["language"] == "python"
+    assert ("compare", "c10", "c0") in repo.calls
+    # The oversized file is never downloaded
+    assert sorted(c[1] for c in repo.calls if c[0] == "blob") == ["sha-main", "sha-util"]
@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.insights_collector import METRIC_FALLBACKS, InsightsCollector
+from scanner.insights_store import InsightsStore, METRIC_TTLS
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+METRICS = {
+    "_get_contributors_count": 3,
+    "_get_commit_activity": 7.5,
+    "_get_community_health": 80,
+    "_get_pr_merge_ratio": 0.5,
+    "_get_top_contributors": [{"login": "user1"}],
+    "_get_last_commit_date": "2024-01-01T00:00:00Z",
+    "_get_open_issues_count": 4,
+}
+
+
+class TestInsightsStore:
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def store(self, tmp_path, clock):
+        store = InsightsStore(str(tmp_path / "insights.sqlite"), clock=clock.time)
+        yield store
+        store.close()
+
+    def test_metrics_expire_on_their_own_ttl(self, store, clock):
+        store.put("owner/repo", {"last_commit_date": "2024-01-01", "health_percentage": 80, "pr_merge_ratio": None})
+
+        assert store.get_fresh("owner/repo") == {"last_commit_date": "2024-01-01", "health_percentage": 80}
+
+        clock.now += METRIC_TTLS["last_commit_date"] + 1
+        assert store.get_fresh("owner/repo") == {"health_percentage": 80}
+
+        clock.now += METRIC_TTLS["health_percentage"]
+        assert store.get_fresh("owner/repo") == {}
+
+    def test_persists_across_instances(self, tmp_path, clock):
+        path = str(tmp_path / "insights.sqlite")
+        InsightsStore(path, clock=clock.time).put("owner/repo", {"top_contributors": [{"login": "a"}]})
+
+        reopened = InsightsStore(path, clock=clock.time)
+        assert reopened.get_fresh("owner/repo", ["top_contributors"]) == {"top_contributors": [{"login": "a"}]}
+
+    def test_collector_only_fetches_stale_metrics(self, store, clock):
+        collector = InsightsCollector("mock_token", store=store)
+        mocks = {name: patch.object(collector, name, return_value=value) for name, value in METRICS.items()}
+        started = {name: p.start() for name, p in mocks.items()}
+        try:
+            first = collector.collect_insights("owner/repo")
+            clock.now += METRIC_TTLS["last_commit_date"] + 1
+            second = collector.collect_insights("owner/repo")
+        finally:
+            for p in mocks.values():
+                p.stop()
+
+        assert first == second
+        assert list(second) == list(collector._metric_fetchers())
+        assert started["_get_last_commit_date"].call_count == 2
+        assert started["_get_community_health"].call_count == 1
+
+    def test_failed_fetches_are_not_stored(self, store):
+        collector = InsightsCollector("mock_token", store=store, max_workers=1)
+        server_error = MagicMock(status_code=502, headers={})
+
+        with patch.object(collector.client, "get", return_value=server_error):
+            insights = collector.collect_insights("owner/repo")
+
+        # Callers still get the usual fallbacks, but none of them is cached
+        assert insights == METRIC_FALLBACKS
+        assert store.get_fresh("owner/repo") == {}
+
+        with patch.object(collector.client, "get", side_effect=ConnectionError("reset")):
+            collector.collect_insights("owner/repo")
+        assert store.get_fresh("owner/repo") == {}
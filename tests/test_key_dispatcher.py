@@ -0,0 +1,155 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.key_dispatcher import KeyDispatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rpm_bucket_refills_over_the_minute():
+    clock = FakeClock()
+    dispatcher = KeyDispatcher(["a"], rpm=2, clock=clock)
+
+    for _ in range(2):
+        dispatcher.release(dispatcher.acquire())
+
+    assert dispatcher.wait_time() == pytest.approx(30.0)
+    clock.now += 30
+    assert dispatcher.wait_time() == 0
+
+
+def test_tpm_bucket_limits_large_prompts():
+    clock = FakeClock()
+    dispatcher = KeyDispatcher(["a"], rpm=100, tpm=6000, clock=clock)
+
+    dispatcher.release(dispatcher.acquire(tokens=5000))
+
+    assert dispatcher.wait_time(tokens=2000) == pytest.approx(10.0)
+    assert dispatcher.wait_time(tokens=1000) == 0
+
+
+def test_busy_and_failed_keys_are_skipped():
+    clock = FakeClock()
+    dispatcher = KeyDispatcher(["a", "b"], cooldown=5, clock=clock)
+
+    first = dispatcher.acquire()
+    second = dispatcher.acquire()
+    assert {first, second} == {0, 1}
+    assert dispatcher.wait_time() == float("inf")
+
+    dispatcher.release(first, failed=True)
+    dispatcher.release(second)
+    # The failed key rests; the healthy one takes the next request
+    assert dispatcher.acquire() == second
+    dispatcher.release(second, retry_after=20)
+    assert dispatcher.wait_time() == pytest.approx(5.0)
+
+
+def test_retry_after_is_capped_at_max_cooldown():
+    clock = FakeClock()
+    dispatcher = KeyDispatcher(["a"], max_cooldown=60, clock=clock)
+
+    dispatcher.release(dispatcher.acquire(), failed=True, retry_after=6 * 3600)
+
+    assert dispatcher.wait_time() == pytest.approx(60.0)
+
+
+class FakeModels:
+    def __init__(self, key, log, fail=False):
+        self.key = key
+        self.log = log
+        self.fail = fail
+
+    def generate_content(self, model, contents, config):
+        self.log.append(self.key)
+        if self.fail:
+            raise RuntimeError("quota exhausted")
+        time.sleep(0.2)
+        scores = {f"{dim}_score": 7 for dim in ("architecture", "documentation", "testing", "practices", "innovation")}
+        return type("Response", (), {"text": json.dumps(scores)})()
+
+
+class FakeClient:
+    def __init__(self, models):
+        self.models = models
+
+
+class FakeRepo:
+    description = "A widget"
+    language = "Python"
+    stargazers_count = 42
+
+    def __init__(self, name):
+        self.full_name = f"octo/{name}"
+        self.name = name
+
+
+@pytest.fixture
+def gemini_reviewer(monkeypatch):
+    pytest.importorskip("google.genai")
+    from scanner.gemini_reviewer import GeminiReviewer
+
+    monkeypatch.setenv("GOOGLE_API_KEY", "key-1")
+    monkeypatch.setenv("GOOGLE_API_KEY_2", "key-2")
+    monkeypatch.setenv("GOOGLE_API_KEY_3", "key-3")
+    for i in (4, 5):
+        monkeypatch.delenv(f"GOOGLE_API_KEY_{i}", raising=False)
+    return GeminiReviewer()
+
+
+def test_review_many_uses_every_key_at_once(gemini_reviewer):
+    log = []
+    gemini_reviewer.clients = [FakeClient(FakeModels(index, log)) for index in range(3)]
+    repos = [(FakeRepo(f"widget-{i}"), "# Widget") for i in range(6)]
+
+    started = time.monotonic()
+    results = gemini_reviewer.review_many(repos)
+    elapsed = time.monotonic() - started
+
+    assert [r["architecture"] for r in results] == [7] * 6
+    assert set(log) == {0, 1, 2}
+    # Six 0.2s calls on three keys: two rounds, not six
+    assert elapsed < 0.9
+
+
+def test_retry_moves_to_a_healthy_key(gemini_reviewer):
+    log = []
+    gemini_reviewer.clients = [FakeClient(FakeModels(index, log, fail=index == 0)) for index in range(3)]
+
+    started = time.monotonic()
+    results = gemini_reviewer.review_many([(FakeRepo(f"widget-{i}"), "# Widget") for i in range(4)])
+
+    assert all(r["architecture"] == 7 for r in results)
+    # No backoff sleep: the failing key rests while the others carry on
+    assert time.monotonic() - started < 1.5
+    assert log.count(0) == 1
+
+
+def test_one_failing_repo_does_not_sink_the_batch(gemini_reviewer):
+    log = []
+    gemini_reviewer.clients = [FakeClient(FakeModels(index, log)) for index in range(3)]
+    review_repository = gemini_reviewer.review_repository
+
+    def review(repo, readme_content, recent_files, head_sha=None):
+        if repo.name == "widget-1":
+            raise RuntimeError("boom")
+        return review_repository(repo, readme_content, recent_files, head_sha)
+
+    gemini_reviewer.review_repository = review
+    results = gemini_reviewer.review_many([(FakeRepo(f"widget-{i}"), "# Widget") for i in range(3)])
+
+    assert results[1] is None
+    assert [results[0]["architecture"], results[2]["architecture"]] == [7, 7]
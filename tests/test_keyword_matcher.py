@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.keyword_matcher import (
+    CLASSIFIER_NEGATIVE_KEYWORDS, COMMIT_NEGATIVE_KEYWORDS, KeywordMatcher, SCANNER_EXCLUDE_KEYWORDS
+)
+from scanner.repo_classifier import RepoClassifier
+
+
+def test_finds_all_hits_in_one_pass():
+    matcher = KeywordMatcher(["demo", "test", "fix typo"])
+
+    assert matcher.hits("Demo app with tests, fix typo in docs") == {"demo", "test", "fix typo"}
+    assert matcher.flags("a demo") == [True, False, False]
+
+
+def test_matches_start_at_word_boundary():
+    assert SCANNER_EXCLUDE_KEYWORDS.search("testing framework")
+    assert SCANNER_EXCLUDE_KEYWORDS.search("collection of examples")
+    assert not SCANNER_EXCLUDE_KEYWORDS.search("the latest attestation tooling")
+    assert not SCANNER_EXCLUDE_KEYWORDS.search("")
+
+
+def test_underscores_dashes_and_camel_case_separate_words():
+    for name in ("foo_tutorial", "flask_tutorial", "foo-demo", "react_demo", "my_test_repo", "FooExample"):
+        assert SCANNER_EXCLUDE_KEYWORDS.search(name), name
+        assert any(CLASSIFIER_NEGATIVE_KEYWORDS.flags(name)), name
+    assert COMMIT_NEGATIVE_KEYWORDS.hits("WIP: add_test for parser") == {"wip", "test"}
+    assert not SCANNER_EXCLUDE_KEYWORDS.search("Latest_contest")
+
+
+def test_classifier_uses_shared_matcher():
+    result = RepoClassifier().classify_repo(
+        {"name": "latest-proxy", "description": "A tutorial and demo for a proxy"}, {}
+    )
+
+    keyword_reasons = [r for r in result["reasons"] if r.startswith("Contains negative keyword")]
+    assert keyword_reasons == ["Contains negative keyword: demo", "Contains negative keyword: tutorial"]
@@ -0,0 +1,108 @@
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.gem_analyzer import GemAnalyzer
+from scanner.local_git_backend import LocalGitBackend
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def git(cwd, *args):
+    env = {**os.environ, "GIT_AUTHOR_NAME": "Alice", "GIT_AUTHOR_EMAIL": "alice@example.com",
+           "GIT_COMMITTER_NAME": "Alice", "GIT_COMMITTER_EMAIL": "alice@example.com"}
+    subprocess.run(["git", *args], cwd=cwd, env=env, check=True, capture_output=True)
+
+
+@pytest.fixture
+def origin(tmp_path):
+    """A small upstream repo served over file:// as owner/gem."""
+    repo = tmp_path / "origin" / "owner" / "gem"
+    repo.mkdir(parents=True)
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "config", "uploadpack.allowFilter", "true")
+
+    (repo / "README.md").write_text("# Gem\n" + "Useful tool. " * 50)
+    (repo / "src").mkdir()
+    (repo / "src" / "main.py").write_text("print('hello')\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "Add initial command line tool")
+
+    (repo / "tests").mkdir()
+    (repo / "tests" / "test_main.py").write_text("def test_main():\n    assert True\n")
+    (repo / "src" / "big.py").write_text("x = 1\n" * 5000)
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "Add tests and generated tables")
+    return tmp_path / "origin"
+
+
+@pytest.fixture
+def backend(tmp_path, origin):
+    return LocalGitBackend(
+        cache_dir=str(tmp_path / "clones"), max_repos=2,
+        url_template=f"file://{origin}/{{full_name}}"
+    )
+
+
+def make_repo(full_name="owner/gem"):
+    return SimpleNamespace(full_name=full_name, language="Python", license=None)
+
+
+def test_context_reads_commits_and_structure_locally(backend):
+    ctx = backend.context_for(make_repo())
+
+    commits = ctx.commits()
+    assert [c.commit.message for c in commits] == ["Add tests and generated tables", "Add initial command line tool"]
+    assert commits[0].commit.author.name == "Alice"
+    assert commits[0].parents[0].sha == commits[1].sha
+
+    names = {e.name: e.type for e in ctx.contents("")}
+    assert names == {"README.md": "file", "src": "dir", "tests": "dir"}
+    assert ctx.readme().startswith(b"# Gem")
+    with pytest.raises(FileNotFoundError):
+        ctx.contents(".github/workflows")
+
+
+def test_large_blobs_are_filtered_out_of_samples(backend):
+    ctx = backend.context_for(make_repo())
+
+    blobs = {e.path: e for e in ctx.recent_blobs()}
+
+    assert blobs["src/big.py"].size is None
+    assert blobs["src/main.py"].size == len("print('hello')\n")
+    assert ctx.read_blob(blobs["src/main.py"].sha) == "print('hello')\n"
+
+
+def test_scorers_run_on_local_context(backend):
+    analyzer = GemAnalyzer(github_client=None, local_backend=backend)
+    ctx = analyzer.context_for(make_repo())
+
+    _, quality = analyzer._analyze_code_quality(ctx)
+    _, commits = analyzer._analyze_commits(ctx)
+
+    assert quality["has_src_dir"] and quality["has_tests"]
+    assert quality["readme_length"] > 200
+    assert commits == {"reason": "Too few commits"}
+
+
+def test_clone_cache_evicts_least_recently_used(tmp_path, origin, backend):
+    for name in ("other", "third"):
+        shutil.copytree(origin / "owner" / "gem", origin / "owner" / name)
+
+    backend.checkout("owner/gem")
+    backend.checkout("owner/other")
+    backend.checkout("owner/gem")
+    os.utime(backend.path_for("owner/other"), (0, 0))
+    backend.checkout("owner/third")
+
+    assert backend.path_for("owner/gem").exists()
+    assert backend.path_for("owner/third").exists()
+    assert not backend.path_for("owner/other").exists()
@@ -0,0 +1,169 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.github_client import GitHubClient, create_github_client
+from scanner.github_scanner import GitHubScanner
+from scanner.rate_limiter import RateLimitScheduler
+from scanner.token_pool import TokenPool
+
+
+def make_response(status_code=200, text="", **headers):
+    return MagicMock(status_code=status_code, text=text, headers=headers)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimitScheduler:
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def scheduler(self, clock):
+        return RateLimitScheduler(sleep=clock.sleep, clock=clock.time)
+
+    def test_resource_for_url(self):
+        assert RateLimitScheduler.resource_for("https://api.github.com/search/repositories?q=x") == "search"
+        assert RateLimitScheduler.resource_for("https://api.github.com/graphql") == "graphql"
+        assert RateLimitScheduler.resource_for("https://api.github.com/repos/a/b") == "core"
+
+    def test_records_remaining_budget_per_token(self, scheduler):
+        url = "https://api.github.com/repos/a/b"
+        scheduler.record("t1", url, make_response(**{
+            "X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4321", "X-RateLimit-Reset": "4600"
+        }))
+
+        assert scheduler.remaining("t1") == 4321
+        assert scheduler.remaining("t2") is None
+
+    def test_unbilled_responses_do_not_drain_the_budget(self, scheduler, clock):
+        url = "https://api.github.com/repos/a/b"
+        headers = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "4600"}
+        scheduler.record("t1", url, make_response(**headers))
+
+        # ETag hits: each request is reserved, answered 304 and not billed
+        for _ in range(4600):
+            scheduler.acquire("t1", url)
+            scheduler.record("t1", url, make_response(304, **headers))
+
+        assert scheduler.remaining("t1") == 4000
+        assert clock.sleeps == []
+
+    def test_in_flight_requests_stay_reserved(self, scheduler):
+        url = "https://api.github.com/repos/a/b"
+        headers = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "100", "X-RateLimit-Reset": "4600"}
+        scheduler.record("t1", url, make_response(**headers))
+
+        scheduler.acquire("t1", url)
+        scheduler.acquire("t1", url)
+        scheduler.record("t1", url, make_response(**{**headers, "X-RateLimit-Remaining": "99"}))
+        assert scheduler.remaining("t1") == 98
+
+        scheduler.cancel("t1", url)
+        assert scheduler.remaining("t1") == 99
+
+    def test_parks_until_reset_when_exhausted(self, scheduler, clock):
+        url = "https://api.github.com/repos/a/b"
+        limited = scheduler.record("t1", url, make_response(403, **{
+            "X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1600"
+        }))
+
+        assert limited is True
+        scheduler.acquire("t1", url)
+        assert clock.sleeps == [600.0]
+
+    def test_honours_retry_after_for_secondary_limits(self, scheduler, clock):
+        url = "https://api.github.com/repos/a/b"
+        assert scheduler.record("t1", url, make_response(403, text="secondary rate limit", **{"Retry-After": "30"}))
+
+        scheduler.acquire("t1", url)
+        assert clock.sleeps == [30.0]
+
+    def test_paces_when_budget_is_low(self, scheduler, clock):
+        url = "https://api.github.com/repos/a/b"
+        scheduler.record("t1", url, make_response(**{
+            "X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "100", "X-RateLimit-Reset": "2000"
+        }))
+
+        assert scheduler.wait_time("t1") == pytest.approx(10.0)
+
+    def test_client_retries_rate_limited_request(self, clock):
+        scheduler = RateLimitScheduler(sleep=clock.sleep, clock=clock.time)
+        client = GitHubClient(token="t1", scheduler=scheduler)
+        limited = make_response(429, **{"Retry-After": "5"})
+        ok = make_response(200, **{"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "5000"})
+
+        with patch.object(client.session, "request", side_effect=[limited, ok]):
+            response = client.get("/repos/a/b")
+
+        assert response is ok
+        assert clock.sleeps == [5.0]
+        assert client.remaining_budget() == 10
+
+    def test_scanner_sizes_batch_to_budget(self):
+        scanner = GitHubScanner(token="mock_token")
+        scanner.client.scheduler.record("mock_token", "https://api.github.com/repos/a/b", make_response(**{
+            "X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "15", "X-RateLimit-Reset": "9999999999"
+        }))
+
+        assert scanner.remaining_budget() == 15
+        assert scanner.affordable_repos() == 2
+
+
+class TestTokenPool:
+
+    def test_spreads_requests_by_remaining_quota(self):
+        pool = TokenPool(["t1", "t2"])
+        url = "https://api.github.com/repos/a/b"
+        pool.scheduler.record("t1", url, make_response(**{"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": "9999999999"}))
+        pool.scheduler.record("t2", url, make_response(**{"X-RateLimit-Remaining": "900", "X-RateLimit-Reset": "9999999999"}))
+
+        assert pool.select(url) == "t2"
+        assert pool.remaining() == 1000
+
+    def test_unhealthy_tokens_are_skipped(self):
+        pool = TokenPool(["t1", "t2"], max_failures=2)
+        pool.report("t1", make_response(401))
+        assert pool.healthy_tokens() == ["t2"]
+
+        pool.report("t2", error=ConnectionError("boom"))
+        pool.report("t2", make_response(502))
+        assert pool.healthy_tokens() == []
+        # With nothing healthy the pool still hands out a token rather than failing
+        assert pool.select("https://api.github.com/repos/a/b") in ("t1", "t2")
+
+    def test_client_authorizes_each_request_from_pool(self):
+        client = create_github_client(["t1", "t2"])
+        ok = make_response(200, **{"X-RateLimit-Remaining": "50", "X-RateLimit-Reset": "9999999999"})
+
+        with patch.object(client.session, "request", return_value=ok) as mock_request:
+            client.get("/repos/a/b")
+            client.get("/repos/a/b")
+
+        used = [c.kwargs["headers"]["Authorization"] for c in mock_request.call_args_list]
+        assert used == ["token t1", "token t2"]
+
+    def test_scanner_accepts_token_list(self):
+        scanner = GitHubScanner(token=["t1", "t2"])
+
+        assert scanner.token == "t1"
+        assert scanner.client.token_pool.tokens == ["t1", "t2"]
+        assert scanner.insights_collector.client is scanner.client
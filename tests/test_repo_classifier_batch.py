@@ -0,0 +1,71 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+np = pytest.importorskip("numpy")
+
+from scanner.repo_classifier import RepoClassifier
+
+
+def random_repo(rng, i):
+    words = ["fast", "parser", "demo", "tutorial", "engine", "template", "learning", "cli", "testing"]
+    description = " ".join(rng.choice(words) for _ in range(rng.randint(0, 25))) if rng.random() > 0.1 else None
+    repo = {
+        "name": f"{rng.choice(words)}-{i}",
+        "description": description,
+        "stargazers_count": rng.choice([0, 5, 10, 11, 100, 101, 5000]),
+        "topics": ["x"] if rng.random() > 0.5 else [],
+        "license": {"name": "MIT"} if rng.random() > 0.5 else None,
+        "archived": rng.random() > 0.9,
+    }
+    insights = {
+        "contributors_count": rng.choice([0, 1, 2, 30]),
+        "commit_frequency_score": rng.choice([None, 0, 0.0, 2.5, 5.0, 5.1, 10.0]),
+        "health_percentage": rng.choice([0, 50, 51, 100]),
+    }
+    if rng.random() > 0.9:
+        insights = {}
+    return repo, insights
+
+
+def test_batch_matches_scalar_exactly():
+    rng = random.Random(42)
+    classifier = RepoClassifier()
+    pairs = [random_repo(rng, i) for i in range(2000)]
+    repos = [p[0] for p in pairs]
+    insights = [p[1] for p in pairs]
+
+    batch = classifier.classify_many(repos, insights)
+    scalar = [classifier.classify_repo(r, i) for r, i in pairs]
+
+    assert batch == scalar
+
+
+def test_classify_batch_accepts_columns():
+    classifier = RepoClassifier()
+    flags = np.zeros((2, len(classifier.negative_keywords)), dtype=bool)
+    flags[1, classifier.negative_keywords.index("demo")] = True
+
+    result = classifier.classify_batch({
+        "stars": [500, 500],
+        "contributors": [3, 3],
+        "commit_activity": [8.0, np.nan],
+        "health": [80, 80],
+        "description_length": [150, 150],
+        "has_topics": [True, True],
+        "has_license": [True, True],
+        "archived": [False, False],
+        "keyword_flags": flags,
+    })
+
+    assert result["score"].tolist() == [100, 95]
+    assert result["is_real_project"].tolist() == [True, True]
+    assert classifier.reasons_from_mask(result["reason_mask"][1]) == [
+        "Contains negative keyword: demo", "Detailed description", "Has topics", "Has license",
+        "High stars (>100)", "Multiple contributors", "Commit activity unknown",
+    ]
@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.analysis_store import AnalysisStore
+from scanner.gem_analyzer import GemAnalyzer, ScoringConfig
+from scanner.rescoring import format_diff, rescore, summarize
+from .test_gem_analyzer import FakeGithub
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AnalysisStore(str(tmp_path / "analyses.sqlite"))
+    yield store
+    store.close()
+
+
+def store_scores(store, repo, scores, config=ScoringConfig()):
+    total, recommendation, priority = config.evaluate(scores)
+    store.save({"repo": repo, "total_score": round(total, 2), "recommendation": recommendation,
+                "priority": priority}, scores)
+
+
+def test_default_config_reproduces_analyzer_verdict(store):
+    analyzer = GemAnalyzer(FakeGithub(), store=store)
+
+    result = analyzer.analyze_repo("owner/gem")
+    rescored = rescore(store, ScoringConfig())
+
+    assert len(rescored) == 1
+    assert rescored[0].new_score == result["total_score"]
+    assert rescored[0].new_recommendation == result["recommendation"]
+    assert not rescored[0].flipped
+
+
+def test_reports_category_flips(store):
+    store_scores(store, "owner/active", {"commit_activity": 100, "code_quality": 65,
+                                         "developer_engagement": 65, "project_maturity": 50})
+    store_scores(store, "owner/steady", {"commit_activity": 40, "code_quality": 80,
+                                         "developer_engagement": 80, "project_maturity": 80})
+
+    config = ScoringConfig(weights={"commit_activity": 0.10, "project_maturity": 0.40})
+    results = {r.repo: r for r in rescore(store, config, apply=True)}
+
+    assert (results["owner/active"].old_recommendation, results["owner/active"].new_recommendation) == ("APPROVE", "REVIEW")
+    assert (results["owner/steady"].old_recommendation, results["owner/steady"].new_recommendation) == ("REVIEW", "APPROVE")
+    assert summarize(list(results.values()))["flips"] == {("APPROVE", "REVIEW"): 1, ("REVIEW", "APPROVE"): 1}
+    assert "APPROVE -> REVIEW  owner/active" in format_diff(list(results.values()))
+
+    # Applied verdicts become the new baseline
+    assert not any(r.flipped for r in rescore(store, config))
+    stored = store.get_result("owner/active")
+    assert (stored["total_score"], stored["recommendation"], stored["priority"]) == (
+        results["owner/active"].new_score, "REVIEW", results["owner/active"].new_priority)
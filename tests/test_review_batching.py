@@ -0,0 +1,114 @@
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.grok_reviewer import GrokReviewer
+from scanner.review_batching import parse_batch_entries, review_in_batches
+from scanner.review_cache import ReviewCache
+
+
+def entry(index=None, architecture=8):
+    scores = {"architecture_score": architecture, "documentation_score": 7, "testing_score": 6,
+              "practices_score": 7, "innovation_score": 9}
+    if index is not None:
+        scores["index"] = index
+    return scores
+
+
+def test_entries_are_matched_by_index():
+    response = "```json\n" + json.dumps([entry(2, architecture=2), entry(1, architecture=1)]) + "\n```"
+
+    entries = parse_batch_entries(response, 2)
+
+    assert [e["architecture_score"] for e in entries] == [1, 2]
+
+
+def test_invalid_entries_are_dropped():
+    incomplete = {"index": 2, "architecture_score": 8}
+    response = json.dumps([entry(1), incomplete, entry(1), "noise", entry(9)])
+
+    assert [e is not None for e in parse_batch_entries(response, 3)] == [True, False, False]
+    assert parse_batch_entries("not json", 2) == [None, None]
+
+
+def test_non_numeric_scores_are_invalid():
+    wordy = {**entry(1), "architecture_score": "high"}
+    textual = {**entry(2), "testing_score": "7"}
+    boolean = {**entry(3), "innovation_score": True}
+
+    entries = parse_batch_entries(json.dumps([wordy, textual, boolean]), 3)
+
+    assert [e is not None for e in entries] == [False, True, False]
+
+
+def test_missing_entries_fall_back_to_single_reviews():
+    batches, singles = [], []
+
+    def review_batch(items):
+        batches.append(items)
+        return [{"batched": item} if item % 2 == 0 else None for item in items]
+
+    def review_single(item):
+        singles.append(item)
+        return {"single": item}
+
+    results = review_in_batches([0, 1, 2, 3, 4], 2, review_batch, review_single)
+
+    assert results == [{"batched": 0}, {"single": 1}, {"batched": 2}, {"single": 3}, {"single": 4}]
+    # The trailing batch of one goes straight to the single-repo prompt
+    assert batches == [[0, 1], [2, 3]]
+    assert singles == [1, 3, 4]
+
+
+class FakeRepo:
+    description = "A widget"
+    language = "Python"
+    stargazers_count = 42
+    forks_count = 3
+    license = None
+    has_wiki = False
+
+    def __init__(self, name):
+        self.full_name = f"octo/{name}"
+        self.name = name
+
+    def get_topics(self):
+        return ["tools"]
+
+
+def test_grok_batch_sends_one_prompt_per_batch(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    reviewer = GrokReviewer(review_cache=ReviewCache(":memory:"))
+    prompts = []
+
+    def call_model(prompt, **kwargs):
+        prompts.append(prompt)
+        if "=== Repository" in prompt:
+            # Answers the first repo properly, the second with an unusable score
+            return json.dumps([entry(1), {**entry(2), "architecture_score": "high"}])
+        return json.dumps(entry(architecture=3))
+
+    monkeypatch.setattr(reviewer, "_call_model_with_retry", call_model)
+    repos = [(FakeRepo(f"widget-{i}"), "# Widget", []) for i in range(4)]
+    shas = [f"sha-{i}" for i in range(4)]
+
+    results = reviewer.review_batch(repos, batch_size=4, head_shas=shas)
+
+    assert [r["architecture"] for r in results] == [8, 3, 3, 3]
+    # Repos 2-4 fell back to the single-repo prompt
+    assert len(prompts) == 4
+    assert prompts[0].count("=== Repository") == 4
+
+    # Everything is cached now, batched and fallback results alike
+    assert reviewer.review_batch(repos, batch_size=4, head_shas=shas) == results
+    assert len(prompts) == 4
+
+    # Fallback reviews are stored under the single-repo prompt's key
+    cache = reviewer.review_cache
+    assert cache.get("octo/widget-0", "sha-0", reviewer.model, reviewer.batch_prompt_hash) == results[0]
+    assert cache.get("octo/widget-1", "sha-1", reviewer.model, reviewer.batch_prompt_hash) is None
+    assert reviewer.review_repository(*repos[1], head_sha="sha-1") == results[1]
+    assert len(prompts) == 4
@@ -0,0 +1,120 @@
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.grok_reviewer import GrokReviewer
+from scanner.review_cache import ReviewCache, prompt_template_hash
+
+REVIEW = {"architecture": 8, "documentation": 7}
+
+
+class CountingReview:
+    def __init__(self, result=REVIEW):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.result
+
+
+def test_review_is_reused_until_the_key_changes(tmp_path):
+    cache = ReviewCache(str(tmp_path / "reviews.sqlite"))
+    review = CountingReview()
+
+    assert cache.get_or_review("octo/widget", "abc123", "gpt-4o", "p1", review) == REVIEW
+    assert cache.get_or_review("octo/widget", "abc123", "gpt-4o", "p1", review) == REVIEW
+    assert review.calls == 1
+
+    cache.get_or_review("octo/widget", "def456", "gpt-4o", "p1", review)
+    cache.get_or_review("octo/widget", "def456", "gpt-4o-mini", "p1", review)
+    cache.get_or_review("octo/widget", "def456", "gpt-4o-mini", "p2", review)
+    assert review.calls == 4
+    assert len(cache) == 4
+
+
+def test_reviews_persist_across_instances(tmp_path):
+    db_path = str(tmp_path / "reviews.sqlite")
+    ReviewCache(db_path).put("octo/widget", "abc123", "gpt-4o", "p1", REVIEW)
+
+    assert ReviewCache(db_path).get("octo/widget", "abc123", "gpt-4o", "p1") == REVIEW
+
+
+def test_failed_and_fallback_reviews_are_not_cached():
+    cache = ReviewCache(":memory:")
+
+    cache.get_or_review("octo/widget", "abc123", "gpt-4o", "p1", CountingReview(None))
+    cache.get_or_review("octo/widget", "abc123", "gpt-4o", "p1", CountingReview({"fallback": True}),
+                        is_valid=lambda result: not result.get("fallback"))
+
+    assert len(cache) == 0
+
+
+def test_head_is_resolved_when_not_given():
+    heads = {"octo/widget": "abc123"}
+    cache = ReviewCache(":memory:", resolve_head=heads.get)
+    review = CountingReview()
+
+    cache.get_or_review("octo/widget", None, "gpt-4o", "p1", review)
+    cache.get_or_review("octo/widget", None, "gpt-4o", "p1", review)
+    assert review.calls == 1
+
+    # No known HEAD: nothing to pin the review to, so it always runs
+    cache.get_or_review("octo/unknown", None, "gpt-4o", "p1", review)
+    cache.get_or_review("octo/unknown", None, "gpt-4o", "p1", review)
+    assert review.calls == 3
+
+
+def test_prompt_hash_tracks_template_not_repo():
+    def prompt(context):
+        return f"Review {context['name']}: {context['description']}"
+
+    def reworded(context):
+        return f"Please review {context['name']}: {context['description']}"
+
+    assert prompt_template_hash(prompt) == prompt_template_hash(prompt)
+    assert prompt_template_hash(prompt) != prompt_template_hash(reworded)
+
+
+def test_prompt_hash_tracks_context_settings():
+    def prompt(context):
+        return f"Review {context['name']}: {context['readme']}"
+
+    assert prompt_template_hash(prompt, readme_budget=750) == prompt_template_hash(prompt, readme_budget=750)
+    assert prompt_template_hash(prompt, readme_budget=750) != prompt_template_hash(prompt, readme_budget=1000)
+    assert prompt_template_hash(prompt, context_builder=1) != prompt_template_hash(prompt, context_builder=2)
+
+
+class FakeRepo:
+    full_name = "octo/widget"
+    name = "widget"
+    description = "A widget"
+    language = "Python"
+    stargazers_count = 42
+    forks_count = 3
+    license = None
+    has_wiki = False
+
+    def get_topics(self):
+        return ["tools"]
+
+
+def test_grok_reviewer_reuses_cached_review(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    reviewer = GrokReviewer(review_cache=ReviewCache(":memory:"))
+    scores = {"architecture_score": 8, "documentation_score": 7, "testing_score": 6,
+              "practices_score": 7, "innovation_score": 9}
+    calls = []
+    monkeypatch.setattr(reviewer, "_call_model_with_retry",
+                        lambda prompt, **kwargs: calls.append(prompt) or json.dumps(scores))
+
+    first = reviewer.review_repository(FakeRepo(), "# Widget", [], head_sha="abc123")
+    second = reviewer.review_repository(FakeRepo(), "# Widget", [], head_sha="abc123")
+    reviewer.review_repository(FakeRepo(), "# Widget", [], head_sha="def456")
+
+    assert first["architecture"] == 8
+    assert second == first
+    assert len(calls) == 2
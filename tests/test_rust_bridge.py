@@ -0,0 +1,147 @@
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scanner.rust_bridge import RustWorker, stream_repos
+
+
+def fake_scanner(script: str):
+    return [sys.executable, "-c", script]
+
+
+def test_repos_are_yielded_while_the_scanner_is_still_running():
+    script = (
+        "import json, sys, time\n"
+        "print('log noise')\n"
+        "print(json.dumps({'full_name': 'owner/first'}), flush=True)\n"
+        "time.sleep(30)\n"
+        "print(json.dumps({'full_name': 'owner/second'}), flush=True)\n"
+    )
+    started = time.monotonic()
+    repos = stream_repos(fake_scanner(script))
+
+    assert next(repos)["full_name"] == "owner/first"
+    repos.close()
+
+    # Closing the stream kills the scanner instead of waiting for it
+    assert time.monotonic() - started < 10
+
+
+def test_legacy_marker_block_is_still_accepted():
+    payload = json.dumps([{"full_name": "owner/a"}, {"full_name": "owner/b"}], indent=2)
+    script = f"print('__REPO_JSON__')\nprint({payload!r})\nprint('__END_JSON__')\n"
+
+    assert [r["full_name"] for r in stream_repos(fake_scanner(script))] == ["owner/a", "owner/b"]
+
+
+def test_malformed_lines_are_skipped():
+    script = (
+        "print('{\"full_name\": \"owner/a\"}')\n"
+        "print('{\"full_name\": \"owner/tru')\n"
+        "print('{\"full_name\": \"owner/b\"}')\n"
+    )
+
+    assert [r["full_name"] for r in stream_repos(fake_scanner(script))] == ["owner/a", "owner/b"]
+
+
+def test_stalled_scanner_times_out():
+    script = "import time\nprint('{\"full_name\": \"owner/a\"}', flush=True)\ntime.sleep(30)\n"
+    repos = stream_repos(fake_scanner(script), idle_timeout=0.5)
+
+    assert next(repos)["full_name"] == "owner/a"
+    with pytest.raises(subprocess.TimeoutExpired):
+        next(repos)
+
+
+def test_failing_scanner_raises_with_stderr():
+    script = "import sys\nprint('{\"full_name\": \"owner/a\"}')\nsys.stderr.write('rate limited')\nsys.exit(3)\n"
+    repos = stream_repos(fake_scanner(script))
+
+    assert next(repos)["full_name"] == "owner/a"
+    with pytest.raises(RuntimeError, match="rate limited"):
+        next(repos)
+
+
+FAKE_WORKER = """
+import json, os, sys, time
+for line in sys.stdin:
+    request = json.loads(line)
+    rid = request["id"]
+    if request["cmd"] == "scan":
+        for i in range(3):
+            print(json.dumps({"id": rid, "result": {"full_name": f"owner/{request['tier']}{i}", "pid": os.getpid()}}), flush=True)
+            time.sleep(0.05)
+        print(json.dumps({"id": rid, "done": True}), flush=True)
+    elif request["cmd"] == "crash":
+        sys.exit(1)
+    elif request["cmd"] == "hang":
+        time.sleep(30)
+    elif request["cmd"] == "stall":
+        print(json.dumps({"id": rid, "result": {"pid": os.getpid()}}), flush=True)
+        time.sleep(30)
+    else:
+        print(json.dumps({"id": rid, "error": "unknown command"}), flush=True)
+"""
+
+
+@pytest.fixture
+def worker():
+    worker = RustWorker(fake_scanner(FAKE_WORKER), idle_timeout=5)
+    yield worker
+    worker.close()
+
+
+def test_worker_process_is_reused_across_commands(worker):
+    first = list(worker.scan("small"))
+    second = list(worker.scan("micro"))
+
+    assert [r["full_name"] for r in first] == ["owner/small0", "owner/small1", "owner/small2"]
+    assert [r["full_name"] for r in second] == ["owner/micro0", "owner/micro1", "owner/micro2"]
+    assert {r["pid"] for r in first + second} == {first[0]["pid"]}
+
+
+def test_abandoned_command_does_not_leak_into_the_next(worker):
+    scan = worker.scan("small")
+    assert next(scan)["full_name"] == "owner/small0"
+    scan.close()
+
+    assert [r["full_name"] for r in worker.scan("micro")] == ["owner/micro0", "owner/micro1", "owner/micro2"]
+
+
+def test_worker_errors_and_restarts(worker):
+    with pytest.raises(RuntimeError, match="unknown command"):
+        list(worker.request("bogus"))
+
+    with pytest.raises(RuntimeError, match="exited"):
+        list(worker.request("crash"))
+
+    # A fresh process picks up the next command
+    assert len(list(worker.scan("small"))) == 3
+
+
+def test_stuck_worker_is_killed(worker):
+    worker.idle_timeout = 0.5
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(worker.request("hang"))
+
+    worker.idle_timeout = 5
+    assert len(list(worker.scan("small"))) == 3
+
+
+def test_worker_stuck_on_abandoned_command_is_restarted(worker):
+    worker.idle_timeout = 0.5
+    stalled = worker.request("stall")
+    stuck_pid = next(stalled)["pid"]
+    stalled.close()
+
+    results = list(worker.scan("small"))
+
+    assert len(results) == 3
+    assert results[0]["pid"] != stuck_pid
@@ -8,8 +8,7 @@ class TestGitHubScanner:
     def scanner(self):
         return GitHubScanner(token="mock_token")
 
-    @patch("src.scanner.github_scanner.requests.get")
-    def test_scan_recent_repos_success(self, mock_get, scanner):
+    def test_scan_recent_repos_success(self, scanner):
         # Mock response
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -19,10 +18,10 @@ class TestGitHubScanner:
                 {"name": "repo2", "full_name": "user/repo2", "description": "Another valid project", "license": {"key": "apache-2.0"}, "archived": False, "disabled": False}
             ]
         }
-        mock_get.return_value = mock_response
 
         # Mock the enhanced analysis methods to avoid API calls
-        with patch.object(scanner, 'validate_repo_basic', return_value=True), \
+        with patch.object(scanner.client, 'get', return_value=mock_response) as mock_get, \
+             patch.object(scanner, 'validate_repo_basic', return_value=True), \
              patch.object(scanner.insights_collector, 'collect_insights', return_value={}), \
              patch.object(scanner.classifier, 'classify_repo', return_value={'is_real_project': True, 'score': 80, 'reasons': []}):
             repos = scanner.scan_recent_repos(limit=2)
@@ -31,14 +30,13 @@ class TestGitHubScanner:
             assert repos[0]["name"] == "repo1"
             mock_get.assert_called_once()
 
-    @patch("src.scanner.github_scanner.requests.get")
-    def test_scan_recent_repos_failure(self, mock_get, scanner):
+    def test_scan_recent_repos_failure(self, scanner):
         mock_response = MagicMock()
         mock_response.status_code = 403
         mock_response.text = "Rate Limit Exceeded"
-        mock_get.return_value = mock_response
 
-        repos = scanner.scan_recent_repos()
+        with patch.object(scanner.client, 'get', return_value=mock_response):
+            repos = scanner.scan_recent_repos()
 
         assert len(repos) == 0
 
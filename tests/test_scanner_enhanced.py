@@ -15,8 +15,7 @@ class TestScannerEnhanced(unittest.TestCase):
         self.token = "fake_token"
         self.scanner = GitHubScanner(self.token)
 
-    @patch("scanner.github_scanner.requests.get")
-    def test_scan_recent_repos_flow(self, mock_get):
+    def test_scan_recent_repos_flow(self):
         # Mock search response
         mock_search_resp = MagicMock()
         mock_search_resp.status_code = 200
@@ -44,14 +43,14 @@ class TestScannerEnhanced(unittest.TestCase):
         }
 
         # Mock insights responses
-        # We need to handle multiple calls to requests.get
+        # We need to handle multiple calls to the shared client
         # 1. Search (handled above, but logic uses side_effect usually)
         # 2. Contributors
         # 3. Stats
         # 4. Community
         # 5. Pulls
 
-        def side_effect(url, headers):
+        def side_effect(url):
             if "search/repositories" in url:
                 return mock_search_resp
             elif "contributors" in url:
@@ -90,10 +89,9 @@ class TestScannerEnhanced(unittest.TestCase):
                  return m
             return MagicMock(status_code=404)
 
-        mock_get.side_effect = side_effect
-
         # Run scan
-        repos = self.scanner.scan_recent_repos(limit=2)
+        with patch.object(self.scanner.client, "get", side_effect=side_effect):
+            repos = self.scanner.scan_recent_repos(limit=2)
 
         # 'bad-repo' should be filtered by validate_repo_basic (no license, desc 'demo')
         # 'good-repo' should pass basic, get insights, and pass classifier
@@ -112,6 +110,88 @@ class TestScannerEnhanced(unittest.TestCase):
         self.assertTrue(good["analysis"]["is_real_project"])
         self.assertGreater(good["analysis"]["score"], 60)
 
+    def test_collect_insights_concurrent_matches_sequential(self):
+        collector = InsightsCollector(self.token)
+        metrics = {
+            "_get_contributors_count": 3,
+            "_get_commit_activity": 7.5,
+            "_get_community_health": 80,
+            "_get_pr_merge_ratio": 0.5,
+            "_get_top_contributors": [{"login": "user1"}],
+            "_get_last_commit_date": "2024-01-01T00:00:00Z",
+            "_get_open_issues_count": 4,
+        }
+        patches = [patch.object(collector, name, return_value=value) for name, value in metrics.items()]
+        for p in patches:
+            p.start()
+        self.addCleanup(lambda: [p.stop() for p in patches])
+
+        concurrent = collector.collect_insights("owner/repo")
+        collector.max_workers = 1
+        sequential = collector.collect_insights("owner/repo")
+
+        self.assertEqual(concurrent, sequential)
+        self.assertEqual(list(concurrent), [
+            "contributors_count", "commit_frequency_score", "health_percentage",
+            "pr_merge_ratio", "top_contributors", "last_commit_date", "open_issues_count"
+        ])
+        self.assertEqual(concurrent["health_percentage"], 80)
+
+    def test_stream_scan_stops_paging_at_limit(self):
+        def page(names, next_url=None):
+            m = MagicMock()
+            m.status_code = 200
+            m.links = {"next": {"url": next_url}} if next_url else {}
+            m.json.return_value = {"items": [{"full_name": n, "name": n.split("/")[1]} for n in names]}
+            return m
+
+        pages = {
+            "page=2": page(["owner/c", "owner/d"], "https://api.github.com/search/repositories?page=3"),
+            "page=3": page(["owner/e"]),
+        }
+        first = page(["owner/a", "owner/b"], "https://api.github.com/search/repositories?page=2")
+
+        def side_effect(url):
+            for key, resp in pages.items():
+                if key in url:
+                    return resp
+            return first
+
+        accepted = {"is_real_project": True, "score": 80, "reasons": []}
+        with patch.object(self.scanner.client, "get", side_effect=side_effect) as mock_get, \
+             patch.object(self.scanner, "validate_repo_basic", return_value=True), \
+             patch.object(self.scanner.insights_collector, "collect_insights", return_value={}), \
+             patch.object(self.scanner.classifier, "classify_repo", return_value=accepted):
+            repos = self.scanner.scan_recent_repos(limit=3, stream=True)
+
+        self.assertEqual([r["full_name"] for r in repos], ["owner/a", "owner/b", "owner/c"])
+        self.assertIn("per_page=6", mock_get.call_args_list[0].args[0])
+        # Page 3 may have been prefetched, but nothing beyond it
+        self.assertLessEqual(mock_get.call_count, 3)
+
+    def test_pipelined_scan_keeps_order_and_stops_early(self):
+        import time
+
+        scanner = GitHubScanner(self.token, workers=3)
+        search = MagicMock(status_code=200)
+        search.json.return_value = {"items": [{"full_name": f"owner/r{i}", "name": f"r{i}"} for i in range(8)]}
+
+        def collect(full_name):
+            # The first candidate finishes last; classification order must not change
+            time.sleep(0.05 if full_name == "owner/r0" else 0.0)
+            return {"name": full_name}
+
+        accepted = {"is_real_project": True, "score": 80, "reasons": []}
+        with patch.object(scanner.client, "get", return_value=search), \
+             patch.object(scanner, "validate_repo_basic", return_value=True), \
+             patch.object(scanner.insights_collector, "collect_insights", side_effect=collect) as mock_collect, \
+             patch.object(scanner.classifier, "classify_repo", return_value=accepted):
+            repos = scanner.scan_recent_repos(limit=2)
+
+        self.assertEqual([r["full_name"] for r in repos], ["owner/r0", "owner/r1"])
+        self.assertEqual(repos[0]["insights"], {"name": "owner/r0"})
+        self.assertLess(mock_collect.call_count, 8)
+
     def test_classifier_logic(self):
         classifier = RepoClassifier()
 